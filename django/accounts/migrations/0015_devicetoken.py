@@ -0,0 +1,47 @@
+# Generated by Django 4.2.22 on 2026-10-19 16:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def copy_user_fcm_tokens(apps, schema_editor):
+    # 기존 User.fcm_token을 기기 토큰으로 옮김 (같은 토큰이 여러 사용자에 있으면 최근 수정된 사용자 기준)
+    User = apps.get_model('accounts', 'User')
+    DeviceToken = apps.get_model('accounts', 'DeviceToken')
+
+    owners = {}
+    users = User.objects.exclude(fcm_token__isnull=True).exclude(fcm_token='').order_by('updated_at')
+    for user_id, token in users.values_list('id', 'fcm_token').iterator():
+        owners[token] = user_id
+    DeviceToken.objects.bulk_create(
+        [DeviceToken(user_id=user_id, token=token) for token, user_id in owners.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_remove_user_has_accepted_terms_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeviceToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=255, unique=True, verbose_name='FCM 토큰')),
+                ('platform', models.CharField(choices=[('android', 'Android'), ('ios', 'iOS'), ('web', 'Web'), ('unknown', 'Unknown')], default='unknown', max_length=10, verbose_name='플랫폼')),
+                ('last_seen', models.DateTimeField(default=django.utils.timezone.now, verbose_name='최근 등록/갱신 시각')),
+                ('failure_count', models.PositiveIntegerField(default=0, verbose_name='연속 전송 실패 횟수')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='device_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'failure_count'], name='accounts_de_user_id_028262_idx')],
+            },
+        ),
+        migrations.RunPython(copy_user_fcm_tokens, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,7 @@ accounts/models.py
 '''
 
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import (BaseUserManager, AbstractBaseUser)
 
 # 커스텀 유저 모델(Custom User Model)를 만들기 위해서는 두 클래스(BaseUserManager, AbstractBaseUser)를 구현해야 한다.
@@ -83,4 +84,109 @@ class User(AbstractBaseUser):
     @property
     def is_staff(self):
         # True일 경우, django의 관리자 화면에 로그인할 수 있음
-        return self.is_admin 
\ No newline at end of file
+        return self.is_admin 
+
+DEVICE_TOKEN_MAX_FAILURES = 5  # 연속 전송 실패가 이 횟수 이상인 토큰은 수신 대상에서 제외
+
+
+class DeviceTokenManager(models.Manager):
+
+    def active(self):
+        # 푸시 수신 대상 토큰 (연속 실패 횟수가 기준 미만)
+        return self.filter(failure_count__lt=DEVICE_TOKEN_MAX_FAILURES)
+
+    def register(self, user, token, platform=None):
+        '''
+        기기 토큰 등록/갱신 (로그인, 앱 실행 시 호출)
+        같은 토큰이 다른 사용자에게 등록되어 있으면 현재 사용자로 옮긴다. (한 기기에서 계정 전환)
+        '''
+        if not token:
+            return None
+
+        if platform not in DeviceToken.Platform.values:
+            platform = None
+        device = self.filter(token=token).first()
+        changed_user_ids = {user.id}
+        if device is None:
+            device = self.create(user=user, token=token, platform=platform or DeviceToken.Platform.UNKNOWN)
+        else:
+            was_active = device.failure_count < DEVICE_TOKEN_MAX_FAILURES
+            if device.user_id == user.id and was_active:
+                changed_user_ids = set()  # 수신 대상 변화 없음 (last_seen만 갱신)
+            changed_user_ids.add(device.user_id)
+            device.user = user
+            device.platform = platform or device.platform
+            device.failure_count = 0
+            device.last_seen = timezone.now()
+            device.save(update_fields=['user', 'platform', 'failure_count', 'last_seen'])
+
+        if changed_user_ids:
+            self.invalidate_club_cache(changed_user_ids)
+        return device
+
+    def unregister(self, user, token):
+        # 로그아웃한 기기의 토큰 삭제 (본인 토큰만)
+        deleted, _ = self.filter(user=user, token=token).delete()
+        if deleted:
+            User.objects.filter(id=user.id, fcm_token=token).update(fcm_token=None)
+            self.invalidate_club_cache([user.id])
+        return deleted
+
+    def retire(self, tokens):
+        '''
+        만료된 토큰 삭제 (FCM이 등록 해제/발신자 불일치로 응답한 토큰)
+        기존 User.fcm_token 필드에 남아 있는 같은 토큰도 함께 비운다.
+        '''
+        tokens = list(tokens)
+        user_ids = set(self.filter(token__in=tokens).values_list('user_id', flat=True))
+        deleted, _ = self.filter(token__in=tokens).delete()
+        User.objects.filter(fcm_token__in=tokens).update(fcm_token=None)
+        self.invalidate_club_cache(user_ids)
+        return deleted
+
+    def record_failures(self, tokens):
+        '''
+        일시적인 전송 실패 횟수 증가. 기준 횟수에 도달한 토큰은 수신 대상에서 빠지므로 캐시도 무효화한다.
+        '''
+        tokens = list(tokens)
+        self.filter(token__in=tokens).update(failure_count=models.F('failure_count') + 1)
+        user_ids = set(self.filter(token__in=tokens, failure_count=DEVICE_TOKEN_MAX_FAILURES)
+                       .values_list('user_id', flat=True))
+        self.invalidate_club_cache(user_ids)
+
+    @staticmethod
+    def invalidate_club_cache(user_ids):
+        # 해당 사용자들이 속한 모든 모임의 "모임 토큰" 캐시 삭제
+        from accounts.redis_interface import club_token_cache
+        from clubs.models import ClubMember  # 순환 import 방지
+
+        if not user_ids:
+            return
+        club_ids = set(ClubMember.objects.filter(user_id__in=user_ids).values_list('club_id', flat=True))
+        club_token_cache.invalidate(club_ids)
+
+
+class DeviceToken(models.Model):
+    '''
+    사용자 기기별 FCM 토큰 (한 사용자가 여러 기기에서 알림을 받을 수 있도록 User.fcm_token과 분리)
+    '''
+    class Platform(models.TextChoices):
+        ANDROID = 'android', 'Android'
+        IOS     = 'ios', 'iOS'
+        WEB     = 'web', 'Web'
+        UNKNOWN = 'unknown', 'Unknown'
+
+    user          = models.ForeignKey(User, on_delete=models.CASCADE, related_name='device_tokens')
+    token         = models.CharField("FCM 토큰", max_length=255, unique=True)
+    platform      = models.CharField("플랫폼", max_length=10, choices=Platform.choices, default=Platform.UNKNOWN)
+    last_seen     = models.DateTimeField("최근 등록/갱신 시각", default=timezone.now)
+    failure_count = models.PositiveIntegerField("연속 전송 실패 횟수", default=0)
+    created_at    = models.DateTimeField(auto_now_add=True)
+
+    objects = DeviceTokenManager()
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'failure_count'])]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.platform}:{self.token[:20]}"
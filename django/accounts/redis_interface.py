@@ -0,0 +1,69 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+accounts/redis_interface.py
+
+역할: 푸시 수신자 해석 결과 캐시
+- key: fcm_tokens:club:{club_id} → 모임 멤버들의 [[user_id, token], ...] (JSON)
+- 모임 멤버 변경(clubs.signals), 기기 토큰 등록/만료(DeviceTokenManager) 시 해당 모임 키만 삭제
+Redis 장애 시에는 캐시 없이 DB 조회로 동작하도록 예외를 삼킨다.
+'''
+import json
+import logging
+
+import redis
+
+from golbang import settings
+
+logger = logging.getLogger(__name__)
+
+redis_client = redis.StrictRedis(
+    host='redis',
+    port=6379,
+    db=0,
+    password=settings.REDIS_PASSWORD,
+    decode_responses=True,
+    socket_connect_timeout=5,
+    socket_timeout=5
+)
+
+CLUB_TOKENS_CACHE_TTL = 3600  # 1시간 (무효화 누락에 대비한 안전장치)
+
+
+class ClubDeviceTokenCache:
+    """
+    모임별 기기 토큰 캐시
+    """
+
+    @staticmethod
+    def _key(club_id):
+        return f"fcm_tokens:club:{club_id}"
+
+    def get(self, club_id):
+        """
+        [(user_id, token), ...] 반환 (캐시에 없으면 None)
+        """
+        try:
+            value = redis_client.get(self._key(club_id))
+        except redis.RedisError as e:
+            logger.warning(f"club token cache get failed: {e}")
+            return None
+        return None if value is None else [tuple(pair) for pair in json.loads(value)]
+
+    def set(self, club_id, pairs):
+        try:
+            redis_client.set(self._key(club_id), json.dumps([list(pair) for pair in pairs]), ex=CLUB_TOKENS_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"club token cache set failed: {e}")
+
+    def invalidate(self, club_ids):
+        keys = [self._key(club_id) for club_id in set(club_ids)]
+        if not keys:
+            return
+        try:
+            redis_client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"club token cache invalidate failed: {e}")
+
+
+club_token_cache = ClubDeviceTokenCache()
@@ -30,6 +30,8 @@ from json import JSONDecodeError
 from rest_framework_simplejwt.tokens import RefreshToken  # SIMPLE_JWT 토큰 생성
 import uuid  # UUID 생성을 위한 import
 
+from accounts.models import DeviceToken
+
 User = get_user_model()
 
 def create_user_and_login(response, email, user_id, name, provider, fcm_token=None):
@@ -47,6 +49,7 @@ def create_user_and_login(response, email, user_id, name, provider, fcm_token=No
         fcm_token=fcm_token  # 🔧 추가: FCM 토큰 저장
     )
     user.save() # user 저장
+    DeviceToken.objects.register(user, fcm_token)
     
     # SIMPLE_JWT를 사용하여 토큰 생성
     refresh = RefreshToken.for_user(user)
@@ -283,6 +286,7 @@ def mobile_google_login(request):
                 if fcm_token and user.fcm_token != fcm_token:
                     user.fcm_token = fcm_token
                     user.save(update_fields=['fcm_token'])
+                DeviceToken.objects.register(user, fcm_token, request.data.get('platform'))
                 
                 response = Response(status=status.HTTP_200_OK)
                 refresh = RefreshToken.for_user(user)
@@ -345,6 +349,7 @@ def mobile_google_login(request):
                 fcm_token=fcm_token
             )
             temp_user.save()
+            DeviceToken.objects.register(temp_user, fcm_token, request.data.get('platform'))
             
             return Response({
                 'status': status.HTTP_226_IM_USED,  # 226: 추가 정보 입력 필요
@@ -396,6 +401,7 @@ def integrate_google_account(request):
                 user.fcm_token = fcm_token
                 print(f"🔔 Google 계정 통합 시 FCM 토큰 업데이트: {fcm_token[:20]}...")
             user.save()
+            DeviceToken.objects.register(user, fcm_token, request.data.get('platform'))
             
             print(f"✅ 계정 통합 완료: {user.email} -> provider: {user.provider}, login_type: {user.login_type}")
             
@@ -576,6 +582,7 @@ def mobile_apple_login(request):
                 if fcm_token and user.fcm_token != fcm_token:
                     user.fcm_token = fcm_token
                     user.save(update_fields=['fcm_token'])
+                DeviceToken.objects.register(user, fcm_token, request.data.get('platform'))
                 
                 response = Response(status=status.HTTP_200_OK)  # 200: 기존 사용자 로그인
                 refresh = RefreshToken.for_user(user)
@@ -636,6 +643,7 @@ def mobile_apple_login(request):
                 fcm_token=fcm_token,
                 is_active=True
             )
+            DeviceToken.objects.register(temp_user, fcm_token, request.data.get('platform'))
             
             return Response({
                 'status': status.HTTP_226_IM_USED,  # 226: 추가 정보 입력 필요
@@ -269,6 +269,7 @@ class UserInfoViewSet(viewsets.ModelViewSet):
         user.student_id = None
         user.profile_image = None
         user.fcm_token = None
+        user.device_tokens.all().delete()  # 모든 기기에서 알림 수신 중단
         user.provider = None
         user.email = f"deleted_{user.id}@example.com"
         user.is_active = False
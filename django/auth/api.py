@@ -20,6 +20,8 @@ from rest_framework_simplejwt.tokens import RefreshToken # RefreshToken
 
 import logging
 
+from accounts.models import DeviceToken
+
 User = get_user_model() # 사용자 모델을 변수에 할당
 
 '''
@@ -88,6 +90,8 @@ class LoginApi(APIView):
             if user.fcm_token != fcm_token:
                 user.fcm_token = fcm_token
                 user.save()
+            # 기기별 토큰 등록 (여러 기기에서 알림 수신)
+            DeviceToken.objects.register(user, fcm_token, request.data.get('platform'))
 
         refresh      = RefreshToken.for_user(user)  # SIMPLE_JWT를 활용하여 리프레시 토큰 생성
         access_token = str(refresh.access_token)    # 액세스 토큰 생성
@@ -206,6 +210,11 @@ class LogoutApi(APIView):
                 token = RefreshToken(refresh_token)
                 token.blacklist() # 블랙리스트에 추가하여 무효화
 
+            # 로그아웃한 기기로는 더 이상 알림을 보내지 않음
+            fcm_token = request.data.get('fcm_token')
+            if fcm_token:
+                DeviceToken.objects.unregister(request.user, fcm_token)
+
             response = Response({
                 "status": status.HTTP_202_ACCEPTED,
                 "message": "Successfully Logged Out"
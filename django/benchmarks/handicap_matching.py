@@ -0,0 +1,86 @@
+'''
+MVP demo ver 0.0.9
+2026.10.19
+benchmarks/handicap_matching.py
+
+역할: 핸디캡 자동 매칭 방식별 품질/실행 시간 비교 벤치마크
+- default(기존 방식): 개인전 = 핸디캡 순 슬라이싱, 팀전 = 라운드 로빈 + 셔플
+- balanced: events/matching.py (greedy + 교환 탐색)
+- 품질 지표: 조별 핸디캡 합의 표준편차, 최대-최소 차이 (작을수록 균형)
+
+실행 (django 디렉토리에서): python benchmarks/handicap_matching.py [--seed 0] [--repeat 20] [--group-size 4]
+'''
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events.matching import balance_groups, split_sizes  # noqa: E402
+
+MEMBER_COUNTS = (20, 50, 100, 150, 200)
+MAX_HANDICAP = 54
+
+
+def sliced_groups(handicaps, group_count):
+    # 기존 개인전: 핸디캡 순으로 정렬 후 앞에서부터 잘라서 배정
+    order = sorted(range(len(handicaps)), key=lambda i: handicaps[i])
+    size = math.ceil(len(order) / group_count)
+    return [order[i * size:(i + 1) * size] for i in range(group_count)]
+
+
+def round_robin_groups(handicaps, group_count, rng):
+    # 기존 팀전: 핸디캡 순 라운드 로빈 후 조 안에서 셔플
+    order = sorted(range(len(handicaps)), key=lambda i: handicaps[i])
+    teams = [[] for _ in range(group_count)]
+    for i in range(group_count):
+        divided_group = order[i::group_count]
+        rng.shuffle(divided_group)
+        for j, index in enumerate(divided_group):
+            teams[j % group_count].append(index)
+    return teams
+
+
+def measure(handicaps, groups):
+    sums = [sum(handicaps[index] for index in group) for group in groups]
+    return statistics.pstdev(sums), max(sums) - min(sums)
+
+
+def run(seed, repeat, group_size):
+    rng = random.Random(seed)
+    strategies = {
+        'sliced': lambda handicaps, count: sliced_groups(handicaps, count),
+        'round_robin': lambda handicaps, count: round_robin_groups(handicaps, count, rng),
+        'balanced': lambda handicaps, count: balance_groups(handicaps, split_sizes(len(handicaps), count)),
+    }
+
+    print(f"{'members':>7} {'strategy':>12} {'std(sum)':>9} {'spread':>7} {'avg ms':>7} {'max ms':>7}")
+    for member_count in MEMBER_COUNTS:
+        group_count = math.ceil(member_count / group_size)
+        results = {name: ([], [], []) for name in strategies}
+        for _ in range(repeat):
+            handicaps = [rng.randint(0, MAX_HANDICAP) for _ in range(member_count)]
+            for name, strategy in strategies.items():
+                started = time.perf_counter()
+                groups = strategy(handicaps, group_count)
+                elapsed = (time.perf_counter() - started) * 1000
+                std, spread = measure(handicaps, groups)
+                results[name][0].append(std)
+                results[name][1].append(spread)
+                results[name][2].append(elapsed)
+        for name, (stds, spreads, elapsed) in results.items():
+            print(f"{member_count:>7} {name:>12} {statistics.mean(stds):>9.2f} {statistics.mean(spreads):>7.2f} "
+                  f"{statistics.mean(elapsed):>7.2f} {max(elapsed):>7.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='핸디캡 자동 매칭 벤치마크')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--group-size', type=int, default=4)
+    args = parser.parse_args()
+    run(args.seed, args.repeat, args.group_size)
@@ -5,12 +5,15 @@ import base64
 import os
 from datetime import datetime
 from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.utils import timezone
 from django.conf import settings
 from .models import ChatRoom, ChatMessage, ChatRoomParticipant, ChatConnection, MessageReadStatus, ChatNotification, ChatReaction
+from .history import CHAT_HISTORY_DEFAULT_LIMIT, CHAT_HISTORY_MAX_LIMIT, InvalidCursor, get_cached_message_page, serialize_message
+from .redis_interface import chat_message_stream, chat_recent_messages
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +30,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         self.user = None
         self.connection_id = None
         self.chat_room = None
+        self.sender_profile_image_url = None  # 연결 시 한 번만 계산 (메시지마다 프로필 조회하지 않음)
         
         # 연결 상태 추적
         self.is_connected = False
@@ -79,6 +83,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 await self.close()
                 return
             
+            self.sender_profile_image_url = self.user.profile_image.url if self.user.profile_image else None
+
             # 채팅방 그룹에 참여
             await self.channel_layer.group_add(
                 self.room_group_name,
@@ -381,18 +387,20 @@ class ChatConsumer(AsyncWebsocketConsumer):
             logger.error(f"메시지 읽음 처리 오류: {e}")
     
     async def _handle_get_history(self, data):
-        """채팅 히스토리 조회"""
+        """
+        채팅 히스토리 조회 (keyset 페이지네이션)
+        before: 이 커서보다 이전 메시지, after: 이 커서보다 이후 메시지 (둘 다 없으면 최신 메시지)
+        """
         try:
-            limit = data.get('limit', 50)
-            offset = data.get('offset', 0)
-            
-            messages = await self._get_chat_history(limit, offset)
-            
-            await self.send(text_data=json.dumps({
-                'type': 'message_history',
-                'messages': messages
-            }))
-            
+            page = await self._get_message_page(
+                before=data.get('before'),
+                after=data.get('after'),
+                limit=data.get('limit', CHAT_HISTORY_DEFAULT_LIMIT),
+            )
+            await self.send(text_data=json.dumps({'type': 'message_history', **page}))
+
+        except InvalidCursor as e:
+            await self.send(text_data=json.dumps({'type': 'error', 'message': str(e)}))
         except Exception as e:
             logger.error(f"채팅 히스토리 조회 오류: {e}")
     
@@ -403,8 +411,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
             emoji = data.get('emoji')
             
             if message_id and emoji:
-                reaction = await self._add_reaction(message_id, emoji)
-                if reaction:
+                reaction_counts = await self._add_reaction(message_id, emoji)
+                if reaction_counts is not None:
                     await self.channel_layer.group_send(
                         self.room_group_name,
                         {
@@ -413,6 +421,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                             'emoji': emoji,
                             'user_name': self.user.name,
                             'action': 'add',
+                            'reaction_counts': reaction_counts,
                             'timestamp': datetime.now().isoformat()
                         }
                     )
@@ -426,8 +435,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
             emoji = data.get('emoji')
             
             if message_id and emoji:
-                removed = await self._remove_reaction(message_id, emoji)
-                if removed:
+                reaction_counts = await self._remove_reaction(message_id, emoji)
+                if reaction_counts is not None:
                     await self.channel_layer.group_send(
                         self.room_group_name,
                         {
@@ -436,6 +445,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                             'emoji': emoji,
                             'user_name': self.user.name,
                             'action': 'remove',
+                            'reaction_counts': reaction_counts,
                             'timestamp': datetime.now().isoformat()
                         }
                     )
@@ -443,40 +453,38 @@ class ChatConsumer(AsyncWebsocketConsumer):
             logger.error(f"반응 제거 처리 오류: {e}")
     
     async def _handle_sync_latest(self, data):
-        """최신 메시지 동기화"""
+        """최신 메시지 동기화 (after 커서 또는 마지막으로 받은 메시지 ID 기준)"""
         try:
+            after = data.get('after')
             last_message_id = data.get('last_message_id')
-            messages = await self._get_messages_after(last_message_id)
-            
-            if messages:
-                await self.send(text_data=json.dumps({
-                    'type': 'sync_latest_response',
-                    'messages': messages
-                }))
-                
+            if not after and not last_message_id:
+                return
+
+            page = await self._get_message_page(
+                after=after,
+                after_message_id=None if after else last_message_id,
+                limit=data.get('limit', CHAT_HISTORY_MAX_LIMIT),
+            )
+            if page['messages']:
+                await self.send(text_data=json.dumps({'type': 'sync_latest_response', **page}))
+
+        except InvalidCursor as e:
+            await self.send(text_data=json.dumps({'type': 'error', 'message': str(e)}))
         except Exception as e:
             logger.error(f"최신 메시지 동기화 오류: {e}")
     
     async def _handle_request_history(self, data):
-        """채팅 히스토리 요청 처리"""
+        """채팅 히스토리 요청 처리 (최근 메시지, before 커서를 주면 그 이전 페이지)"""
         try:
-            # 최근 메시지 조회 (기본 50개)
-            limit = data.get('limit', 50)
-            messages = await self._get_recent_messages(limit=limit)
-            
-            if messages:
-                await self.send(text_data=json.dumps({
-                    'type': 'message_history',
-                    'messages': messages
-                }))
-                logger.info(f"채팅 히스토리 {len(messages)}개 전송 완료")
-            else:
-                await self.send(text_data=json.dumps({
-                    'type': 'message_history',
-                    'messages': []
-                }))
-                logger.info("채팅 히스토리가 비어있습니다")
-                
+            page = await self._get_message_page(
+                before=data.get('before'),
+                limit=data.get('limit', CHAT_HISTORY_DEFAULT_LIMIT),
+            )
+            await self.send(text_data=json.dumps({'type': 'message_history', **page}))
+            logger.info(f"채팅 히스토리 {len(page['messages'])}개 전송 완료")
+
+        except InvalidCursor as e:
+            await self.send(text_data=json.dumps({'type': 'error', 'message': str(e)}))
         except Exception as e:
             logger.error(f"채팅 히스토리 요청 처리 오류: {e}")
     
@@ -505,6 +513,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             'emoji': event['emoji'],
             'user_name': event['user_name'],
             'action': event['action'],
+            'reaction_counts': event.get('reaction_counts', {}),
             'timestamp': event['timestamp']
         }))
     
@@ -614,98 +623,107 @@ class ChatConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             logger.error(f"연결 기록 업데이트 오류: {e}")
     
-    @database_sync_to_async
-    def _save_message(self, content, message_type='TEXT'):
-        """메시지 저장"""
+    async def _save_message(self, content, message_type='TEXT'):
+        """
+        메시지 저장
+        write-behind 모드(settings.CHAT_WRITE_BEHIND)에서는 Redis stream에만 기록하고 바로 반환하며,
+        DB 저장은 chat.tasks.persist_chat_messages가 일괄로 수행한다.
+        """
+        if settings.CHAT_WRITE_BEHIND:
+            return await sync_to_async(self._queue_message, thread_sensitive=False)(content, message_type)
+        return await self._create_message(content, message_type)
+
+    def _build_message(self, content, message_type):
+        # 🔧 추가: 발신자 프로필 정보 캐싱
+        return ChatMessage(
+            chat_room=self.chat_room,
+            sender=self.user,
+            sender_unique_id=str(self.user.id),  # 🔧 수정: 숫자 ID로 변경
+            sender_profile_image=self.sender_profile_image_url,  # 🔧 추가: 프로필 이미지 URL 저장
+            content=content,
+            message_type=message_type,
+            created_at=timezone.now()
+        )
+
+    def _notify_message(self, content):
+        # 🔧 추가: FCM 알림 전송 (큐에 넣고 즉시 반환, 창 단위로 묶어서 전송됨)
         try:
-            # 🔧 추가: 발신자 프로필 정보 캐싱
-            sender_profile_image_url = None
-            if self.user.profile_image:
-                sender_profile_image_url = self.user.profile_image.url
-            
-            message = ChatMessage.objects.create(
+            from utils.push_fcm_notification import enqueue_chat_message_notification
+            enqueue_chat_message_notification(
                 chat_room=self.chat_room,
-                sender=self.user,
-                sender_unique_id=str(self.user.id),  # 🔧 수정: 숫자 ID로 변경
-                sender_profile_image=sender_profile_image_url,  # 🔧 추가: 프로필 이미지 URL 저장
-                content=content,
-                message_type=message_type,
-                created_at=timezone.now()
+                sender_name=self.user.name,
+                message_content=content,
+                sender_id=self.user.id
             )
+        except Exception as e:
+            logger.error(f"❌ FCM 알림 큐 등록 실패: {e}")
 
-            # 🔧 추가: 상세 로그 (프로필 이미지 포함)
+    @database_sync_to_async
+    def _create_message(self, content, message_type='TEXT'):
+        """메시지 DB 저장 (기본 모드)"""
+        try:
+            message = self._build_message(content, message_type)
+            message.save(force_insert=True)
+            chat_recent_messages.push(self.chat_room.id, serialize_message(message))
             logger.info(f"💾 메시지 저장 완료: user_id={self.user.user_id} -> sender_unique_id={message.sender_unique_id}")
-            logger.info(f"🖼️ 프로필 이미지: 캐싱={message.sender_profile_image}, 실시간={self.user.profile_image.url if self.user.profile_image else '없음'}")
-            
-            # 🔧 추가: FCM 알림 전송
-            try:
-                from utils.push_fcm_notification import send_chat_message_notification
-                send_chat_message_notification(
-                    chat_room=self.chat_room,
-                    sender_name=self.user.name,
-                    message_content=content,
-                    sender_id=self.user.id
-                )
-                logger.info("📱 FCM 알림 전송 완료")
-            except Exception as e:
-                logger.error(f"❌ FCM 알림 전송 실패: {e}")
-            
+            self._notify_message(content)
             return message
-            
+
         except Exception as e:
             logger.error(f"메시지 저장 오류: {e}")
             return None
-    
+
+    def _queue_message(self, content, message_type='TEXT'):
+        """메시지 write-behind 기록 (ID/시각은 서버에서 부여, DB 저장은 배치 작업이 수행)"""
+        try:
+            message = self._build_message(content, message_type)
+            chat_message_stream.append({
+                'id': str(message.id),
+                'chat_room_id': str(self.chat_room.id),
+                'sender_id': self.user.id,
+                'sender_unique_id': message.sender_unique_id,
+                'sender_profile_image': message.sender_profile_image,
+                'content': message.content,
+                'message_type': message.message_type,
+                'created_at': message.created_at.isoformat(),
+            })
+            chat_recent_messages.push(self.chat_room.id, serialize_message(message))
+            self._notify_message(content)
+            return message
+
+        except Exception as e:
+            logger.error(f"메시지 기록 오류: {e}")
+            return None
+
     @database_sync_to_async
     def _mark_message_read(self, message_id):
         """메시지 읽음 처리"""
         try:
-            message = ChatMessage.objects.get(id=message_id)
-            read_status, created = MessageReadStatus.objects.get_or_create(
-                message=message,
-                user=self.user,
-                defaults={'read_at': timezone.now()}
-            )
-            return read_status
+            message = ChatMessage.objects.only('created_at', 'is_announcement').get(id=message_id, chat_room=self.chat_room)
+            if message.is_announcement:
+                # 공지는 확인 기록도 남김
+                MessageReadStatus.objects.update_or_create(
+                    message=message,
+                    user=self.user,
+                    defaults={'is_read': True, 'read_at': timezone.now()}
+                )
+            return ChatRoomParticipant.objects.mark_read(self.chat_room, self.user, read_at=message.created_at)
             
         except Exception as e:
             logger.error(f"메시지 읽음 처리 오류: {e}")
             return None
     
     @database_sync_to_async
-    def _get_chat_history(self, limit=50, offset=0):
-        """채팅 히스토리 조회"""
-        try:
-            messages = ChatMessage.objects.filter(
-                chat_room=self.chat_room
-            ).select_related('sender').order_by('-created_at')[offset:offset+limit]
-            
-            return [{
-                'id': msg.id,
-                'content': msg.content,
-                'sender': msg.sender.name,
-                'sender_id': msg.sender.user_id if msg.sender.user_id else "unknown",
-                'sender_name': msg.sender.name,
-                'message_type': msg.message_type,
-                'created_at': msg.created_at.isoformat(),
-                'is_pinned': msg.is_pinned,
-            } for msg in reversed(messages)]
-            
-        except Exception as e:
-            logger.error(f"채팅 히스토리 조회 오류: {e}")
-            return []
+    def _get_message_page(self, **kwargs):
+        """채팅 히스토리 한 페이지 조회 (최근 메시지는 Redis 링 버퍼, 그 외는 DB / REST API와 동일한 형식)"""
+        return get_cached_message_page(self.chat_room, **kwargs)
     
     @database_sync_to_async
     def _add_reaction(self, message_id, emoji):
-        """반응 추가"""
+        """반응 추가 (변경 후 메시지의 반응 수 반환)"""
         try:
-            message = ChatMessage.objects.get(id=message_id)
-            reaction, created = ChatReaction.objects.get_or_create(
-                message=message,
-                user=self.user,
-                emoji=emoji
-            )
-            return reaction
+            message = ChatMessage.objects.get(id=message_id, chat_room=self.chat_room)
+            return ChatReaction.objects.add(message, self.user, emoji)
             
         except Exception as e:
             logger.error(f"반응 추가 오류: {e}")
@@ -713,125 +731,23 @@ class ChatConsumer(AsyncWebsocketConsumer):
     
     @database_sync_to_async
     def _remove_reaction(self, message_id, emoji):
-        """반응 제거"""
+        """반응 제거 (변경 후 메시지의 반응 수 반환)"""
         try:
-            ChatReaction.objects.filter(
-                message_id=message_id,
-                user=self.user,
-                emoji=emoji
-            ).delete()
-            return True
+            message = ChatMessage.objects.get(id=message_id, chat_room=self.chat_room)
+            return ChatReaction.objects.remove(message, self.user, emoji)
             
         except Exception as e:
             logger.error(f"반응 제거 오류: {e}")
-            return False
-    
-    @database_sync_to_async
-    def _get_messages_after(self, last_message_id):
-        """특정 메시지 이후의 메시지들 조회"""
-        try:
-            if not last_message_id:
-                return []
-                
-            messages = ChatMessage.objects.filter(
-                chat_room=self.chat_room,
-                id__gt=last_message_id
-            ).select_related('sender').order_by('created_at')
-            
-            return [{
-                'id': msg.id,
-                'content': msg.content,
-                'sender': msg.sender.name,
-                'sender_id': msg.sender.user_id if msg.sender.user_id else "unknown",
-                'sender_name': msg.sender.name,
-                'message_type': msg.message_type,
-                'created_at': msg.created_at.isoformat(),
-                'is_pinned': msg.is_pinned,
-            } for msg in messages]
-            
-        except Exception as e:
-            logger.error(f"최신 메시지 조회 오류: {e}")
-            return []
+            return None
     
     async def _send_existing_messages_async(self):
         """기존 메시지들을 비동기로 전송"""
         try:
-            messages = await self._get_recent_messages()
+            page = await self._get_message_page()
             
-            if messages:
-                # 메시지들을 배치로 전송
-                batch_data = {
-                    'type': 'MESSAGE_HISTORY_BATCH',
-                    'messages': []
-                }
-                
-                for message in messages:
-                    sender_id = str(message.sender.id)  # 🔧 수정: 숫자 ID
-                    sender_unique_id = message.sender_unique_id or str(message.sender.id)  # 🔧 추가: 고유 ID
-
-                    # 프로필 이미지 처리 (실시간 우선 - 프로필 변경 즉시 반영)
-                    profile_image_url = None
-                    if message.sender.profile_image:  # 항상 최신 프로필 우선
-                        profile_image_url = message.sender.profile_image.url
-                    elif message.sender_profile_image:  # 캐싱된 값 백업 (이미지 없을 때)
-                        profile_image_url = message.sender_profile_image
-
-                    logger.info(f"🔍 메시지 {message.id}: sender={message.sender.email}, sender_id={sender_id}, sender_unique_id={sender_unique_id}, sender_name={message.sender.name}")
-
-                    batch_data['messages'].append({
-                        'id': message.id,
-                        'sender': message.sender.name,
-                        'sender_id': sender_id,
-                        'sender_unique_id': sender_unique_id,  # 🔧 추가: 고유 ID
-                        'sender_name': message.sender.name,
-                        'sender_profile_image': profile_image_url,  # 🔧 추가: 프로필 이미지
-                        'content': message.content,
-                        'message_type': message.message_type,
-                        'created_at': message.created_at.isoformat(),
-                        'is_pinned': getattr(message, 'is_pinned', False)
-                    })
-                
-                logger.info(f"📦 배치 메시지 전송: {len(batch_data['messages'])}개")
-                await self.send(text_data=json.dumps(batch_data))
+            if page['messages']:
+                logger.info(f"📦 배치 메시지 전송: {len(page['messages'])}개")
+                await self.send(text_data=json.dumps({'type': 'MESSAGE_HISTORY_BATCH', **page}))
                 
         except Exception as e:
             logger.error(f"기존 메시지 전송 오류: {e}")
-    
-    @database_sync_to_async
-    def _get_recent_messages(self, limit=50):
-        """최근 메시지들 조회 (JSON 직렬화 가능한 형태로)"""
-        try:
-            messages = ChatMessage.objects.filter(
-                chat_room=self.chat_room
-            ).select_related('sender').order_by('-created_at')[:limit]
-
-            
-            # JSON 직렬화 가능한 딕셔너리 리스트로 변환
-            message_list = []
-            for msg in reversed(messages):
-                # 프로필 이미지 URL 처리 (실시간 우선 - 프로필 변경 즉시 반영)
-                profile_image_url = None
-                if msg.sender.profile_image:  # 항상 최신 프로필 우선
-                    profile_image_url = msg.sender.profile_image.url
-                elif msg.sender_profile_image:  # 캐싱된 값 백업 (이미지 없을 때)
-                    profile_image_url = msg.sender_profile_image
-
-                message_list.append({
-                    'id': str(msg.id),
-                    'sender': msg.sender.name,
-                    'sender_id': str(msg.sender.id),  # 🔧 수정: 숫자 ID로 변경
-                    'sender_unique_id': msg.sender_unique_id or str(msg.sender.id),  # 🔧 추가: 고유 ID
-                    'sender_name': msg.sender.name,
-                    'sender_profile_image': profile_image_url,  # 🔧 추가: 프로필 이미지
-                    'content': msg.content,
-                    'message_type': msg.message_type,
-                    'created_at': msg.created_at.isoformat(),
-                    'is_pinned': getattr(msg, 'is_pinned', False),
-                    'is_announcement': getattr(msg, 'is_announcement', False),
-                })
-            
-            return message_list
-            
-        except Exception as e:
-            logger.error(f"최근 메시지 조회 오류: {e}")
-            return []
\ No newline at end of file
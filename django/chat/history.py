@@ -0,0 +1,243 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+chat/history.py
+
+역할: 채팅 히스토리 keyset 페이지네이션 (WebSocket/REST 공통)
+- 커서: (created_at, id) 쌍을 base64로 인코딩한 문자열
+- before 커서: 커서보다 이전 메시지 (위로 스크롤), after 커서: 커서보다 이후 메시지 (최신 동기화)
+- OFFSET 없이 (chat_room, created_at) 인덱스에서 커서 위치부터 limit+1개만 읽으므로
+  오래된 페이지도 첫 페이지와 같은 비용으로 조회된다.
+- 최근 메시지(연결 직후 히스토리, 최신 동기화)는 Redis 링 버퍼(chat_recent_messages)에서 먼저 찾고,
+  버퍼 범위를 벗어난 요청만 DB에서 조회한다.
+- 반응 수는 DB 컬럼(reaction_counts)이나 버퍼에 저장된 값 위에 Redis 반응 카운터의 최신 값을 덮어써서 반환한다.
+- 버퍼에는 보낸 사람 ID와 프로필 이미지 저장 경로만 저장하고, 이름과 프로필 이미지 URL은 페이지를 반환할 때
+  보낸 사람을 한 번에 조회해 채운다 (presigned URL 만료·프로필 변경이 버퍼에 남지 않도록).
+'''
+import base64
+import binascii
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q, Subquery
+from django.utils.dateparse import parse_datetime
+
+from .models import ChatMessage
+from .redis_interface import CHAT_RECENT_MESSAGES_SIZE, chat_reaction_counter, chat_recent_messages, message_sort_key
+
+CHAT_HISTORY_DEFAULT_LIMIT = 50
+CHAT_HISTORY_MAX_LIMIT = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(message):
+    raw = f"{message.created_at.isoformat()}|{message.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    커서 문자열을 (created_at, id)로 변환. 형식이 잘못되면 InvalidCursor
+    """
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|', 1)
+        created_at = parse_datetime(created_at)
+        message_id = uuid.UUID(message_id)
+    except (AttributeError, UnicodeError, ValueError, binascii.Error):
+        raise InvalidCursor(f"잘못된 커서: {cursor}")
+    if created_at is None:
+        raise InvalidCursor(f"잘못된 커서: {cursor}")
+    return created_at, message_id
+
+
+def clamp_limit(limit):
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return CHAT_HISTORY_DEFAULT_LIMIT
+    return max(1, min(limit, CHAT_HISTORY_MAX_LIMIT))
+
+
+def get_message_page(chat_room, before=None, after=None, after_message_id=None, limit=CHAT_HISTORY_DEFAULT_LIMIT):
+    """
+    채팅 히스토리 한 페이지 조회
+
+    :param before: 이 커서보다 이전 메시지 (없으면 최신 메시지부터)
+    :param after: 이 커서보다 이후 메시지
+    :param after_message_id: after 커서 대신 메시지 ID로 기준을 지정 (기존 sync_latest 호환, 같은 쿼리 안에서 기준 위치를 조회)
+    :return: {'messages': [...오래된 순], 'has_more': bool, 'before_cursor': str|None, 'after_cursor': str|None}
+    """
+    page, senders = _load_message_page(chat_room, before, after, after_message_id, limit)
+    return resolve_senders(page, senders)
+
+
+def _load_message_page(chat_room, before, after, after_message_id, limit):
+    """
+    DB에서 한 페이지를 읽어 버퍼 저장 형식(serialize_message)으로 반환. 함께 읽은 보낸 사람도 반환한다.
+    """
+    limit = clamp_limit(limit)
+    queryset = ChatMessage.objects.filter(chat_room=chat_room).select_related('sender')
+
+    if after or after_message_id:
+        if after:
+            created_at, message_id = decode_cursor(after)
+        else:
+            try:
+                after_message_id = uuid.UUID(str(after_message_id))
+            except ValueError:
+                raise InvalidCursor(f"잘못된 메시지 ID: {after_message_id}")
+            anchor = ChatMessage.objects.filter(id=after_message_id, chat_room=chat_room)
+            created_at = Subquery(anchor.values('created_at')[:1])
+            message_id = after_message_id
+        queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=message_id))
+        rows = list(queryset.order_by('created_at', 'id')[:limit + 1])
+        has_more = len(rows) > limit
+        messages = rows[:limit]
+    else:
+        if before:
+            created_at, message_id = decode_cursor(before)
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id))
+        rows = list(queryset.order_by('-created_at', '-id')[:limit + 1])
+        has_more = len(rows) > limit
+        messages = rows[:limit][::-1]
+
+    page = {
+        'messages': [serialize_message(message) for message in messages],
+        'has_more': has_more,
+        'before_cursor': encode_cursor(messages[0]) if messages else before,
+        'after_cursor': encode_cursor(messages[-1]) if messages else after,
+    }
+    return page, {message.sender_id: message.sender for message in messages}
+
+
+def get_cached_message_page(chat_room, before=None, after=None, after_message_id=None, limit=CHAT_HISTORY_DEFAULT_LIMIT):
+    """
+    get_message_page와 같은 결과를 최근 메시지 링 버퍼에서 먼저 찾는다.
+    before 커서 조회(과거 페이지)나 버퍼 범위를 벗어난 요청은 DB에서 조회한다.
+    """
+    limit = clamp_limit(limit)
+    page = None
+    if before is None and limit <= CHAT_RECENT_MESSAGES_SIZE:
+        recent = get_recent_messages(chat_room)
+        if after or after_message_id:
+            page = _page_after(recent, after, after_message_id, limit)
+        else:
+            page = _latest_page(recent, limit)
+        if page is not None:
+            page = resolve_senders(page)
+    if page is None:
+        page = get_message_page(chat_room, before=before, after=after, after_message_id=after_message_id, limit=limit)
+    return with_live_reaction_counts(page)
+
+
+def with_live_reaction_counts(page):
+    """페이지 메시지의 반응 수를 Redis 카운터 값으로 갱신 (카운터가 없는 메시지는 저장된 값 유지)"""
+    live_counts = chat_reaction_counter.get_many(message['id'] for message in page['messages'])
+    if live_counts:
+        page['messages'] = [
+            {**message, 'reaction_counts': live_counts[message['id']]} if message['id'] in live_counts else message
+            for message in page['messages']
+        ]
+    return page
+
+
+def get_recent_messages(chat_room):
+    """
+    채팅방의 최근 메시지 (오래된 순, 최대 CHAT_RECENT_MESSAGES_SIZE개). 버퍼가 비어 있으면 DB에서 읽어 채운다.
+    """
+    recent = chat_recent_messages.get(chat_room.id)
+    if recent is None:
+        messages = _load_message_page(chat_room, None, None, None, CHAT_RECENT_MESSAGES_SIZE)[0]['messages']
+        recent = chat_recent_messages.fill(chat_room.id, messages) or messages
+    return recent
+
+
+def _latest_page(recent, limit):
+    messages = recent[-limit:]
+    return {
+        'messages': messages,
+        # 버퍼가 가득 차 있으면 그 이전 메시지가 DB에 더 있을 수 있음
+        'has_more': len(recent) > limit or len(recent) >= CHAT_RECENT_MESSAGES_SIZE,
+        'before_cursor': messages[0]['cursor'] if messages else None,
+        'after_cursor': messages[-1]['cursor'] if messages else None,
+    }
+
+
+def _page_after(recent, after, after_message_id, limit):
+    """
+    버퍼 안에서 기준 이후 메시지를 찾는다. 기준이 버퍼보다 오래되어 빠진 메시지가 있을 수 있으면 None (DB 조회)
+    """
+    if after:
+        anchor = decode_cursor(after)
+    else:
+        anchor_message = next((message for message in recent if message['id'] == str(after_message_id)), None)
+        if anchor_message is None:
+            return None
+        anchor, after = message_sort_key(anchor_message), anchor_message['cursor']
+    if len(recent) >= CHAT_RECENT_MESSAGES_SIZE and anchor < message_sort_key(recent[0]):
+        return None
+
+    newer = [message for message in recent if message_sort_key(message) > anchor]
+    messages = newer[:limit]
+    return {
+        'messages': messages,
+        'has_more': len(newer) > limit,
+        'before_cursor': messages[0]['cursor'] if messages else after,
+        'after_cursor': messages[-1]['cursor'] if messages else after,
+    }
+
+
+def serialize_message(message):
+    """
+    버퍼 저장 형식. 이름과 프로필 이미지 URL은 담지 않고 resolve_senders에서 채운다.
+    """
+    return {
+        'id': str(message.id),
+        'sender_id': str(message.sender_id),
+        'sender_unique_id': message.sender_unique_id or str(message.sender_id),
+        'sender_profile_image_key': message.sender.profile_image.name or None,
+        'sender_profile_image': message.sender_profile_image,
+        'content': message.content,
+        'message_type': message.message_type,
+        'created_at': message.created_at.isoformat(),
+        'is_pinned': message.is_pinned,
+        'is_announcement': message.is_announcement,
+        'reaction_counts': message.reaction_counts,
+        'cursor': encode_cursor(message),
+    }
+
+
+def resolve_senders(page, senders=None):
+    """
+    페이지 메시지에 보낸 사람 이름과 프로필 이미지 URL을 채운다.
+    senders에 없는 보낸 사람은 한 번의 쿼리로 조회한다.
+    """
+    senders = dict(senders or {})
+    missing = {int(message['sender_id']) for message in page['messages']} - set(senders)
+    if missing:
+        senders.update(get_user_model().objects.only('id', 'name', 'profile_image').in_bulk(missing))
+    page['messages'] = [_present_message(message, senders.get(int(message['sender_id']))) for message in page['messages']]
+    return page
+
+
+def _present_message(message, sender):
+    # 프로필 이미지 URL 처리 (실시간 우선 - 프로필 변경 즉시 반영)
+    image_key = sender.profile_image.name if sender is not None else message.get('sender_profile_image_key')
+    profile_image_url = None
+    if image_key:
+        storage = get_user_model()._meta.get_field('profile_image').storage
+        profile_image_url = storage.url(image_key)
+    elif message.get('sender_profile_image'):  # 캐싱된 값 백업 (이미지 없을 때)
+        profile_image_url = message['sender_profile_image']
+
+    sender_name = sender.name if sender is not None else message.get('sender_name')
+    presented = {key: value for key, value in message.items() if key != 'sender_profile_image_key'}
+    presented.update({
+        'sender': sender_name,
+        'sender_name': sender_name,
+        'sender_profile_image': profile_image_url,
+    })
+    return presented
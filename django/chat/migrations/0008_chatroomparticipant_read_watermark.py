@@ -0,0 +1,38 @@
+# Generated by Django 4.2.22 on 2026-10-19 17:04
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def backfill_read_watermarks(apps, schema_editor):
+    # 기존 메시지별 읽음 기록에서 (사용자, 채팅방)별 마지막으로 읽은 메시지 시각을 워터마크로 옮김
+    MessageReadStatus = apps.get_model('chat', 'MessageReadStatus')
+    ChatRoomParticipant = apps.get_model('chat', 'ChatRoomParticipant')
+
+    watermarks = (MessageReadStatus.objects
+                  .values('user_id', 'message__chat_room_id')
+                  .annotate(last_read_at=Max('message__created_at')))
+    for row in watermarks.iterator():
+        participant, created = ChatRoomParticipant.objects.get_or_create(
+            chat_room_id=row['message__chat_room_id'],
+            user_id=row['user_id'],
+            defaults={'last_read_at': row['last_read_at']},
+        )
+        if not created and (participant.last_read_at is None or participant.last_read_at < row['last_read_at']):
+            participant.last_read_at = row['last_read_at']
+            participant.save(update_fields=['last_read_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0007_chatnotificationsettings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatroomparticipant',
+            index=models.Index(fields=['chat_room', 'last_read_at'], name='chat_room_p_chat_ro_2ba0e7_idx'),
+        ),
+        migrations.RunPython(backfill_read_watermarks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.22 on 2026-10-19 17:07
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_reaction_counts(apps, schema_editor):
+    # 기존 반응 기록을 메시지별 반응 수 컬럼으로 집계 (반응이 있는 메시지만 갱신)
+    ChatMessage = apps.get_model('chat', 'ChatMessage')
+    ChatReaction = apps.get_model('chat', 'ChatReaction')
+
+    counts = defaultdict(dict)
+    rows = ChatReaction.objects.values('message_id', 'reaction').annotate(count=Count('id')).order_by()
+    for row in rows.iterator():
+        counts[row['message_id']][row['reaction']] = row['count']
+    ChatMessage.objects.bulk_update(
+        [ChatMessage(id=message_id, reaction_counts=reaction_counts) for message_id, reaction_counts in counts.items()],
+        ['reaction_counts'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0008_chatroomparticipant_read_watermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatmessage',
+            name='reaction_counts',
+            field=models.JSONField(blank=True, default=dict, verbose_name='반응 수'),
+        ),
+        migrations.RunPython(backfill_reaction_counts, migrations.RunPython.noop),
+    ]
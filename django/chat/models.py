@@ -86,6 +86,9 @@ class ChatMessage(models.Model):
     created_at = models.DateTimeField(default=timezone.now, verbose_name='전송일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     is_read = models.BooleanField(default=False, verbose_name='읽음 여부')
+
+    # 반응 수 {반응: 개수} (Redis 카운터 chat:reactions:{id}를 주기적으로 반영한 값, chat.tasks.flush_reaction_counts)
+    reaction_counts = models.JSONField(default=dict, blank=True, verbose_name='반응 수')
     
     class Meta:
         db_table = 'chat_messages'
@@ -100,6 +103,62 @@ class ChatMessage(models.Model):
     def __str__(self):
         return f"{self.sender}: {self.content[:50]}"
 
+class ChatRoomParticipantManager(models.Manager):
+    """
+    읽음 상태는 (사용자, 채팅방)마다 하나의 워터마크(last_read_at)로 관리한다.
+    last_read_at 이하에 생성된 메시지는 읽은 것으로 보고, 안 읽은 수/읽은 사람 수는
+    (chat_room, created_at), (chat_room, last_read_at) 인덱스 범위 조회로 계산한다.
+    """
+
+    def mark_read(self, chat_room, user, read_at=None):
+        """
+        워터마크를 read_at(기본: 현재 시각)까지 올린다. (뒤로 돌아가지 않음)
+        """
+        read_at = read_at or timezone.now()
+        participant, created = self.get_or_create(chat_room=chat_room, user=user, defaults={'last_read_at': read_at})
+        if not created:
+            self.filter(pk=participant.pk).filter(
+                models.Q(last_read_at__isnull=True) | models.Q(last_read_at__lt=read_at)
+            ).update(last_read_at=read_at)
+        return read_at
+
+    def readers(self, message):
+        """
+        메시지를 읽은 참가자 (워터마크가 메시지 생성 시각 이후인 참가자, 발신자 제외)
+        """
+        return self.filter(
+            chat_room_id=message.chat_room_id,
+            last_read_at__gte=message.created_at,
+        ).exclude(user_id=message.sender_id)
+
+    def unread_count(self, chat_room, user):
+        """
+        워터마크 이후에 다른 사용자가 보낸 메시지 수 (한 번도 읽지 않았으면 전체 메시지)
+        """
+        return self.unread_counts(user, ChatRoom.objects.filter(pk=chat_room.pk)).get(chat_room.pk, 0)
+
+    def unread_counts(self, user, chat_rooms, group_by='chat_room_id'):
+        """
+        여러 채팅방의 안 읽은 메시지 수를 한 번의 GROUP BY 쿼리로 계산
+        사용자의 참가자 행(워터마크)을 LEFT JOIN하므로 참가 기록이 없는 채팅방은 전체 메시지를 센다.
+
+        :param chat_rooms: 대상 채팅방 queryset (서브쿼리로 사용)
+        :param group_by: 결과 키 (기본: 채팅방 ID, 모임 목록에서는 'chat_room__club_id')
+        :return: {group_by 값: 안 읽은 메시지 수} (0인 채팅방은 포함되지 않음)
+        """
+        rows = (ChatMessage.objects
+                .filter(chat_room__in=chat_rooms)
+                .exclude(sender=user)
+                .annotate(watermark=models.FilteredRelation(
+                    'chat_room__participants', condition=models.Q(chat_room__participants__user=user)))
+                .filter(models.Q(watermark__last_read_at__isnull=True) |
+                        models.Q(created_at__gt=models.F('watermark__last_read_at')))
+                .values(group_by)
+                .annotate(unread=models.Count('id'))
+                .order_by())
+        return {row[group_by]: row['unread'] for row in rows}
+
+
 class ChatRoomParticipant(models.Model):
     ROLE_CHOICES = [
         ('MEMBER', '일반 멤버'),
@@ -115,6 +174,8 @@ class ChatRoomParticipant(models.Model):
     joined_at = models.DateTimeField(default=timezone.now, verbose_name='참여일')
     last_read_at = models.DateTimeField(null=True, blank=True, verbose_name='마지막 읽은 시간')
     is_active = models.BooleanField(default=True, verbose_name='활성화 여부')
+
+    objects = ChatRoomParticipantManager()
     
     class Meta:
         db_table = 'chat_room_participants'
@@ -124,6 +185,7 @@ class ChatRoomParticipant(models.Model):
         indexes = [
             models.Index(fields=['chat_room', 'is_active']),
             models.Index(fields=['user', 'is_active']),
+            models.Index(fields=['chat_room', 'last_read_at']),
         ]
     
     def __str__(self):
@@ -227,7 +289,10 @@ class ChatConnection(models.Model):
 
 
 class MessageReadStatus(models.Model):
-    """메시지 읽음 상태 추적"""
+    """
+    메시지별 읽음 확인 (공지 메시지처럼 명시적인 확인 기록이 필요한 경우에만 저장)
+    일반 메시지의 읽음 상태는 ChatRoomParticipant.last_read_at 워터마크로 계산한다.
+    """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     message = models.ForeignKey(ChatMessage, on_delete=models.CASCADE, related_name='read_statuses', verbose_name='메시지')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='message_reads', verbose_name='사용자')
@@ -286,6 +351,42 @@ class ChatNotification(models.Model):
         return f"{self.user.name}: {self.title}"
 
 
+class ChatReactionManager(models.Manager):
+    """
+    반응 추가/제거 시 행은 DB에 저장하고, 메시지별 반응 수는 Redis 카운터로 갱신한다. (GROUP BY 집계 없음)
+    """
+
+    def add(self, message, user, reaction):
+        """반응 추가 후 메시지의 반응 수 {반응: 개수} 반환 (이미 있던 반응이면 그대로)"""
+        _, created = self.get_or_create(message=message, user=user, reaction=reaction)
+        if not created:
+            return self.counts(message)
+        return self._apply(message, reaction, 1)
+
+    def remove(self, message, user, reaction):
+        """반응 제거 후 메시지의 반응 수 반환"""
+        deleted, _ = self.filter(message=message, user=user, reaction=reaction).delete()
+        if not deleted:
+            return self.counts(message)
+        return self._apply(message, reaction, -1)
+
+    def counts(self, message):
+        from .redis_interface import chat_reaction_counter
+
+        return chat_reaction_counter.get_many([message.id]).get(str(message.id), message.reaction_counts)
+
+    def _apply(self, message, reaction, delta):
+        from .redis_interface import chat_reaction_counter
+
+        counts = chat_reaction_counter.incr(message.id, reaction, delta, seed=message.reaction_counts)
+        if counts is None:
+            # Redis 장애 시 DB에서 직접 집계해 컬럼에 반영
+            rows = self.filter(message=message).values('reaction').annotate(count=models.Count('id')).order_by()
+            counts = {row['reaction']: row['count'] for row in rows}
+            ChatMessage.objects.filter(pk=message.pk).update(reaction_counts=counts)
+        return counts
+
+
 class ChatReaction(models.Model):
     """메시지 반응 (이모지 반응)"""
     REACTION_CHOICES = [
@@ -303,6 +404,8 @@ class ChatReaction(models.Model):
     reaction = models.CharField(max_length=10, choices=REACTION_CHOICES, verbose_name='반응')
     
     created_at = models.DateTimeField(default=timezone.now, verbose_name='생성일')
+
+    objects = ChatReactionManager()
     
     class Meta:
         db_table = 'chat_reactions'
@@ -0,0 +1,462 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+chat/redis_interface.py
+
+역할: 채팅 푸시 관련 Redis 자료구조
+1. 채팅 푸시 수신 정책 캐시 (채팅방 단위)
+- key: chat:recipients:{club|event}:{club_id|event_id}
+- value: {"members": [[user_id, muted], ...], "blocks": [[blocker_id, blocked_user_id], ...]} (JSON)
+  → 메시지마다 멤버/알림 설정/차단 여부를 다시 조회하지 않도록 채팅방별로 한 번만 계산
+- 기기 토큰은 여기에 저장하지 않음 (모임 토큰 캐시/DeviceToken에서 조회하므로 토큰 변경 시 무효화 불필요)
+- 무효화: 모임 멤버 변경(clubs.signals), 이벤트 참가자 변경(events views), 알림 설정/차단 변경(chat views)
+Redis 장애 시에는 캐시 없이 DB 조회로 동작하도록 예외를 삼킨다.
+2. 채팅 푸시 합치기 큐 (ChatPushQueue)
+3. 채팅 메시지 write-behind 저장 stream (ChatMessageStream)
+4. 채팅방별 최근 메시지 링 버퍼 (ChatRecentMessageBuffer)
+5. 메시지별 반응 수 카운터 (ChatReactionCounter)
+'''
+import json
+import logging
+import uuid
+
+import redis
+from django.utils.dateparse import parse_datetime
+
+from golbang import settings
+
+logger = logging.getLogger(__name__)
+
+redis_client = redis.StrictRedis(
+    host='redis',
+    port=6379,
+    db=0,
+    password=settings.REDIS_PASSWORD,
+    decode_responses=True,
+    socket_connect_timeout=5,
+    socket_timeout=5
+)
+
+CHAT_RECIPIENTS_CACHE_TTL = 3600  # 1시간 (무효화 누락에 대비한 안전장치)
+
+
+class ChatRecipientCache:
+    """
+    채팅방별 푸시 수신 정책 캐시
+    """
+
+    @staticmethod
+    def _key(scope, scope_id):
+        return f"chat:recipients:{scope}:{scope_id}"
+
+    @classmethod
+    def _room_key(cls, chat_room):
+        if chat_room.chat_room_type == 'CLUB':
+            return cls._key('club', chat_room.club_id)
+        if chat_room.chat_room_type == 'EVENT':
+            return cls._key('event', chat_room.event_id)
+        return None
+
+    def get(self, chat_room):
+        key = self._room_key(chat_room)
+        if key is None:
+            return None
+        try:
+            value = redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"chat recipient cache get failed: {e}")
+            return None
+        return None if value is None else json.loads(value)
+
+    def set(self, chat_room, policy):
+        key = self._room_key(chat_room)
+        if key is None:
+            return
+        try:
+            redis_client.set(key, json.dumps(policy), ex=CHAT_RECIPIENTS_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"chat recipient cache set failed: {e}")
+
+    def invalidate(self, club_ids=(), event_ids=()):
+        keys = ([self._key('club', club_id) for club_id in set(club_ids)] +
+                [self._key('event', event_id) for event_id in set(event_ids)])
+        if not keys:
+            return
+        try:
+            redis_client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"chat recipient cache invalidate failed: {e}")
+
+    def invalidate_room(self, chat_room):
+        if chat_room.chat_room_type == 'CLUB':
+            self.invalidate(club_ids=[chat_room.club_id])
+        elif chat_room.chat_room_type == 'EVENT':
+            self.invalidate(event_ids=[chat_room.event_id])
+
+    def invalidate_user(self, user_id):
+        """
+        사용자가 속한 모든 채팅방(모임/참가 이벤트)의 캐시 삭제 (차단 변경 시)
+        """
+        from clubs.models import ClubMember
+        from participants.models import Participant  # 순환 import 방지
+
+        self.invalidate(
+            club_ids=ClubMember.objects.filter(user_id=user_id).values_list('club_id', flat=True),
+            event_ids=Participant.objects.filter(club_member__user_id=user_id).values_list('event_id', flat=True),
+        )
+
+
+chat_recipient_cache = ChatRecipientCache()
+
+
+CHAT_PUSH_DUE_KEY = 'chat_push:due'
+CHAT_PUSH_COALESCE_WINDOW = 5       # 초 (첫 메시지 이후 이 시간 동안 들어온 메시지를 한 번의 푸시로 묶음)
+CHAT_PUSH_MAX_BUFFERED = 100        # 채팅방별로 보관할 최대 메시지 수 (초과분은 오래된 것부터 버림)
+CHAT_PUSH_RATE_LIMIT = 20           # 사용자별 CHAT_PUSH_RATE_WINDOW 동안 받을 수 있는 최대 채팅 푸시 수
+CHAT_PUSH_RATE_WINDOW = 60          # 초
+
+
+class ChatPushQueue:
+    """
+    채팅 푸시 합치기(coalescing) 큐
+    - 버퍼: chat_push:buffer:{room_id} (list) → 발송 대기 중인 메시지 요약
+    - 발송 예약: chat_push:due (sorted set, member=room_id, score=발송 시각)
+      첫 메시지가 들어올 때만 예약하므로(ZADD NX) 창(window) 안의 메시지는 한 번에 발송된다.
+    - 발송: beat 주기 작업이 발송 시각이 지난 채팅방을 꺼내(ZREM 성공한 것만) 버퍼를 비우고 전송
+      꺼낸 뒤 전송 작업 등록에 실패한 채팅방은 requeue로 다시 넣는다.
+    - 사용자별 발송 제한: chat_push:rate:{user_id}:{window} 카운터 (고정 창)
+    """
+
+    @staticmethod
+    def _buffer_key(room_id):
+        return f"chat_push:buffer:{room_id}"
+
+    @staticmethod
+    def _rate_key(user_id, window):
+        return f"chat_push:rate:{user_id}:{window}"
+
+    def push(self, room_id, entry, now):
+        """
+        메시지를 버퍼에 추가하고, 채팅방이 아직 예약되지 않았으면 now + 창 시간에 발송을 예약한다.
+        """
+        buffer_key = self._buffer_key(room_id)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.rpush(buffer_key, json.dumps(entry))
+        pipe.ltrim(buffer_key, -CHAT_PUSH_MAX_BUFFERED, -1)
+        pipe.expire(buffer_key, CHAT_PUSH_COALESCE_WINDOW * 60)  # 발송이 누락되어도 버퍼가 남지 않도록
+        pipe.zadd(CHAT_PUSH_DUE_KEY, {str(room_id): now + CHAT_PUSH_COALESCE_WINDOW}, nx=True)
+        pipe.execute()
+
+    def pop_due(self, now, batch_size):
+        """
+        발송 시각이 지난 채팅방 ID를 최대 batch_size개 꺼낸다. (ZREM에 성공한 채팅방만 반환)
+        """
+        room_ids = redis_client.zrangebyscore(CHAT_PUSH_DUE_KEY, '-inf', now, start=0, num=batch_size)
+        if not room_ids:
+            return []
+
+        pipe = redis_client.pipeline(transaction=False)
+        for room_id in room_ids:
+            pipe.zrem(CHAT_PUSH_DUE_KEY, room_id)
+        removed = pipe.execute()
+        return [room_id for room_id, claimed in zip(room_ids, removed) if claimed]
+
+    def requeue(self, room_ids, now):
+        """
+        꺼냈지만 전송 작업으로 넘기지 못한 채팅방을 다시 예약한다.
+        그 사이 새 메시지로 다시 예약된 채팅방은 덮어쓰지 않는다. (NX)
+        """
+        if room_ids:
+            redis_client.zadd(CHAT_PUSH_DUE_KEY, {str(room_id): now for room_id in room_ids}, nx=True)
+
+    def drain(self, room_id):
+        """
+        채팅방 버퍼의 메시지를 모두 꺼내고 비운다. (MULTI로 조회와 삭제를 함께 수행)
+        """
+        buffer_key = self._buffer_key(room_id)
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.lrange(buffer_key, 0, -1)
+        pipe.delete(buffer_key)
+        entries, _ = pipe.execute()
+        return [json.loads(entry) for entry in entries]
+
+    def acquire_rate(self, user_ids, now):
+        """
+        사용자별 발송 한도를 1씩 차감하고, 한도 안에 있는 사용자 ID만 반환한다.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return []
+        window = int(now // CHAT_PUSH_RATE_WINDOW)
+        pipe = redis_client.pipeline(transaction=False)
+        for user_id in user_ids:
+            rate_key = self._rate_key(user_id, window)
+            pipe.incr(rate_key)
+            pipe.expire(rate_key, CHAT_PUSH_RATE_WINDOW)
+        counts = pipe.execute()[::2]
+        return [user_id for user_id, count in zip(user_ids, counts) if count <= CHAT_PUSH_RATE_LIMIT]
+
+
+chat_push_queue = ChatPushQueue()
+
+
+CHAT_MESSAGE_STREAM_KEY = 'chat:messages:stream'
+CHAT_MESSAGE_STREAM_GROUP = 'chat-persist'
+CHAT_MESSAGE_CLAIM_IDLE_MS = 30000    # 이 시간 동안 ACK되지 않은 메시지는 다른 워커가 가져가 저장 (워커 장애 복구)
+
+
+class ChatMessageStream:
+    """
+    채팅 메시지 write-behind 저장용 Redis stream
+    - 전송 경로: XADD 후 바로 브로드캐스트 (MySQL 쓰기를 기다리지 않음)
+    - 저장: 소비자 그룹(XREADGROUP)으로 읽어 bulk_create 후 XACK + XDEL
+    - 워커가 저장 도중 죽으면 ACK되지 않은 메시지가 pending 목록에 남고, XAUTOCLAIM으로 다른 워커가 이어서 저장
+    - stream 키가 삭제/만료되어 그룹이 사라지면(NOGROUP) 그룹을 다시 만들고 한 번 재시도
+    """
+
+    def __init__(self):
+        self._group_ready = False
+
+    def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            redis_client.xgroup_create(CHAT_MESSAGE_STREAM_KEY, CHAT_MESSAGE_STREAM_GROUP, id='0', mkstream=True)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):  # 이미 그룹이 있으면 무시
+                raise
+        self._group_ready = True
+
+    def append(self, payload):
+        redis_client.xadd(CHAT_MESSAGE_STREAM_KEY, {'message': json.dumps(payload)})
+
+    def read(self, consumer, count):
+        """
+        아직 아무 워커에게도 전달되지 않은 메시지를 최대 count개 읽는다. [(entry_id, payload), ...]
+        """
+        streams = self._with_group(lambda: redis_client.xreadgroup(CHAT_MESSAGE_STREAM_GROUP, consumer,
+                                                                   {CHAT_MESSAGE_STREAM_KEY: '>'}, count=count))
+        entries = streams[0][1] if streams else []
+        return self._decode(entries)
+
+    def claim_stale(self, consumer, count):
+        """
+        다른 워커가 읽고 오래 ACK하지 않은 메시지를 가져온다. [(entry_id, payload), ...]
+        """
+        _, entries, *_ = self._with_group(lambda: redis_client.xautoclaim(
+            CHAT_MESSAGE_STREAM_KEY, CHAT_MESSAGE_STREAM_GROUP, consumer,
+            CHAT_MESSAGE_CLAIM_IDLE_MS, start_id='0-0', count=count))
+        return self._decode(entries)
+
+    def pending_count(self):
+        """stream에 남아 있는(저장되지 않은) 메시지 수"""
+        return redis_client.xlen(CHAT_MESSAGE_STREAM_KEY)
+
+    def _with_group(self, command):
+        self._ensure_group()
+        try:
+            return command()
+        except redis.ResponseError as e:
+            if 'NOGROUP' not in str(e):
+                raise
+            # 프로세스가 그룹을 만든 뒤 stream 키가 사라진 경우: 그룹을 다시 만들고 재시도
+            self._group_ready = False
+            self._ensure_group()
+            return command()
+
+    def ack(self, entry_ids):
+        if not entry_ids:
+            return
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.xack(CHAT_MESSAGE_STREAM_KEY, CHAT_MESSAGE_STREAM_GROUP, *entry_ids)
+        pipe.xdel(CHAT_MESSAGE_STREAM_KEY, *entry_ids)
+        pipe.execute()
+
+    @staticmethod
+    def _decode(entries):
+        return [(entry_id, json.loads(fields['message'])) for entry_id, fields in entries if fields]
+
+
+chat_message_stream = ChatMessageStream()
+
+
+CHAT_RECENT_MESSAGES_SIZE = 50        # 채팅방별로 보관할 최근 메시지 수
+CHAT_RECENT_MESSAGES_TTL = 86400      # 1일 (메시지가 없는 채팅방의 버퍼는 만료)
+
+
+def message_sort_key(message):
+    """직렬화된 메시지의 (created_at, id) 정렬 키 (DB 히스토리 정렬과 동일)"""
+    return parse_datetime(message['created_at']), uuid.UUID(message['id'])
+
+
+class ChatRecentMessageBuffer:
+    """
+    채팅방별 최근 메시지 링 버퍼 (serialize_message 형식 JSON - 보낸 사람 이름·프로필 URL 대신 ID·이미지 저장 경로만 저장)
+    - 목록: chat:recent:{room_id} (list, 오래된 순, 최대 CHAT_RECENT_MESSAGES_SIZE개)
+    - 준비 표시: chat:recent:{room_id}:ready → 목록이 DB의 최근 메시지를 빠짐없이 담고 있을 때만 존재
+    - 전송: 준비 여부와 관계없이 RPUSH + LTRIM (DB에 저장되기 전인 write-behind 메시지도 포함)
+    - 채우기(fill): DB에서 읽은 최근 메시지와 목록에 이미 들어온 메시지를 합쳐 다시 쓴다.
+      WATCH로 채우는 도중 들어온 메시지를 놓치지 않도록 한다.
+    - 무효화(고정 변경 등): 준비 표시만 지워 다음 조회 때 DB 기준으로 다시 채우게 한다.
+    """
+
+    @staticmethod
+    def _key(room_id):
+        return f"chat:recent:{room_id}"
+
+    @staticmethod
+    def _ready_key(room_id):
+        return f"chat:recent:{room_id}:ready"
+
+    def push(self, room_id, message):
+        key = self._key(room_id)
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.rpush(key, json.dumps(message))
+            pipe.ltrim(key, -CHAT_RECENT_MESSAGES_SIZE, -1)
+            pipe.expire(key, CHAT_RECENT_MESSAGES_TTL)
+            pipe.expire(self._ready_key(room_id), CHAT_RECENT_MESSAGES_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"chat recent messages push failed: {e}")
+
+    def get(self, room_id):
+        """
+        준비된 버퍼의 메시지 목록 (오래된 순), 준비되지 않았거나 Redis 장애 시 None
+        """
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.exists(self._ready_key(room_id))
+            pipe.lrange(self._key(room_id), 0, -1)
+            ready, messages = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"chat recent messages get failed: {e}")
+            return None
+        if not ready:
+            return None
+        return sorted((json.loads(message) for message in messages), key=message_sort_key)
+
+    def fill(self, room_id, messages):
+        """
+        DB에서 읽은 최근 메시지(오래된 순)로 버퍼를 채우고 합쳐진 목록을 반환한다. 실패 시 None
+        DB 조회 이후 목록에 들어온 메시지(가장 최근 DB 메시지보다 새로운 것)는 유지한다.
+        """
+        key, ready_key = self._key(room_id), self._ready_key(room_id)
+        newest = message_sort_key(messages[-1]) if messages else None
+        try:
+            with redis_client.pipeline(transaction=True) as pipe:
+                for _ in range(3):
+                    try:
+                        pipe.watch(key)
+                        pending = [json.loads(message) for message in pipe.lrange(key, 0, -1)]
+                        merged = {message['id']: message for message in messages}
+                        for message in pending:
+                            if message['id'] not in merged and (newest is None or message_sort_key(message) > newest):
+                                merged[message['id']] = message
+                        merged = sorted(merged.values(), key=message_sort_key)[-CHAT_RECENT_MESSAGES_SIZE:]
+
+                        pipe.multi()
+                        pipe.delete(key)
+                        if merged:
+                            pipe.rpush(key, *(json.dumps(message) for message in merged))
+                            pipe.expire(key, CHAT_RECENT_MESSAGES_TTL)
+                        pipe.set(ready_key, 1, ex=CHAT_RECENT_MESSAGES_TTL)
+                        pipe.execute()
+                        return merged
+                    except redis.WatchError:
+                        continue
+        except redis.RedisError as e:
+            logger.warning(f"chat recent messages fill failed: {e}")
+        return None
+
+    def invalidate(self, room_id):
+        try:
+            redis_client.delete(self._ready_key(room_id))
+        except redis.RedisError as e:
+            logger.warning(f"chat recent messages invalidate failed: {e}")
+
+
+chat_recent_messages = ChatRecentMessageBuffer()
+
+
+CHAT_REACTIONS_DIRTY_KEY = 'chat:reactions:dirty'
+CHAT_REACTIONS_TTL = 7 * 86400        # 7일 (만료 후에는 ChatMessage.reaction_counts 컬럼에서 다시 채움)
+CHAT_REACTIONS_SEEDED_FIELD = '_'     # 빈 해시도 "채워짐"으로 구분하기 위한 표시 필드
+
+
+class ChatReactionCounter:
+    """
+    메시지별 반응 수 카운터
+    - 카운터: chat:reactions:{message_id} (hash, field=반응, value=개수)
+      해시가 없으면 DB 컬럼(ChatMessage.reaction_counts) 값으로 채운 뒤 HINCRBY (WATCH로 중복 채우기 방지)
+    - 반영 대기: chat:reactions:dirty (set) → beat 작업(flush_reaction_counts)이 꺼내 DB 컬럼에 일괄 반영
+    - 반응 추가/제거 시 GROUP BY 집계 없이 카운터 결과를 바로 브로드캐스트한다.
+    """
+
+    @staticmethod
+    def _key(message_id):
+        return f"chat:reactions:{message_id}"
+
+    @staticmethod
+    def _decode(values):
+        return {reaction: int(count) for reaction, count in values.items()
+                if reaction != CHAT_REACTIONS_SEEDED_FIELD and int(count) > 0}
+
+    def incr(self, message_id, reaction, delta, seed):
+        """
+        반응 수를 delta만큼 바꾸고 변경 후 전체 반응 수를 반환한다. Redis 장애 시 None
+
+        :param seed: 해시가 없을 때 채울 현재 반응 수 (DB 컬럼 값)
+        """
+        key = self._key(message_id)
+        try:
+            with redis_client.pipeline(transaction=True) as pipe:
+                while True:
+                    try:
+                        pipe.watch(key)
+                        seeded = pipe.exists(key)
+                        pipe.multi()
+                        if not seeded:
+                            pipe.hset(key, mapping={CHAT_REACTIONS_SEEDED_FIELD: 1, **seed})
+                        pipe.hincrby(key, reaction, delta)
+                        pipe.hgetall(key)
+                        pipe.expire(key, CHAT_REACTIONS_TTL)
+                        pipe.sadd(CHAT_REACTIONS_DIRTY_KEY, str(message_id))
+                        counts = pipe.execute()[-3]
+                        return self._decode(counts)
+                    except redis.WatchError:
+                        continue
+        except redis.RedisError as e:
+            logger.warning(f"chat reaction counter incr failed: {e}")
+            return None
+
+    def get_many(self, message_ids):
+        """
+        카운터가 있는 메시지의 반응 수 {message_id: {반응: 개수}} (없는 메시지는 DB 컬럼 값을 사용)
+        """
+        message_ids = [str(message_id) for message_id in message_ids]
+        if not message_ids:
+            return {}
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for message_id in message_ids:
+                pipe.hgetall(self._key(message_id))
+            results = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"chat reaction counter get failed: {e}")
+            return {}
+        return {message_id: self._decode(values) for message_id, values in zip(message_ids, results) if values}
+
+    def pop_dirty(self, count):
+        """
+        DB에 반영할 메시지 ID와 현재 반응 수를 최대 count개 꺼낸다. {message_id: {반응: 개수}}
+        """
+        message_ids = redis_client.spop(CHAT_REACTIONS_DIRTY_KEY, count)
+        return self.get_many(message_ids or [])
+
+    def mark_dirty(self, message_ids):
+        if message_ids:
+            redis_client.sadd(CHAT_REACTIONS_DIRTY_KEY, *message_ids)
+
+
+chat_reaction_counter = ChatReactionCounter()
@@ -12,9 +12,9 @@ class ChatMessageSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'chat_room', 'sender', 'sender_name', 'sender_id', 'sender_unique_id',
             'sender_profile_image', 'message_type', 'content', 'is_announcement',
-            'is_pinned', 'priority', 'created_at', 'updated_at', 'is_read'
+            'is_pinned', 'priority', 'created_at', 'updated_at', 'is_read', 'reaction_counts'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'reaction_counts']
 
     def get_sender_profile_image(self, obj):
         """프로필 이미지 URL 반환 (실시간 우선 - 프로필 변경 즉시 반영)"""
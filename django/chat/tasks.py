@@ -0,0 +1,156 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+chat/tasks.py
+
+Celery 작업 큐
+- 채팅 푸시 합치기: 창(window) 동안 쌓인 메시지를 채팅방 단위로 묶어 전송
+- 채팅 메시지 write-behind 저장: Redis stream에 쌓인 메시지를 bulk_create로 저장
+- 반응 수 반영: Redis 반응 카운터를 ChatMessage.reaction_counts 컬럼에 일괄 반영
+'''
+import os
+import socket
+import time
+
+from celery import shared_task
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils.dateparse import parse_datetime
+
+from chat.models import ChatMessage, ChatRoom
+from chat.redis_interface import chat_message_stream, chat_push_queue, chat_reaction_counter
+from utils.push_fcm_notification import send_coalesced_chat_notifications
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHAT_PUSH_DISPATCH_BATCH_SIZE = 100   # 한 번에 꺼낼 채팅방 수
+CHAT_PUSH_DISPATCH_MAX_BATCHES = 10   # beat 한 주기에 처리할 최대 배치 수
+CHAT_PERSIST_BATCH_SIZE = 500         # 한 번의 bulk_create로 저장할 최대 메시지 수
+CHAT_PERSIST_MAX_BATCHES = 20         # beat 한 주기에 저장할 최대 배치 수
+REACTION_FLUSH_BATCH_SIZE = 500       # 한 번의 bulk_update로 반영할 최대 메시지 수
+
+
+@shared_task
+def dispatch_due_chat_pushes():
+    """
+    beat 주기 작업: 합치기 창이 끝난 채팅방을 꺼내 채팅방별 전송 작업으로 넘긴다.
+    전송 작업을 큐에 넣지 못하면(브로커 장애 등) 남은 채팅방을 다시 예약하고 다음 주기에 재시도한다.
+    """
+    now = time.time()
+    for _ in range(CHAT_PUSH_DISPATCH_MAX_BATCHES):
+        room_ids = chat_push_queue.pop_due(now, CHAT_PUSH_DISPATCH_BATCH_SIZE)
+        for index, room_id in enumerate(room_ids):
+            try:
+                flush_chat_pushes.delay(room_id)
+            except Exception as e:
+                logger.error(f"채팅 푸시 전송 작업 등록 실패 (채팅방 {room_id}): {e}")
+                chat_push_queue.requeue(room_ids[index:], now)
+                return
+        if len(room_ids) < CHAT_PUSH_DISPATCH_BATCH_SIZE:
+            break
+
+
+@shared_task
+def flush_chat_pushes(room_id):
+    """
+    채팅방 버퍼의 메시지를 비우고 수신자별로 묶어 푸시 전송
+    """
+    entries = chat_push_queue.drain(room_id)
+    if not entries:
+        return
+
+    try:
+        chat_room = ChatRoom.objects.get(id=room_id)
+    except ChatRoom.DoesNotExist:
+        logger.warning(f"채팅방을 찾을 수 없어 푸시를 버립니다: {room_id} ({len(entries)}건)")
+        return
+
+    try:
+        send_coalesced_chat_notifications(chat_room, entries)
+    except Exception as e:
+        logger.error(f"채팅 푸시 전송 실패 (채팅방 {room_id}): {e}")
+
+
+@shared_task
+def persist_chat_messages():
+    """
+    beat 주기 작업: write-behind 모드에서 Redis stream에 쌓인 채팅 메시지를 배치 단위로 저장한다.
+    먼저 다른 워커가 저장하지 못하고 남긴 메시지를 가져오고, 이어서 새 메시지를 읽는다.
+    write-behind가 꺼져 있으면 켜져 있던 동안 남은 메시지가 있을 때만 저장한다.
+    """
+    if not settings.CHAT_WRITE_BEHIND and not chat_message_stream.pending_count():
+        return
+
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    entries = chat_message_stream.claim_stale(consumer, CHAT_PERSIST_BATCH_SIZE)
+    if entries:
+        logger.warning(f"저장되지 않은 채팅 메시지 {len(entries)}건 복구")
+        _persist_entries(entries)
+
+    for _ in range(CHAT_PERSIST_MAX_BATCHES):
+        entries = chat_message_stream.read(consumer, CHAT_PERSIST_BATCH_SIZE)
+        if entries:
+            _persist_entries(entries)
+        if len(entries) < CHAT_PERSIST_BATCH_SIZE:
+            break
+
+
+def _build_message(payload):
+    return ChatMessage(
+        id=payload['id'],
+        chat_room_id=payload['chat_room_id'],
+        sender_id=payload['sender_id'],
+        sender_unique_id=payload['sender_unique_id'],
+        sender_profile_image=payload['sender_profile_image'],
+        content=payload['content'],
+        message_type=payload['message_type'],
+        created_at=parse_datetime(payload['created_at']),
+    )
+
+
+def _persist_entries(entries):
+    """
+    메시지를 bulk_create로 저장하고 ACK한다. (같은 메시지가 다시 들어와도 PK 충돌은 무시하므로 중복 저장되지 않음)
+    배치 저장이 실패하면 한 건씩 저장하여, 잘못된 메시지(삭제된 채팅방 등)만 버리고 나머지는 저장한다.
+    """
+    entry_ids = [entry_id for entry_id, _ in entries]
+    try:
+        ChatMessage.objects.bulk_create([_build_message(payload) for _, payload in entries], ignore_conflicts=True)
+    except Exception as e:
+        logger.error(f"채팅 메시지 일괄 저장 실패, 개별 저장으로 재시도: {e}")
+        entry_ids = []
+        for entry_id, payload in entries:
+            try:
+                _build_message(payload).save(force_insert=True)
+            except IntegrityError as error:
+                logger.error(f"채팅 메시지 저장 불가, 버림: {payload.get('id')} ({error})")
+            except Exception as error:
+                logger.error(f"채팅 메시지 저장 실패, 다음 주기에 재시도: {payload.get('id')} ({error})")
+                continue
+            entry_ids.append(entry_id)
+    chat_message_stream.ack(entry_ids)
+
+
+@shared_task
+def flush_reaction_counts():
+    """
+    beat 주기 작업: 반응 수가 바뀐 메시지의 Redis 카운터 값을 DB 컬럼(ChatMessage.reaction_counts)에 반영한다.
+    반영 시점의 카운터 값을 그대로 쓰므로 여러 번 바뀌어도 마지막 값으로 수렴한다.
+    """
+    while True:
+        counts = chat_reaction_counter.pop_dirty(REACTION_FLUSH_BATCH_SIZE)
+        if not counts:
+            break
+        try:
+            ChatMessage.objects.bulk_update(
+                [ChatMessage(id=message_id, reaction_counts=reaction_counts) for message_id, reaction_counts in counts.items()],
+                ['reaction_counts'],
+            )
+        except Exception as e:
+            logger.error(f"반응 수 반영 실패, 다음 주기에 재시도: {e}")
+            chat_reaction_counter.mark_dirty(list(counts))
+            break
+        if len(counts) < REACTION_FLUSH_BATCH_SIZE:
+            break
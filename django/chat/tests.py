@@ -1,3 +1,265 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+import fakeredis
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from chat import redis_interface, tasks
+from chat.history import InvalidCursor, get_cached_message_page, get_message_page, serialize_message
+from chat.models import ChatMessage, ChatReaction, ChatRoom, ChatRoomParticipant
+
+User = get_user_model()
+
+
+class FakeRedisMixin:
+    """
+    chat.redis_interface의 Redis 클라이언트를 fakeredis로 교체합니다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.redis = fakeredis.FakeStrictRedis(decode_responses=True)
+        patcher = patch.object(redis_interface, 'redis_client', self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class ChatTestDataMixin:
+
+    def create_chat_data(self):
+        """
+        채팅방 2개와 사용자 2명을 생성합니다.
+        """
+        self.user1 = User.objects.create_user(email='chat1@example.com', user_id='chat1', password='test123', name='일번')
+        self.user2 = User.objects.create_user(email='chat2@example.com', user_id='chat2', password='test123', name='이번')
+        self.room1 = ChatRoom.objects.create(chat_room_name='Room 1', chat_room_type='CLUB', club_id=1)
+        self.room2 = ChatRoom.objects.create(chat_room_name='Room 2', chat_room_type='CLUB', club_id=2)
+        self.base_time = timezone.now() - timedelta(hours=1)
+
+    def create_message(self, chat_room, sender, seconds, content='hi'):
+        return ChatMessage.objects.create(chat_room=chat_room, sender=sender, content=content,
+                                          created_at=self.base_time + timedelta(seconds=seconds))
+
+
+class UnreadCountTest(ChatTestDataMixin, TestCase):
+
+    def setUp(self):
+        self.create_chat_data()
+        self.first = self.create_message(self.room1, self.user2, 1)
+        self.create_message(self.room1, self.user2, 2)
+        self.create_message(self.room1, self.user2, 3)
+        self.create_message(self.room1, self.user1, 4)  # 본인 메시지는 세지 않음
+        self.create_message(self.room2, self.user2, 5)
+        self.create_message(self.room2, self.user2, 6)
+
+    def test_unread_counts(self):
+        """
+        워터마크 이후 다른 사용자가 보낸 메시지 수를 채팅방별로 한 번에 계산하는지 테스트합니다.
+        """
+        ChatRoomParticipant.objects.mark_read(self.room1, self.user1, read_at=self.first.created_at)
+
+        with self.assertNumQueries(1):
+            counts = ChatRoomParticipant.objects.unread_counts(
+                self.user1, ChatRoom.objects.filter(pk__in=[self.room1.pk, self.room2.pk]))
+
+        # room2는 참가 기록이 없으므로 전체 메시지를 센다
+        self.assertEqual(counts, {self.room1.pk: 2, self.room2.pk: 2})
+        self.assertEqual(ChatRoomParticipant.objects.unread_count(self.room1, self.user1), 2)
+
+    def test_mark_read_is_monotonic(self):
+        """
+        워터마크가 뒤로 돌아가지 않는지 테스트합니다.
+        """
+        latest = self.base_time + timedelta(seconds=10)
+        ChatRoomParticipant.objects.mark_read(self.room1, self.user1, read_at=latest)
+        ChatRoomParticipant.objects.mark_read(self.room1, self.user1, read_at=self.first.created_at)
+
+        participant = ChatRoomParticipant.objects.get(chat_room=self.room1, user=self.user1)
+        self.assertEqual(participant.last_read_at, latest)
+        self.assertEqual(ChatRoomParticipant.objects.unread_count(self.room1, self.user1), 0)
+
+
+class MessagePageTest(ChatTestDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_chat_data()
+        # 3, 4번째 메시지는 생성 시각이 같음 (id로 순서 결정)
+        seconds = [1, 2, 3, 3, 4]
+        self.messages = [self.create_message(self.room1, self.user2, second, content=f'm{index}')
+                         for index, second in enumerate(seconds)]
+        self.messages.sort(key=lambda message: (message.created_at, message.id))
+        self.ids = [str(message.id) for message in self.messages]
+
+    def test_keyset_cursors(self):
+        """
+        before/after 커서로 빠짐없이, 겹치지 않게 페이지가 이어지는지 테스트합니다.
+        """
+        latest = get_message_page(self.room1, limit=2)
+        self.assertEqual([message['id'] for message in latest['messages']], self.ids[3:])
+        self.assertTrue(latest['has_more'])
+
+        middle = get_message_page(self.room1, before=latest['before_cursor'], limit=2)
+        self.assertEqual([message['id'] for message in middle['messages']], self.ids[1:3])
+
+        oldest = get_message_page(self.room1, before=middle['before_cursor'], limit=2)
+        self.assertEqual([message['id'] for message in oldest['messages']], self.ids[:1])
+        self.assertFalse(oldest['has_more'])
+
+        newer = get_message_page(self.room1, after=middle['after_cursor'], limit=10)
+        self.assertEqual([message['id'] for message in newer['messages']], self.ids[3:])
+        self.assertFalse(newer['has_more'])
+
+        by_id = get_message_page(self.room1, after_message_id=self.ids[2], limit=10)
+        self.assertEqual([message['id'] for message in by_id['messages']], self.ids[3:])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            get_message_page(self.room1, before='not-a-cursor')
+
+
+class CachedMessagePageTest(ChatTestDataMixin, FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_chat_data()
+        for second in range(1, 6):
+            self.create_message(self.room1, self.user2, second, content=f'm{second}')
+
+    def test_cached_page(self):
+        """
+        최근 메시지 버퍼에서 조회한 페이지가 DB 조회 결과와 같고, 보낸 사람 정보는 조회 시점 값으로 채워지는지 테스트합니다.
+        """
+        expected = get_message_page(self.room1, limit=3)
+        self.assertEqual(get_cached_message_page(self.room1, limit=3), expected)
+
+        # 버퍼에 들어간 새 메시지와 이름 변경이 다음 조회에 반영됨
+        new_message = self.create_message(self.room1, self.user2, 6, content='new')
+        redis_interface.chat_recent_messages.push(self.room1.id, serialize_message(new_message))
+        self.user2.name = '변경'
+        self.user2.save()
+
+        with self.assertNumQueries(1):  # 보낸 사람 조회만 수행
+            page = get_cached_message_page(self.room1, after=expected['after_cursor'])
+        self.assertEqual([message['id'] for message in page['messages']], [str(new_message.id)])
+        self.assertEqual(page['messages'][0]['sender_name'], '변경')
+
+
+class ChatReactionTest(ChatTestDataMixin, FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_chat_data()
+        self.message = self.create_message(self.room1, self.user1, 1)
+
+    def test_add_remove(self):
+        """
+        반응 추가/제거 시 반응 수가 갱신되고, 같은 반응을 다시 추가해도 중복되지 않는지 테스트합니다.
+        """
+        self.assertEqual(ChatReaction.objects.add(self.message, self.user1, '👍'), {'👍': 1})
+        self.assertEqual(ChatReaction.objects.add(self.message, self.user1, '👍'), {'👍': 1})
+        self.assertEqual(ChatReaction.objects.add(self.message, self.user2, '👍'), {'👍': 2})
+        self.assertEqual(ChatReaction.objects.add(self.message, self.user2, '❤️'), {'👍': 2, '❤️': 1})
+        self.assertEqual(ChatReaction.objects.remove(self.message, self.user2, '👍'), {'👍': 1, '❤️': 1})
+        self.assertEqual(ChatReaction.objects.remove(self.message, self.user2, '👍'), {'👍': 1, '❤️': 1})
+
+    def test_flush_reaction_counts(self):
+        """
+        Redis 반응 카운터 값이 주기 작업으로 DB 컬럼에 반영되는지 테스트합니다.
+        """
+        ChatReaction.objects.add(self.message, self.user1, '😂')
+        ChatReaction.objects.add(self.message, self.user2, '😂')
+
+        tasks.flush_reaction_counts()
+
+        self.message.refresh_from_db()
+        self.assertEqual(self.message.reaction_counts, {'😂': 2})
+
+    def test_redis_unavailable(self):
+        """
+        Redis 장애 시 DB 집계 값으로 반응 수를 반영하는지 테스트합니다.
+        """
+        server = fakeredis.FakeServer()
+        server.connected = False
+        with patch.object(redis_interface, 'redis_client', fakeredis.FakeStrictRedis(server=server)):
+            counts = ChatReaction.objects.add(self.message, self.user1, '😮')
+
+        self.message.refresh_from_db()
+        self.assertEqual(counts, {'😮': 1})
+        self.assertEqual(self.message.reaction_counts, {'😮': 1})
+
+
+@override_settings(CHAT_WRITE_BEHIND=True)
+class WriteBehindTest(ChatTestDataMixin, FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_chat_data()
+        patcher = patch.object(tasks, 'chat_message_stream', redis_interface.ChatMessageStream())
+        self.stream = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def payload(self, content):
+        message = ChatMessage(chat_room=self.room1, sender=self.user1, content=content, created_at=timezone.now())
+        return {
+            'id': str(message.id),
+            'chat_room_id': str(self.room1.id),
+            'sender_id': self.user1.id,
+            'sender_unique_id': str(self.user1.id),
+            'sender_profile_image': None,
+            'content': content,
+            'message_type': 'TEXT',
+            'created_at': message.created_at.isoformat(),
+        }
+
+    def test_persist_chat_messages(self):
+        """
+        stream에 쌓인 메시지를 저장하고 ACK하며, 같은 메시지가 다시 들어와도 중복 저장하지 않는지 테스트합니다.
+        """
+        first, second = self.payload('first'), self.payload('second')
+        self.stream.append(first)
+        self.stream.append(second)
+        self.stream.append(first)  # 재전송된 메시지
+
+        tasks.persist_chat_messages()
+
+        self.assertEqual(sorted(ChatMessage.objects.values_list('content', flat=True)), ['first', 'second'])
+        self.assertEqual(self.stream.pending_count(), 0)
+
+    @override_settings(CHAT_WRITE_BEHIND=False)
+    def test_disabled_with_empty_stream(self):
+        with patch.object(tasks, '_persist_entries') as persist_entries:
+            tasks.persist_chat_messages()
+        persist_entries.assert_not_called()
+
+
+class ChatPushCoalescingTest(FakeRedisMixin, TestCase):
+
+    def test_messages_in_window_are_sent_once(self):
+        """
+        창 안에 들어온 메시지가 채팅방당 한 번의 발송으로 묶이는지 테스트합니다.
+        """
+        queue = redis_interface.chat_push_queue
+        now = timezone.now().timestamp()
+        queue.push('room', {'content': 'a'}, now)
+        queue.push('room', {'content': 'b'}, now + 1)
+
+        self.assertEqual(queue.pop_due(now, 10), [])  # 창이 끝나기 전에는 발송하지 않음
+        due_at = now + redis_interface.CHAT_PUSH_COALESCE_WINDOW
+        self.assertEqual(queue.pop_due(due_at, 10), ['room'])
+        self.assertEqual(queue.pop_due(due_at, 10), [])
+        self.assertEqual(queue.drain('room'), [{'content': 'a'}, {'content': 'b'}])
+        self.assertEqual(queue.drain('room'), [])
+
+    def test_requeue_when_enqueue_fails(self):
+        """
+        전송 작업 등록에 실패하면 꺼낸 채팅방 중 남은 채팅방을 다시 예약하는지 테스트합니다.
+        """
+        self.redis.zadd(redis_interface.CHAT_PUSH_DUE_KEY, {'a': 1, 'b': 2, 'c': 3})
+
+        with patch.object(tasks.flush_chat_pushes, 'delay', side_effect=[None, Exception('broker down')]):
+            tasks.dispatch_due_chat_pushes()
+
+        self.assertEqual(sorted(self.redis.zrange(redis_interface.CHAT_PUSH_DUE_KEY, 0, -1)), ['b', 'c'])
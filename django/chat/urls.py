@@ -6,6 +6,9 @@ urlpatterns = [
     path('admin-message/', views.send_admin_message, name='send_admin_message'),
     path('announcement/', views.send_announcement, name='send_announcement'),
     
+    # 채팅 히스토리 (커서 기반 페이지네이션)
+    path('messages/', views.get_chat_messages, name='get_chat_messages'),
+    
     # 메시지 읽음 표시
     path('mark-read/', views.mark_message_as_read, name='mark_message_as_read'),
     path('mark-all-read/', views.mark_all_messages_as_read, name='mark_all_messages_as_read'),
@@ -11,8 +11,11 @@ from django.conf import settings
 from PIL import Image
 import io
 import uuid
-from .models import ChatRoom, ChatMessage, MessageReadStatus, ChatNotification, ChatReaction
+from django.core.exceptions import ValidationError
+from .models import ChatRoom, ChatMessage, ChatRoomParticipant, MessageReadStatus, ChatNotification, ChatReaction
 from .serializers import ChatMessageSerializer, ChatNotificationSerializer
+from .history import CHAT_HISTORY_DEFAULT_LIMIT, InvalidCursor, get_cached_message_page, serialize_message
+from .redis_interface import chat_recent_messages, chat_recipient_cache
 # 🚫 라디오 기능 비활성화 - 안드로이드에서 사용하지 않음
 # from .services.rtmp_broadcast_service import rtmp_broadcast_service
 import json
@@ -96,6 +99,8 @@ def send_admin_message(request):
             priority=0
         )
         
+        chat_recent_messages.push(chat_room.id, serialize_message(message))
+
         # 알림 생성
         _create_notifications_for_message(message, 'ADMIN')
         
@@ -166,6 +171,8 @@ def send_announcement(request):
             priority=priority
         )
         
+        chat_recent_messages.push(chat_room.id, serialize_message(message))
+
         # 알림 생성
         _create_notifications_for_message(message, 'ANNOUNCEMENT')
         
@@ -200,23 +207,11 @@ def mark_message_as_read(request):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # 읽음 상태 생성/업데이트
-        read_status, created = MessageReadStatus.objects.get_or_create(
-            message=message,
-            user=request.user,
-            defaults={'is_read': True}
-        )
-        
-        if not created:
-            read_status.is_read = True
-            read_status.read_at = timezone.now()
-            read_status.save()
+        # 읽음 워터마크를 메시지 시각까지 올림 (공지는 확인 기록도 남김)
+        _mark_read_until(message, request.user)
         
         # 읽은 사람 수 조회
-        read_count = MessageReadStatus.objects.filter(
-            message=message,
-            is_read=True
-        ).count()
+        read_count = ChatRoomParticipant.objects.readers(message).count()
         
         return Response({
             'message': '읽음 표시가 완료되었습니다',
@@ -251,17 +246,8 @@ def add_reaction(request):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # 반응 생성/업데이트
-        reaction_obj, created = ChatReaction.objects.get_or_create(
-            message=message,
-            user=request.user,
-            reaction=reaction
-        )
-        
-        # 반응 수 조회
-        from django.db.models import Count
-        reactions = ChatReaction.objects.filter(message=message).values('reaction').annotate(count=Count('reaction'))
-        reaction_counts = {item['reaction']: item['count'] for item in reactions}
+        # 반응 생성 (반응 수는 카운터로 갱신)
+        reaction_counts = ChatReaction.objects.add(message, request.user, reaction)
         
         return Response({
             'message': '반응이 추가되었습니다',
@@ -339,17 +325,23 @@ def get_message_readers(request, message_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        readers = MessageReadStatus.objects.filter(
-            message=message,
-            is_read=True
-        ).select_related('user')
+        if message.is_announcement:
+            # 공지는 명시적인 확인 기록 기준
+            readers = MessageReadStatus.objects.filter(
+                message=message,
+                is_read=True
+            ).select_related('user')
+        else:
+            # 일반 메시지는 워터마크가 메시지 시각 이후인 참가자
+            readers = ChatRoomParticipant.objects.readers(message).select_related('user')
         
         reader_list = []
-        for read_status in readers:
+        for reader in readers:
+            read_at = reader.read_at if message.is_announcement else reader.last_read_at
             reader_list.append({
-                'user_id': str(read_status.user.user_id),
-                'user_name': read_status.user.name,
-                'read_at': read_status.read_at.isoformat()
+                'user_id': str(reader.user.user_id),
+                'user_name': reader.user.name,
+                'read_at': read_at.isoformat()
             })
         
         return Response({
@@ -363,6 +355,17 @@ def get_message_readers(request, message_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+def _mark_read_until(message, user):
+    """메시지까지 읽음 처리 (워터마크 갱신, 공지 메시지는 확인 기록도 저장)"""
+    if message.is_announcement:
+        MessageReadStatus.objects.update_or_create(
+            message=message,
+            user=user,
+            defaults={'is_read': True, 'read_at': timezone.now()}
+        )
+    ChatRoomParticipant.objects.mark_read(message.chat_room, user, read_at=message.created_at)
+    return message.created_at
+
 def _create_notifications_for_message(message, notification_type):
     """메시지에 대한 알림 생성"""
     try:
@@ -411,21 +414,13 @@ def mark_message_as_read(request):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # 읽음 상태 생성 또는 업데이트
-        read_status, created = MessageReadStatus.objects.get_or_create(
-            user=request.user,
-            message=message,
-            defaults={'read_at': timezone.now()}
-        )
-        
-        if not created:
-            read_status.read_at = timezone.now()
-            read_status.save()
+        # 읽음 워터마크를 메시지 시각까지 올림 (공지는 확인 기록도 남김)
+        read_at = _mark_read_until(message, request.user)
         
         return Response({
             'success': True,
             'message_id': message_id,
-            'read_at': read_status.read_at.isoformat()
+            'read_at': read_at.isoformat()
         })
         
     except Exception as e:
@@ -465,22 +460,9 @@ def mark_all_messages_as_read(request):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # 해당 채팅방의 모든 메시지에 대해 읽음 상태 업데이트
-        messages = ChatMessage.objects.filter(chat_room=chat_room)
-        read_count = 0
-        
-        for message in messages:
-            read_status, created = MessageReadStatus.objects.get_or_create(
-                user=request.user,
-                message=message,
-                defaults={'read_at': timezone.now()}
-            )
-            
-            if not created:
-                read_status.read_at = timezone.now()
-                read_status.save()
-            
-            read_count += 1
+        # 읽음 워터마크를 현재 시각으로 올림 (메시지별 기록 없이 한 번의 갱신)
+        read_count = ChatRoomParticipant.objects.unread_count(chat_room, request.user)
+        ChatRoomParticipant.objects.mark_read(chat_room, request.user)
         
         return Response({
             'success': True,
@@ -525,14 +507,8 @@ def get_unread_count(request):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # 해당 채팅방의 모든 메시지 중 읽지 않은 메시지 개수 계산 (자신이 보낸 메시지 제외)
-        unread_count = ChatMessage.objects.filter(
-            chat_room=chat_room
-        ).exclude(
-            sender=request.user  # 🔧 수정: 자신이 보낸 메시지 제외
-        ).exclude(
-            read_statuses__user=request.user  # 읽음 상태가 있는 메시지 제외
-        ).count()
+        # 읽음 워터마크 이후에 다른 사용자가 보낸 메시지 개수
+        unread_count = ChatRoomParticipant.objects.unread_count(chat_room, request.user)
         
         print(f"🔍 채팅방 {chat_room_id}의 안읽은 메시지 개수: {unread_count}")
         
@@ -638,6 +614,7 @@ def toggle_message_pin(request):
             message.is_pinned = False
         
         message.save()
+        chat_recent_messages.invalidate(message.chat_room_id)  # 최근 메시지 버퍼의 고정 상태 갱신
         
         return Response({
             'success': True,
@@ -655,29 +632,20 @@ def toggle_message_pin(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_all_unread_counts(request):
-    """사용자의 모든 채팅방 안읽은 메시지 개수 조회"""
+    """사용자의 모든 채팅방 안읽은 메시지 개수 조회 (한 번의 GROUP BY 쿼리)"""
     try:
-        # 사용자가 참여한 모든 채팅방 조회
-        user_chat_rooms = ChatRoom.objects.filter(
-            participants__user=request.user
-        ).distinct()
-        
-        unread_counts = {}
-        for chat_room in user_chat_rooms:
-            unread_count = ChatMessage.objects.filter(
-                chat_room=chat_room
-            ).exclude(
-                sender=request.user  # 🔧 수정: 자신이 보낸 메시지 제외
-            ).exclude(
-                messagereadstatus__user=request.user  # 읽음 상태가 있는 메시지 제외
-            ).count()
-            
-            if unread_count > 0:
-                unread_counts[str(chat_room.id)] = unread_count
+        # 사용자가 참여한 모든 채팅방
+        user_chat_rooms = ChatRoom.objects.filter(participants__user=request.user)
+        
+        unread_counts = {
+            str(chat_room_id): count
+            for chat_room_id, count in ChatRoomParticipant.objects.unread_counts(request.user, user_chat_rooms).items()
+        }
         
         return Response({
             'success': True,
-            'unread_counts': unread_counts
+            'unread_counts': unread_counts,
+            'total_unread_count': sum(unread_counts.values())
         })
         
     except Exception as e:
@@ -802,6 +770,7 @@ def block_user(request):
             existing_block.is_active = True
             existing_block.reason = reason
             existing_block.save(update_fields=['is_active', 'reason'])
+            chat_recipient_cache.invalidate_user(request.user.id)  # 차단한 사용자의 채팅방 수신 정책 갱신
             return Response(
                 {
                     'message': f'{blocked_user.name}님을 다시 차단했습니다',
@@ -816,6 +785,7 @@ def block_user(request):
             blocked_user=blocked_user,
             reason=reason
         )
+        chat_recipient_cache.invalidate_user(request.user.id)
         
         return Response({
             'message': f'{blocked_user.name}님을 차단했습니다',
@@ -868,6 +838,7 @@ def unblock_user(request):
         # 차단 해제
         block.is_active = False
         block.save()
+        chat_recipient_cache.invalidate_user(request.user.id)
         
         return Response({
             'message': f'{blocked_user.name}님의 차단을 해제했습니다'
@@ -924,6 +895,8 @@ def clear_all_blocked_users(request):
             blocker=request.user,
             is_active=True
         ).update(is_active=False)
+        if blocked_count:
+            chat_recipient_cache.invalidate_user(request.user.id)
         
         return Response({
             'message': f'{blocked_count}명의 차단을 모두 해제했습니다'
@@ -1012,6 +985,74 @@ def check_user_blocked(request, user_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_chat_messages(request):
+    """
+    채팅 히스토리 조회 (keyset 페이지네이션, WebSocket get_history와 동일한 형식)
+    - chat_room_id: 클럽 ID 또는 채팅방 UUID
+    - before: 이 커서보다 이전 메시지 / after: 이 커서보다 이후 메시지 (둘 다 없으면 최신 메시지)
+    - limit: 최대 100
+    """
+    try:
+        chat_room_id = request.GET.get('chat_room_id')
+        if not chat_room_id:
+            return Response(
+                {'error': '채팅방 ID가 필요합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            try:
+                chat_room = ChatRoom.objects.get(chat_room_type='CLUB', club_id=int(chat_room_id))
+            except ValueError:
+                chat_room = ChatRoom.objects.get(id=chat_room_id)
+        except (ChatRoom.DoesNotExist, ValidationError):
+            return Response(
+                {'error': '채팅방을 찾을 수 없습니다'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if not _can_read_chat_room(request.user, chat_room):
+            return Response(
+                {'error': '채팅방에 참여하지 않은 사용자입니다'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        try:
+            page = get_cached_message_page(
+                chat_room,
+                before=request.GET.get('before'),
+                after=request.GET.get('after'),
+                limit=request.GET.get('limit', CHAT_HISTORY_DEFAULT_LIMIT),
+            )
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            'chat_room_id': str(chat_room.id),
+            **page
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response(
+            {'error': f'채팅 히스토리 조회 실패: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+def _can_read_chat_room(user, chat_room):
+    """모임 채팅방은 활동 중인 모임 멤버, 이벤트 채팅방은 활동 중인 모임 멤버인 이벤트 참가자만 조회 가능"""
+    from clubs.models import ClubMember
+    from participants.models import Participant
+
+    if chat_room.chat_room_type == 'CLUB':
+        return ClubMember.objects.filter(club_id=chat_room.club_id, user=user, status_type='active').exists()
+    if chat_room.chat_room_type == 'EVENT':
+        return Participant.objects.filter(event_id=chat_room.event_id, club_member__user=user,
+                                          club_member__status_type='active').exists()
+    return ChatRoomParticipant.objects.filter(chat_room=chat_room, user=user).exists()
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_pinned_messages(request):
@@ -1256,6 +1297,7 @@ def toggle_chat_notification(request):
         # 토글
         setting.is_enabled = not setting.is_enabled
         setting.save()
+        chat_recipient_cache.invalidate_room(chat_room)
         
         serializer = ChatNotificationSettingsSerializer(setting)
         
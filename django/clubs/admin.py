@@ -4,7 +4,7 @@ MVP demo ver 0.0.1
 clubs/admin.py
 '''
 from django.contrib import admin
-from clubs.models import Club, ClubMember
+from clubs.models import Club, ClubMember, HandicapIndexHistory
 
 '''
 목록 보기: list_display
@@ -14,6 +14,7 @@ from clubs.models import Club, ClubMember
 '''
 
 admin.site.register(ClubMember)
+admin.site.register(HandicapIndexHistory)
 
 @admin.register(Club)
 class ClubAdmin(admin.ModelAdmin):
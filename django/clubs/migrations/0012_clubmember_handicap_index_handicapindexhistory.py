@@ -0,0 +1,66 @@
+# Generated by Django 4.2.22 on 2026-10-19 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clubs", "0011_alter_clubmember_status_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="clubmember",
+            name="handicap_index",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="모임 내 라운드 기록 기반 핸디캡 인덱스"
+            ),
+        ),
+        migrations.CreateModel(
+            name="HandicapIndexHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("handicap_index", models.FloatField(verbose_name="핸디캡 인덱스")),
+                (
+                    "rounds_used",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="계산에 사용된 라운드 수"
+                    ),
+                ),
+                (
+                    "differentials_used",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="평균에 사용된 베스트 디퍼렌셜 수"
+                    ),
+                ),
+                ("calculated_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "club_member",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="handicap_histories",
+                        to="clubs.clubmember",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-calculated_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["club_member", "calculated_at"],
+                        name="clubs_handi_club_me_3186d6_idx",
+                    )
+                ],
+            },
+        ),
+    ]
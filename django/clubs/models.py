@@ -52,6 +52,7 @@ class ClubMember(models.Model):
     total_handicap_rank = models.CharField("모임 내 전체 핸디캡 적용 랭킹", max_length=10, default="0", null=True, blank=True)
     total_avg_score = models.FloatField("모임 내 모든 이벤트의 평균 점수", default=0.0)
     total_handicap_avg_score = models.FloatField("모임 내 모든 이벤트의 핸디캡 적용 평균 점수", default=0.0)
+    handicap_index = models.FloatField("모임 내 라운드 기록 기반 핸디캡 인덱스", null=True, blank=True)
 
     class Meta:
         unique_together = ('user', 'club')
@@ -125,6 +126,34 @@ class ClubMember(models.Model):
         sorted_members = sorted(members, key=lambda m: m.total_handicap_avg_score)
         cls.assign_ranks(sorted_members, 'total_handicap_avg_score')
 
+    @classmethod
+    def calculate_handicap_indexes(cls, club):
+        """
+        모임 멤버 전체의 핸디캡 인덱스를 한 번에 계산하여 저장하고, 이력을 남기는 함수
+        인덱스가 바뀐 멤버만 저장하고 이력을 남긴다.
+        """
+        from participants.utils.handicap import calculate_handicap_indexes
+
+        results = calculate_handicap_indexes(club)
+        if not results:
+            return
+
+        members = [
+            member for member in cls.objects.filter(id__in=results.keys())
+            if member.handicap_index != results[member.id]['handicap_index']
+        ]
+        if not members:
+            return
+        for member in members:
+            member.handicap_index = results[member.id]['handicap_index']
+        cls.objects.bulk_update(members, ['handicap_index'])
+
+        HandicapIndexHistory.objects.bulk_create([
+            HandicapIndexHistory(club_member_id=member.id, **results[member.id])
+            for member in members
+        ])
+        logger.info(f"Handicap indexes updated for {len(members)} members in club: {club}")
+
     def assign_ranks(members, type):
         """
         동점자를 고려한 순위를 계산하여 데이터베이스에 저장.
@@ -151,4 +180,21 @@ class ClubMember(models.Model):
             rank += 1  # 다음 순위로 이동
 
             # 업데이트된 랭킹을 데이터베이스에 저장
-            member.save()
\ No newline at end of file
+            member.save()
+
+class HandicapIndexHistory(models.Model):
+    '''
+    모임 멤버의 핸디캡 인덱스 계산 이력
+    '''
+    club_member         = models.ForeignKey(ClubMember, on_delete=models.CASCADE, related_name='handicap_histories')
+    handicap_index      = models.FloatField("핸디캡 인덱스")
+    rounds_used         = models.PositiveIntegerField("계산에 사용된 라운드 수", default=0)
+    differentials_used  = models.PositiveIntegerField("평균에 사용된 베스트 디퍼렌셜 수", default=0)
+    calculated_at       = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-calculated_at']
+        indexes = [models.Index(fields=['club_member', 'calculated_at'])]
+
+    def __str__(self):
+        return f"{self.club_member} - {self.handicap_index} ({self.calculated_at})"
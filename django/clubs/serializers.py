@@ -94,42 +94,34 @@ class ClubSerializer(serializers.ModelSerializer):
     def get_unread_count(self, obj):
         '''
         클럽 채팅방의 읽지 않은 메시지 개수를 반환
+        목록 직렬화(many=True)에서는 첫 모임을 직렬화할 때 목록 전체의 개수를 한 번의 쿼리로 계산해 context에 보관
         '''
         try:
-            from chat.models import ChatRoom, ChatMessage
-            
             request = self.context.get('request')
             if not request:
                 return 0
-                
-            current_user = request.user
-            
-            # 클럽에 해당하는 채팅방 찾기
-            try:
-                chat_room = ChatRoom.objects.get(
-                    chat_room_type='CLUB',
-                    club_id=obj.id
-                )
-                
-                # 읽지 않은 메시지 개수 계산 (자신이 보낸 메시지 제외)
-                unread_count = ChatMessage.objects.filter(
-                    chat_room=chat_room
-                ).exclude(
-                    sender=current_user  # 🔧 수정: 자신이 보낸 메시지 제외
-                ).exclude(
-                    read_statuses__user=current_user  # 읽음 상태가 있는 메시지 제외
-                ).count()
-                
-                return unread_count
-                
-            except ChatRoom.DoesNotExist:
-                # 채팅방이 없으면 0 반환
-                return 0
-                
+
+            unread_counts = self.context.setdefault('club_unread_counts', {})
+            if obj.id not in unread_counts:
+                clubs = self.parent.instance if isinstance(self.parent, serializers.ListSerializer) else [obj]
+                unread_counts.update(get_club_unread_counts(request.user, [club.id for club in clubs] or [obj.id]))
+            return unread_counts.get(obj.id, 0)
+
         except Exception as e:
             # 오류 발생 시 0 반환
             return 0
 
+
+def get_club_unread_counts(user, club_ids):
+    '''
+    모임별 채팅방의 읽지 않은 메시지 개수 {club_id: count} (채팅방이 없거나 모두 읽은 모임은 0)
+    '''
+    from chat.models import ChatRoom, ChatRoomParticipant
+
+    chat_rooms = ChatRoom.objects.filter(chat_room_type='CLUB', club_id__in=club_ids)
+    counts = ChatRoomParticipant.objects.unread_counts(user, chat_rooms, group_by='chat_room__club_id')
+    return {club_id: counts.get(club_id, 0) for club_id in club_ids}
+
 class ClubCreateUpdateSerializer(serializers.ModelSerializer):
     '''
     모임을 생성하거나 업데이트할 때 사용되는 데이터의 직렬화/역직렬화를 처리하는 클래스
@@ -0,0 +1,37 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+clubs/signals.py
+
+역할: 모임 멤버 변경 시 모임별 푸시 토큰 캐시/모임 채팅방 수신 정책 캐시/캘린더 캐시 무효화
+(bulk_create 등 시그널이 발생하지 않는 경로는 호출하는 쪽에서 직접 무효화)
+'''
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from accounts.redis_interface import club_token_cache
+from chat.redis_interface import chat_recipient_cache
+from clubs.models import ClubMember
+
+
+@receiver(post_save, sender=ClubMember)
+def invalidate_club_tokens_on_join(sender, instance, created, **kwargs):
+    if created:
+        club_token_cache.invalidate([instance.club_id])
+        chat_recipient_cache.invalidate(club_ids=[instance.club_id])
+
+
+@receiver(post_delete, sender=ClubMember)
+def invalidate_club_tokens_on_leave(sender, instance, **kwargs):
+    club_token_cache.invalidate([instance.club_id])
+    chat_recipient_cache.invalidate(club_ids=[instance.club_id])
+
+
+@receiver(pre_delete, sender=ClubMember)
+def invalidate_calendar_on_leave(sender, instance, **kwargs):
+    # 탈퇴/강퇴/모임 삭제 시 참가 기록이 함께 삭제되므로, 삭제 전에 해당 유저의 참가 이벤트 달을 무효화
+    from events.utils import EventUtils  # 순환 import 방지
+
+    user_ids, months = EventUtils.get_member_calendar_targets(instance)
+    if months:
+        EventUtils.invalidate_calendar_cache(user_ids, months)
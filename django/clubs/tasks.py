@@ -15,9 +15,7 @@ from clubs.models import Club, ClubMember
 from utils.push_fcm_notification import get_fcm_tokens_for_club_members, send_fcm_notifications
 from notifications.redis_interface import NotificationRedisInterface
 
-import uuid
 from datetime import datetime, time
-from asgiref.sync import async_to_sync
 
 import logging
 
@@ -50,6 +48,9 @@ def calculate_club_ranks_and_points(club_id=None):
                 ClubMember.calculate_handicap_avg_rank(club)
                 logger.info(f"Ranks calculated for club: {club}")
 
+                # 라운드 기록 기반 핸디캡 인덱스를 모임 단위로 일괄 계산
+                ClubMember.calculate_handicap_indexes(club)
+
                 # 참가자 포인트 계산
                 participants = Participant.objects.filter(
                     club_member__club=club,
@@ -84,7 +85,7 @@ def send_club_creation_notification(club_id):
         logger.info(f"모임 생성자(관리자) ID들: {list(admin_members)}")
         
         fcm_tokens = get_fcm_tokens_for_club_members(club, exclude_user_ids=list(admin_members))
-        logger.info(f"Retrieved fcm_tokens: {fcm_tokens}")
+        logger.info(f"Retrieved {len(fcm_tokens)} fcm_tokens")
 
         # 모임 이름을 포함한 메시지 생성
         message_title = f"{club.name} 모임에 초대되었습니다."
@@ -105,19 +106,10 @@ def send_club_creation_notification(club_id):
             send_fcm_notifications(fcm_tokens, message_title, message_body, club_id=club.id)
             logger.info(f"모임 생성 알림 전송 성공")
 
-            # 🔧 수정: 생성자(관리자) 제외하고 Redis에 저장
+            # 🔧 수정: 생성자(관리자) 제외하고 Redis에 저장 (본문은 한 번만 저장하고 멤버별 인덱스만 추가)
             user_ids = club.members.exclude(id__in=admin_members).values_list('id', flat=True)  # 생성자 제외한 멤버 ID만
-            print(f"user_ids: {user_ids}")
-            for user_id in user_ids:
-                print(f"user_id: {user_id}")
-                # UUID 기반으로 notification_id 생성
-                notification_id = str(uuid.uuid4())
-                base_notification_data['notification_id'] = notification_id
-
-                notification_data = {**base_notification_data, "status": "success"}
-                print(f"notification준비 완료 {notification_id}, {notification_data}")
-
-                async_to_sync(redis_interface.save_notification)(user_id, notification_id, notification_data, club_id=club.id)
+            redis_interface.save_bulk_notification(user_ids, {**base_notification_data, "status": "success"},
+                                                   club_id=club.id)
         else:
             logger.info(f"No FCM tokens found for club members in club: {club}")
 
@@ -14,6 +14,8 @@ from rest_framework.permissions import IsAuthenticated, BasePermission
 from django.db import transaction
 from django.http import Http404
 
+from accounts.redis_interface import club_token_cache
+from chat.redis_interface import chat_recipient_cache
 from utils.compress_image import compress_image
 from .club_common import ClubViewSet, IsClubAdmin, IsMemberOfClub
 from ..models import ClubMember, User
@@ -176,6 +178,9 @@ class ClubAdminViewSet(ClubViewSet):
         new_members = [ClubMember(club=club, user_id=account_id, role='member', status_type='invited') for account_id in new_users]
         with transaction.atomic():  # 트랜잭션 사용
             ClubMember.objects.bulk_create(new_members)
+        # bulk_create는 시그널이 발생하지 않으므로 직접 무효화
+        club_token_cache.invalidate([club.id])
+        chat_recipient_cache.invalidate(club_ids=[club.id])
 
         # 새로 추가된 멤버를 user_id 기준으로 다시 조회 (select_related로 user 정보 포함)
         created_members = ClubMember.objects.filter(club=club, user_id__in=list(new_users)).select_related('user')
@@ -10,7 +10,6 @@ clubs/views/club_common.py
 - 모임: 생성, 조회, 특정 모임 조회, 특정 모임의 멤버 조회
 누구나 모임을 생성하고, 자신이 속한 모임을 조회하고, 모임 초대 수락/거절 가능
 '''
-from sympy import Q
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -25,6 +24,7 @@ from ..serializers import (ClubSerializer, ClubCreateUpdateSerializer, ClubMembe
 from clubs.tasks import send_club_creation_notification
 from events.models import Event
 
+from utils.conditional_response import get_not_modified_response, make_etag, set_validator_headers
 from utils.error_handlers import handle_club_400_invalid_serializer, handle_404_not_found, handle_400_bad_request
 
 logger = logging.getLogger(__name__)
@@ -293,13 +293,33 @@ class ClubViewSet(viewsets.ModelViewSet):
         except Http404: # 모임이 존재하지 않는 경우
             return handle_404_not_found('Club', kwargs.get("pk"))
 
+        # 모임/멤버/안 읽은 메시지 수가 바뀌지 않았으면 직렬화 없이 304 반환
+        etag = self.get_club_etag(instance)
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+
         serializer      = self.get_serializer(instance) # 모임 객체 직렬화
         response_data   = {
             'status': status.HTTP_200_OK,
             'message': 'Successfully retrieved',
             'data': serializer.data
         }
-        return Response(response_data, status=status.HTTP_200_OK)
+        return set_validator_headers(Response(response_data, status=status.HTTP_200_OK), etag)
+
+    def get_club_etag(self, club):
+        '''
+        모임 상세 조회 응답의 ETag를 계산
+        Club에는 수정 시각 필드가 없으므로 Last-Modified 없이 모임 정보, 멤버 구성(id 순 (id, 역할, 상태) 목록),
+        멤버 프로필 최근 수정 시각, 요청 유저의 안 읽은 메시지 수로 ETag만 만든다.
+        '''
+        members = list(ClubMember.objects.filter(club=club).order_by('id')
+                       .values_list('id', 'role', 'status_type', 'user__updated_at'))
+        user_updated_at = max((member[3] for member in members), default=None)
+        member_states = [member[:3] for member in members]
+        unread_count = ClubSerializer(context=self.get_serializer_context()).get_unread_count(club)
+        return make_etag('club', club.pk, self.request.user.pk, club.name, club.description, club.image.name,
+                         member_states, user_updated_at, unread_count)
     
     # 모임 검색 API
     @action(detail=False, methods=['get'], url_path='search', url_name='search_clubs')
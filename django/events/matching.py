@@ -0,0 +1,101 @@
+'''
+MVP demo ver 0.0.9
+2026.10.19
+events/matching.py
+
+역할: 핸디캡 기반 조/팀 자동 배정 엔진
+- 조(팀)별 인원을 최대한 고르게 나눈 상태에서, 조별 핸디캡 합의 분산이 최소가 되도록 배정
+- 1단계(greedy): 핸디캡이 높은 멤버부터 자리가 남은 조 중 합이 가장 작은 조에 배정
+- 2단계(local search): 합이 큰 조와 작은 조 사이에서 분산을 줄이는 1:1 교환을 시간 예산 안에서 반복
+Django 모델에 의존하지 않으므로 뷰와 벤치마크(benchmarks/handicap_matching.py)에서 함께 사용한다.
+'''
+import time
+from bisect import bisect_left
+
+DEFAULT_TIME_BUDGET = 0.05  # 초 (교환 탐색에 사용할 최대 시간)
+_EPSILON = 1e-9
+
+
+def split_sizes(member_count, group_count):
+    """
+    member_count명을 group_count개 조로 나눌 때 조별 인원 (인원 차이는 최대 1명)
+    """
+    base, extra = divmod(member_count, group_count)
+    return [base + 1] * extra + [base] * (group_count - extra)
+
+
+def sum_variance(handicaps, groups):
+    """
+    조별 핸디캡 합의 분산 (배정 품질 지표, 작을수록 균형)
+    """
+    sums = [sum(handicaps[index] for index in group) for group in groups]
+    mean = sum(sums) / len(sums)
+    return sum((value - mean) ** 2 for value in sums) / len(sums)
+
+
+def balance_groups(handicaps, sizes, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    handicaps: 멤버별 핸디캡 목록, sizes: 조별 인원 목록 (합은 멤버 수와 같아야 함)
+    반환값: 조별 멤버 인덱스 목록 [[index, ...], ...]
+    """
+    if sum(sizes) != len(handicaps):
+        raise ValueError('조별 인원의 합이 멤버 수와 다릅니다.')
+
+    deadline = time.perf_counter() + time_budget
+    groups = [[] for _ in sizes]
+    sums = [0.0] * len(sizes)
+
+    # 1. greedy: 핸디캡이 높은 멤버부터 합이 가장 작은 (자리가 남은) 조에 배정
+    for index in sorted(range(len(handicaps)), key=lambda i: handicaps[i], reverse=True):
+        target = min((g for g in range(len(sizes)) if len(groups[g]) < sizes[g]), key=lambda g: sums[g])
+        groups[target].append(index)
+        sums[target] += handicaps[index]
+
+    # 2. local search: 개선되는 교환이 없거나 시간 예산을 다 쓸 때까지 반복
+    while time.perf_counter() < deadline and _swap_once(handicaps, groups, sums):
+        pass
+    return groups
+
+
+def _swap_once(handicaps, groups, sums):
+    """
+    합이 큰 조부터 합이 작은 조와 비교하여 분산을 줄이는 교환을 한 번 수행. 교환했으면 True
+    """
+    ranked = sorted(range(len(groups)), key=lambda g: sums[g], reverse=True)
+    for position, high in enumerate(ranked):
+        for low in reversed(ranked[position + 1:]):  # 합이 가장 작은 조부터
+            gap = sums[high] - sums[low]
+            if gap <= _EPSILON:
+                break
+            swap = _best_swap(handicaps, groups[high], groups[low], gap)
+            if swap is None:
+                continue
+            high_pos, low_pos = swap
+            moved = handicaps[groups[high][high_pos]] - handicaps[groups[low][low_pos]]
+            groups[high][high_pos], groups[low][low_pos] = groups[low][low_pos], groups[high][high_pos]
+            sums[high] -= moved
+            sums[low] += moved
+            return True
+    return False
+
+
+def _best_swap(handicaps, high_group, low_group, gap):
+    """
+    두 조의 멤버를 하나씩 교환할 때 분산이 가장 많이 줄어드는 (high 위치, low 위치)를 반환 (없으면 None)
+    핸디캡 차이 d만큼 합을 옮기면 제곱합이 2d(d - gap)만큼 변하므로 0 < d < gap 이고 d가 gap/2에 가까울수록 좋다.
+    """
+    low_sorted = sorted(range(len(low_group)), key=lambda pos: handicaps[low_group[pos]])
+    low_values = [handicaps[low_group[pos]] for pos in low_sorted]
+
+    best, best_gain = None, -_EPSILON
+    for high_pos, high_index in enumerate(high_group):
+        target = handicaps[high_index] - gap / 2  # 교환 상대의 이상적인 핸디캡
+        nearest = bisect_left(low_values, target)
+        for candidate in (nearest - 1, nearest):
+            if not 0 <= candidate < len(low_values):
+                continue
+            moved = handicaps[high_index] - low_values[candidate]
+            gain = 2 * moved * (moved - gap)
+            if gain < best_gain:
+                best, best_gain = (high_pos, low_sorted[candidate]), gain
+    return best
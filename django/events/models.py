@@ -75,127 +75,65 @@ class Event(models.Model):
     total_win_team_handicap = models.CharField("승리 팀 by 핸디캡 합계", max_length=4,
                                        choices=WinningTeamType.choices, default=WinningTeamType.NONE)
 
-    def calculate_group_scores(self):
+    def calculate_team_results(self):
         from participants.models import Participant  # 지연 import
         """
-        각 조별로 팀 A와 팀 B의 점수를 합산하여 전체 조별 점수를 계산한다.
+        팀전 결과(조별 승리 수, 전체 점수 합계, 승리 팀)를 한 번에 계산하여 저장한다.
+        - (조, 팀)별 sum_score/handicap_score 합계를 GROUP BY 쿼리 한 번으로 가져온 뒤 메모리에서 계산
+        - 골프 점수이므로 점수가 더 낮은 팀이 승리 (실시간 스코어 기록의 redis 계산과 동일한 기준)
         """
-        participants = Participant.objects.filter(event=self)
-        group_scores = participants.values('group_type').distinct()  # 각 조의 그룹 타입을 중복 없이 가져온다.
-
-        # 각 팀의 조별 승리 횟수를 카운트하기 위한 변수 초기화
-        a_group_wins = 0
-        b_group_wins = 0
-
-        # 각 그룹 타입에 대해 반복하면서 A팀과 B팀의 총점을 각각 계산한다.
-        for group in group_scores:
-            group_type = group['group_type']
-            # 각 팀의 점수를 합산한다. 만약 점수가 None(없음)일 경우 0으로 설정
-            team_a_score = participants.filter(group_type=group_type, team_type=Participant.TeamType.TEAM1).aggregate(
-                total=Sum('sum_score'))['total'] or 0
-            team_b_score = participants.filter(group_type=group_type, team_type=Participant.TeamType.TEAM2).aggregate(
-                total=Sum('sum_score'))['total'] or 0
-
-            # 각 팀의 점수를 비교하여 더 높은 점수를 가진 팀의 승리 횟수를 증가시킨다.
-            if team_a_score < team_b_score:
-                b_group_wins += 1
-            elif team_b_score < team_a_score:
-                a_group_wins += 1
-
-        # 각 팀의 조별 승리 횟수를 이벤트의 관련 필드에 저장한다.
-        self.team_a_group_wins = a_group_wins
-        self.team_b_group_wins = b_group_wins
-
-        # 조별 승리 횟수를 비교하여 전체 조별 승리 팀을 결정하고 저장한다.
-        if a_group_wins > b_group_wins:
-            self.group_win_team = self.WinningTeamType.TEAM1
-        elif b_group_wins > a_group_wins:
-            self.group_win_team = self.WinningTeamType.TEAM2
-        else:
-            self.group_win_team = self.WinningTeamType.DRAW
-
-        self.save() # 변경된 데이터를 데이터베이스에 저장
-
-    def calculate_total_scores(self):
-        from participants.models import Participant  # 지연 import
-        """
-        모든 조의 점수를 합산하여 팀 A와 팀 B의 전체 점수를 계산한다.
-        """
-        participants = Participant.objects.filter(event=self)
-        # 각 팀의 전체 점수를 합산하여 필드에 저장한다. 합계가 None일 경우 0으로 설정한다.
-        self.team_a_total_score = \
-        participants.filter(team_type=Participant.TeamType.TEAM1).aggregate(total=Sum('sum_score'))['total'] or 0
-        self.team_b_total_score = \
-        participants.filter(team_type=Participant.TeamType.TEAM2).aggregate(total=Sum('sum_score'))['total'] or 0
-
-        # 전체 점수를 비교하여 더 낮은 점수를 가진 팀을 승리 팀으로 설정한다.
-        if self.team_a_total_score < self.team_b_total_score:
-            self.total_win_team = self.WinningTeamType.TEAM1
-        elif self.team_b_total_score < self.team_a_total_score:
-            self.total_win_team = self.WinningTeamType.TEAM2
-        else:
-            self.total_win_team = self.WinningTeamType.DRAW
-
-        self.save() # 변경된 데이터를 데이터베이스에 저장
-
-    # 팀전 핸디캡 결과 계산 로직
-    def calculate_group_scores_with_handicap(self):
-        from participants.models import Participant  # 지연 import
-
-        """
-        각 조별로 팀 A와 팀 B의 핸디캡 적용 점수를 합산하여 전체 조별 점수를 계산한다.
-        """
-        participants = Participant.objects.filter(event=self)
-        group_scores = participants.values('group_type').distinct()
-
-        a_group_wins_handicap = 0
-        b_group_wins_handicap = 0
-
-        for group in group_scores:
-            group_type = group['group_type']
-            team_a_score_handicap = \
-            participants.filter(group_type=group_type, team_type=Participant.TeamType.TEAM1).aggregate(
-                total=Sum('handicap_score'))['total'] or 0
-            team_b_score_handicap = \
-            participants.filter(group_type=group_type, team_type=Participant.TeamType.TEAM2).aggregate(
-                total=Sum('handicap_score'))['total'] or 0
-
-            if team_a_score_handicap < team_b_score_handicap:
-                b_group_wins_handicap += 1
-            elif team_b_score_handicap < team_a_score_handicap:
-                a_group_wins_handicap += 1
-
-        self.team_a_group_score_handicap = a_group_wins_handicap
-        self.team_b_group_score_handicap = b_group_wins_handicap
-
-        if a_group_wins_handicap > b_group_wins_handicap:
-            self.group_win_team_handicap = self.WinningTeamType.TEAM1
-        elif b_group_wins_handicap > a_group_wins_handicap:
-            self.group_win_team_handicap = self.WinningTeamType.TEAM2
-        else:
-            self.group_win_team_handicap = self.WinningTeamType.DRAW
-
-        self.save()
-
-    def calculate_total_scores_with_handicap(self):
-        from participants.models import Participant  # 지연 import
-
-        """
-        모든 조의 핸디캡 적용 점수를 합산하여 팀 A와 팀 B의 전체 점수를 계산한다.
-        """
-        participants = Participant.objects.filter(event=self)
-        self.team_a_total_score_handicap = \
-        participants.filter(team_type=Participant.TeamType.TEAM1).aggregate(total=Sum('handicap_score'))[
-            'total'] or 0
-        self.team_b_total_score_handicap = \
-        participants.filter(team_type=Participant.TeamType.TEAM2).aggregate(total=Sum('handicap_score'))[
-            'total'] or 0
-
-        if self.team_a_total_score_handicap < self.team_b_total_score_handicap:
-            self.total_win_team_handicap = self.WinningTeamType.TEAM2
-        elif self.team_b_total_score_handicap < self.team_a_total_score_handicap:
-            self.total_win_team_handicap = self.WinningTeamType.TEAM1
-        else:
-            self.total_win_team_handicap = self.WinningTeamType.DRAW
-
-        self.save()
\ No newline at end of file
+        TEAM_A, TEAM_B = Participant.TeamType.TEAM1, Participant.TeamType.TEAM2
+
+        rows = (Participant.objects
+                .filter(event=self, team_type__in=[TEAM_A, TEAM_B])
+                .values('group_type', 'team_type')
+                .annotate(score=Sum('sum_score'), handicap_score=Sum('handicap_score'))
+                .order_by())
+
+        # {group_type: {team_type: (score, handicap_score)}}
+        group_scores = {}
+        for row in rows:
+            group_scores.setdefault(row['group_type'], {})[row['team_type']] = (
+                row['score'] or 0, row['handicap_score'] or 0)
+
+        def winner(a_score, b_score):
+            # 점수가 낮은 팀이 승리
+            if a_score < b_score:
+                return self.WinningTeamType.TEAM1
+            if b_score < a_score:
+                return self.WinningTeamType.TEAM2
+            return self.WinningTeamType.DRAW
+
+        # [스코어, 핸디캡 스코어] 순서로 조별 승리 수와 전체 합계를 누적
+        a_wins, b_wins = [0, 0], [0, 0]
+        a_totals, b_totals = [0, 0], [0, 0]
+        for teams in group_scores.values():
+            a_scores, b_scores = teams.get(TEAM_A, (0, 0)), teams.get(TEAM_B, (0, 0))
+            for index in (0, 1):
+                a_totals[index] += a_scores[index]
+                b_totals[index] += b_scores[index]
+                group_winner = winner(a_scores[index], b_scores[index])
+                if group_winner == self.WinningTeamType.TEAM1:
+                    a_wins[index] += 1
+                elif group_winner == self.WinningTeamType.TEAM2:
+                    b_wins[index] += 1
+
+        # 조별 승리 수
+        self.team_a_group_wins, self.team_a_group_wins_handicap = a_wins
+        self.team_b_group_wins, self.team_b_group_wins_handicap = b_wins
+
+        # 전체 점수 합계
+        self.team_a_total_score, self.team_a_total_score_handicap = a_totals
+        self.team_b_total_score, self.team_b_total_score_handicap = b_totals
+
+        # 승리 팀 (조별 승리 수는 많은 팀이 승리)
+        self.group_win_team = winner(-a_wins[0], -b_wins[0])
+        self.group_win_team_handicap = winner(-a_wins[1], -b_wins[1])
+        self.total_win_team = winner(a_totals[0], b_totals[0])
+        self.total_win_team_handicap = winner(a_totals[1], b_totals[1])
+
+        self.save(update_fields=[
+            'team_a_group_wins', 'team_b_group_wins', 'team_a_group_wins_handicap', 'team_b_group_wins_handicap',
+            'team_a_total_score', 'team_b_total_score', 'team_a_total_score_handicap', 'team_b_total_score_handicap',
+            'group_win_team', 'group_win_team_handicap', 'total_win_team', 'total_win_team_handicap', 'updated_at',
+        ])
@@ -0,0 +1,161 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+events/redis_interface.py
+
+역할: 이벤트 관련 Redis 자료구조
+1. 캘린더(월별 이벤트 목록) 응답을 (유저, 월) 단위로 Redis에 캐싱
+- 모임 프로필(이름, 이미지 presigned URL)은 저장하지 않고 club_id만 저장 (응답 시점에 채움)
+- 조회: 요청한 달들의 캐시를 MGET으로 한 번에 조회
+- 저장: 캐시에 없던 달만 파이프라인으로 저장
+- 무효화: 이벤트 생성/수정/삭제, 참가 상태 변경, 모임 탈퇴/강퇴/모임 삭제(clubs.signals) 시 영향을 받는 유저와 달만 삭제
+Redis 장애 시에는 캐시 없이 DB 조회로 동작하도록 예외를 삼킨다.
+2. 이벤트 예약 알림 스케줄 (발송 시각 기준 sorted set)
+'''
+import json
+import logging
+
+import redis
+
+from golbang import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 클라이언트 설정
+redis_client = redis.StrictRedis(
+    host='redis',
+    port=6379,
+    db=0,
+    password=settings.REDIS_PASSWORD,
+    decode_responses=True,
+    socket_connect_timeout=5,
+    socket_timeout=5
+)
+
+CALENDAR_CACHE_TTL = 60 * 60 * 24      # 하루 (무효화가 누락되어도 하루 뒤에는 갱신)
+CALENDAR_SCOPES = ('all', 'accepted')   # status_type 필터 유무에 따라 캐시를 분리 (accepted: 참석한 참가자가 있는 이벤트)
+
+
+class EventCalendarCache:
+    """
+    캘린더 월별 응답 캐시
+    key: calendar:{user_id}:{YYYY-MM}:{scope}
+    """
+
+    @staticmethod
+    def get_scope(status_type):
+        return 'all' if status_type is None else 'accepted'
+
+    @staticmethod
+    def _key(user_id, month, scope):
+        return f"calendar:{user_id}:{month}:{scope}"
+
+    def get_months(self, user_id, months, scope):
+        """
+        요청한 달들의 캐시를 조회하여 {month: events}로 반환 (캐시에 없는 달은 포함되지 않음)
+        """
+        try:
+            values = redis_client.mget([self._key(user_id, month, scope) for month in months])
+        except redis.RedisError as e:
+            logger.warning(f"calendar cache get failed: {e}")
+            return {}
+        return {month: json.loads(value) for month, value in zip(months, values) if value is not None}
+
+    def set_months(self, user_id, buckets, scope):
+        """
+        {month: events} 를 달별 키로 저장
+        """
+        if not buckets:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for month, events in buckets.items():
+                pipe.set(self._key(user_id, month, scope), json.dumps(events), ex=CALENDAR_CACHE_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"calendar cache set failed: {e}")
+
+    def invalidate(self, user_ids, months):
+        """
+        해당 유저들의 해당 달 캐시를 모든 scope에 대해 삭제
+        """
+        keys = [self._key(user_id, month, scope)
+                for user_id in set(user_ids) for month in set(months) for scope in CALENDAR_SCOPES]
+        if not keys:
+            return
+        try:
+            redis_client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"calendar cache invalidate failed: {e}")
+
+
+EVENT_NOTIFICATION_SCHEDULE_KEY = 'event_notifications:schedule'
+
+
+class EventNotificationScheduler:
+    """
+    이벤트 예약 알림 스케줄러
+    Redis sorted set 하나에 "{event_id}:{kind}" 멤버를 발송 시각(timestamp)을 score로 저장한다.
+    - 예약/재예약: ZADD (이미 있으면 score만 갱신, O(log n))
+    - 발송: beat 주기 작업이 발송 시각이 지난 멤버를 배치 단위로 꺼낸다.
+      꺼낸 뒤 발송 작업 등록에 실패한 멤버는 requeue로 다시 넣는다.
+    countdown 작업과 달리 브로커/워커 메모리에 쌓이지 않고, 재예약 시 revoke가 필요 없다.
+    """
+
+    @staticmethod
+    def _member(event_id, kind):
+        return f"{event_id}:{kind}"
+
+    def schedule(self, event_id, fire_times, now):
+        """
+        {kind: 발송 시각(datetime)} 을 예약한다. 발송 시각이 이미 지난 알림은 예약에서 제거한다.
+        """
+        due = {self._member(event_id, kind): fire_at.timestamp()
+               for kind, fire_at in fire_times.items() if fire_at > now}
+        expired = [self._member(event_id, kind) for kind, fire_at in fire_times.items() if fire_at <= now]
+
+        pipe = redis_client.pipeline(transaction=False)
+        if due:
+            pipe.zadd(EVENT_NOTIFICATION_SCHEDULE_KEY, due)
+        if expired:
+            pipe.zrem(EVENT_NOTIFICATION_SCHEDULE_KEY, *expired)
+        pipe.execute()
+
+    def unschedule(self, event_id, kinds):
+        """
+        이벤트의 예약 알림을 취소한다.
+        """
+        members = [self._member(event_id, kind) for kind in kinds]
+        if members:
+            redis_client.zrem(EVENT_NOTIFICATION_SCHEDULE_KEY, *members)
+
+    def pop_due(self, now, batch_size):
+        """
+        발송 시각(now, timestamp)이 지난 알림을 최대 batch_size개 꺼내 [(event_id, kind), ...]로 반환한다.
+        ZREM에 성공한 멤버만 반환하므로 여러 워커가 동시에 실행해도 한 알림은 한 번만 발송된다.
+        """
+        members = redis_client.zrangebyscore(EVENT_NOTIFICATION_SCHEDULE_KEY, '-inf', now, start=0, num=batch_size)
+        if not members:
+            return []
+
+        pipe = redis_client.pipeline(transaction=False)
+        for member in members:
+            pipe.zrem(EVENT_NOTIFICATION_SCHEDULE_KEY, member)
+        removed = pipe.execute()
+
+        due = []
+        for member, claimed in zip(members, removed):
+            if not claimed:
+                continue
+            event_id, kind = member.split(':', 1)
+            due.append((int(event_id), kind))
+        return due
+
+    def requeue(self, notifications, fire_at):
+        """
+        꺼냈지만 발송 작업으로 넘기지 못한 알림 [(event_id, kind), ...]을 다시 예약한다.
+        그 사이 새로 예약된 알림(재예약)은 덮어쓰지 않는다. (NX)
+        """
+        if notifications:
+            redis_client.zadd(EVENT_NOTIFICATION_SCHEDULE_KEY,
+                              {self._member(event_id, kind): fire_at for event_id, kind in notifications}, nx=True)
@@ -57,13 +57,8 @@ class EventCreateUpdateSerializer(serializers.ModelSerializer):
             # id로 받은 값들을 객체로 반환함.
             event = Event.objects.create(**validated_data)
 
-            # 이벤트 ID를 이용해 각 참가자의 이벤트 필드를 설정
-            for participant in participant_data:
-                participant['event_id'] = event.pk
-                participant['member_id'] = participant['club_member'].pk  # 객체에서 다시 pk로 변경
-                participant_serializer = ParticipantCreateUpdateSerializer(data=participant)
-                if participant_serializer.is_valid(raise_exception=True):
-                    participant_serializer.save()
+            # 검증된 참가자 명단을 한 번에 생성
+            self.fields['participants'].create([{**participant, 'event': event} for participant in participant_data])
             return event
 
     def update(self, instance, validated_data):
@@ -73,57 +68,19 @@ class EventCreateUpdateSerializer(serializers.ModelSerializer):
             for attr, value in validated_data.items():
                 setattr(instance, attr, value)
             instance.save()
-            # print(f"[DEBUG] Event 업데이트 완료: id={instance.id}")
-
-            # Step 1: 기존 참가자 조회 (club_member.id 기준)
-            existing_participants = {p.club_member.id: p for p in instance.participant_set.all()}
-            # print(f"[DEBUG] 기존 참가자 수: {len(existing_participants)}")
-
-            # Step 2: 새로 전달된 참가자 데이터 처리
-            for participant in participant_data:
-                # 반드시 serializer가 요구하는 필드들을 설정합니다.
-                participant['event_id'] = instance.id
-                participant['member_id'] = participant['club_member'].pk
-                member_id = participant['club_member'].pk
-                # print(f"[DEBUG] 처리 중인 참가자 - club_member id: {member_id}")
-
-                if member_id in existing_participants:
-                    # 이미 존재하는 참가자 업데이트 (status_type 유지)
-                    existing_instance = existing_participants.pop(member_id)
-                    # print(f"[DEBUG] 기존 참가자 발견: club_member id={member_id}, 현재 status_type={existing_instance.status_type}")
-
-                    # 클라이언트에서 status_type을 명시하지 않은 경우 기존 값을 유지
-                    if 'status_type' not in participant:
-                        participant['status_type'] = existing_instance.status_type
-                        print(f"[DEBUG] status_type 미전달 -> 기존 값 유지: {existing_instance.status_type}")
-                    else:
-                        print(f"[DEBUG] 클라이언트에서 전달한 status_type: {participant['status_type']}")
-                    participant_serializer = ParticipantCreateUpdateSerializer(
-                        instance=existing_instance, data=participant, partial=True
-                    )
-                    participant_serializer.is_valid(raise_exception=True)
-                    participant_serializer.save()
-                    # print(f"[DEBUG] 참가자 업데이트 완료: club_member id {member_id}")
-                else:
-                    # 신규 참가자 생성; 이 경우 status_type이 없으면 기본값(PENDING)이 적용됨
-                    # print(f"[DEBUG] 신규 참가자 생성: club_member id {member_id}")
-                    participant_serializer = ParticipantCreateUpdateSerializer(data=participant)
-                    participant_serializer.is_valid(raise_exception=True)
-                    participant_serializer.save()
-                    # print(f"[DEBUG] 신규 참가자 생성 완료: club_member id {member_id}")
-
-            # Step 3 (선택사항): 새 데이터에 포함되지 않은 기존 참가자 삭제
-            for remaining in existing_participants.values():
-                # print(f"[DEBUG] 남은 기존 참가자 삭제: club_member id {remaining.club_member.id}")
-                remaining.delete()
-
-            # print("[DEBUG] 이벤트 업데이트 전체 완료")
+
+            # 기존 참가자와 새 명단을 club_member 기준으로 비교하여 일괄 생성/수정/삭제 (status_type 유지)
+            participants_field = self.fields['participants']
+            participants_field.update(
+                instance.participant_set.all(),
+                [{**participant, 'event': instance} for participant in participant_data]
+            )
+            self.removed_participants = participants_field.removed
             return instance
 
 
-# TODO: 이벤트 상세 조회와 이벤트 전체 조회 시리얼라이저 분리.
-#  이벤트 상세 조회에서 너무 많은 정보가 담겨 over fetching 되고 있음.
-#  이를 해결하고자 이벤트 전체 조회용 시리얼라이저 미리 생성. 단, 프론트엔드에서 준비가 되어야 하므로, 준비된 후에 연결할 예정
+# 이벤트 목록(mode=summary)/캘린더 조회용 요약 시리얼라이저. 참가자 목록은 포함하지 않는다.
+# EventUtils.get_event_summaries_queryset에서 annotate한 my_participant_id를 사용
 class EventListSerializer(serializers.ModelSerializer):
     club = ClubProfileSerializer(read_only=True)
     my_participant_id = serializers.SerializerMethodField(read_only=True)
@@ -142,8 +99,10 @@ class EventListSerializer(serializers.ModelSerializer):
                   'user_id', 'date', 'status_type']
 
     def get_my_participant_id(self, obj):
-        self.my_participant_id = obj.participant_set.filter(club_member__user=self.context['request'].user).first().id
-        return self.my_participant_id
+        if hasattr(obj, 'my_participant_id'):  # 쿼리셋에서 annotate된 경우 추가 쿼리 없음
+            return obj.my_participant_id
+        participant = obj.participant_set.filter(club_member__user=self.context['request'].user).first()
+        return participant.id if participant else None
 
 class EventDetailSerializer(serializers.ModelSerializer):
     club = ClubProfileSerializer(read_only=True)
@@ -171,26 +130,42 @@ class EventDetailSerializer(serializers.ModelSerializer):
                   'start_date_time', 'end_date_time', 'repeat_type', 'game_mode', 'alert_date_time', 'member_group',
                   'user_id', 'date', 'status_type']
 
+    # 참가 현황 필드는 EventUtils.annotate_participation으로 annotate된 값을 우선 사용한다.
     def get_my_participant_id(self, obj):
-        self.my_participant_id = obj.participant_set.filter(club_member__user=self.context['request'].user).first().id
+        if hasattr(obj, 'my_participant_id'):
+            self.my_participant_id = obj.my_participant_id
+        else:
+            self.my_participant_id = obj.participant_set.filter(club_member__user=self.context['request'].user).first().id
         return self.my_participant_id
 
     def get_participants_count(self, obj):
+        if hasattr(obj, 'participants_count'):
+            return obj.participants_count
         return obj.participant_set.count()
 
     def get_party_count(self, obj):
+        if hasattr(obj, 'party_count'):
+            return obj.party_count
         return obj.participant_set.filter(status_type="PARTY").count()
 
     def get_accept_count(self, obj):
+        if hasattr(obj, 'accept_count'):
+            return obj.accept_count
         return obj.participant_set.filter(Q(status_type="ACCEPT") | Q(status_type="PARTY")).count()
 
     def get_deny_count(self, obj):
+        if hasattr(obj, 'deny_count'):
+            return obj.deny_count
         return obj.participant_set.filter(status_type="DENY").count()
 
     def get_pending_count(self, obj):
+        if hasattr(obj, 'pending_count'):
+            return obj.pending_count
         return obj.participant_set.filter(status_type="PENDING").count()
 
     def get_member_group(self, obj):
+        if hasattr(obj, 'my_group_type'):
+            return obj.my_group_type
         return obj.participant_set.filter(id=self.my_participant_id).first().group_type
 
 
@@ -207,43 +182,59 @@ class UserResultSerializer(serializers.ModelSerializer):
         fields = ['user_id', 'profile_image', 'name', 'sum_score', 'handicap_score', 'rank', 'handicap_rank',
                   'scorecard']
 
+    def _get_participant(self, obj):
+        '''
+        이벤트에서 사용자의 참가자 객체를 반환
+        뷰에서 context로 participants_by_user({user_id: participant})를 넘기면 추가 쿼리 없이 사용하고,
+        없으면 한 번만 조회하여 재사용한다.
+        '''
+        participants_by_user = self.context.get('participants_by_user')
+        if participants_by_user is not None:
+            return participants_by_user.get(obj.id)
+
+        if not hasattr(self, '_participant_cache'):
+            self._participant_cache = {}
+        if obj.id not in self._participant_cache:
+            event_id = self.context.get('event_id')
+            self._participant_cache[obj.id] = (Participant.objects
+                                               .filter(event_id=event_id, club_member__user=obj)
+                                               .prefetch_related('holescore_set')
+                                               .first())
+        return self._participant_cache[obj.id]
+
     def get_sum_score(self, obj):
         # 현재 이벤트 및 사용자 정보를 바탕으로 참가자를 조회
-        event_id = self.context.get('event_id')
-        participant = Participant.objects.filter(event_id=event_id, club_member__user=obj).first()
+        participant = self._get_participant(obj)
 
         if participant:
             return participant.sum_score
         return 0  # 참가자가 없을 경우 기본값 반환
 
     def get_handicap_score(self, obj):
-        event_id = self.context.get('event_id')
-        participants = Participant.objects.filter(event_id=event_id, club_member__user=obj).first()
-        if participants:
-            return participants.handicap_score
+        participant = self._get_participant(obj)
+        if participant:
+            return participant.handicap_score
         return 0  # 참가자가 없을 경우 기본값 반환
 
     def get_rank(self, obj):
         # 특정 이벤트에서 사용자의 일반 순위를 반환
-        event_id = self.context.get('event_id')
-        participant = Participant.objects.filter(event_id=event_id, club_member__user=obj).first()
+        participant = self._get_participant(obj)
 
         return participant.rank if participant else None
 
     def get_handicap_rank(self, obj):
         # 특정 이벤트에서 사용자의 핸디캡 순위를 반환
-        event_id = self.context.get('event_id')
-        participant = Participant.objects.filter(event_id=event_id, club_member__user=obj).first()
+        participant = self._get_participant(obj)
 
         return participant.handicap_rank if participant else None
 
     def get_scorecard(self, obj):
-        event_id = self.context.get('event_id')
-        participant = Participant.objects.filter(event_id=event_id, club_member__user=obj).first()
+        participant = self._get_participant(obj)
 
         if participant:
-            scorecard = participant.get_scorecard()
-            return scorecard if scorecard else []
+            # prefetch된 홀 점수로 1~18홀 스코어카드를 구성 (누락된 홀은 None)
+            hole_score_map = {hole.hole_number: hole.score for hole in participant.holescore_set.all()}
+            return [hole_score_map.get(hole) for hole in range(1, 19)]
 
 
 class EventResultSerializer(serializers.ModelSerializer):
@@ -274,7 +265,10 @@ class EventResultSerializer(serializers.ModelSerializer):
 
     def get_user(self, obj):
         user = self.context['request'].user
-        return UserResultSerializer(user, context={'event_id': obj.id}).data
+        return UserResultSerializer(user, context={
+            'event_id': obj.id,
+            'participants_by_user': self.context.get('participants_by_user'),
+        }).data
 
 
 class ScoreCardSerializer(serializers.ModelSerializer):
@@ -302,17 +296,24 @@ class ScoreCardSerializer(serializers.ModelSerializer):
             return "Team B"
         return "No Team"
 
+    # 점수 필드는 EventUtils.get_scorecard_participants로 annotate/prefetch된 값이 있으면 추가 쿼리 없이 사용한다.
     def get_front_nine_score(self, participant):
+        if hasattr(participant, 'front_nine_score'):
+            return participant.front_nine_score
         front_nine_score = \
         HoleScore.objects.filter(participant=participant, hole_number__lte=9).aggregate(total=Sum('score'))['total']
         return front_nine_score or 0
 
     def get_back_nine_score(self, participant):
+        if hasattr(participant, 'back_nine_score'):
+            return participant.back_nine_score
         back_nine_score = \
         HoleScore.objects.filter(participant=participant, hole_number__gte=10).aggregate(total=Sum('score'))['total']
         return back_nine_score or 0
 
     def get_total_score(self, participant):
+        if hasattr(participant, 'total_score'):
+            return participant.total_score
         total_score = HoleScore.objects.filter(participant=participant).aggregate(total=Sum('score'))['total']
         return total_score or 0
 
@@ -322,4 +323,8 @@ class ScoreCardSerializer(serializers.ModelSerializer):
         return handicap_score
 
     def get_scorecard(self, participant):
+        hole_scores = getattr(participant, '_prefetched_objects_cache', {}).get('holescore_set')
+        if hole_scores is not None:
+            hole_score_map = {hole.hole_number: hole.score for hole in hole_scores}
+            return [hole_score_map.get(hole) for hole in range(1, 19)]
         return participant.get_scorecard() or []
@@ -6,25 +6,36 @@ MVP demo ver 0.0.1
 Cerly 작업 큐
 '''
 
-from celery import shared_task, current_app
+from celery import shared_task
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.cache import cache
+from django.utils import timezone
 
-from datetime import timezone, timedelta, datetime
-import uuid
+from datetime import timedelta, datetime
 
 from events.models import Event
+from events.redis_interface import EventNotificationScheduler
 from utils.push_fcm_notification import get_fcm_tokens_for_club_members, send_fcm_notifications
 from notifications.redis_interface import NotificationRedisInterface
 
-from asgiref.sync import async_to_sync
-
 import logging
 
 logger = logging.getLogger(__name__)
 
 # Redis 인터페이스 생성
 redis_interface = NotificationRedisInterface()
+notification_scheduler = EventNotificationScheduler()
+
+# 예약 알림 종류별 발송 시각 (기준 필드, 기준 시각으로부터 앞당길 시간)
+EVENT_NOTIFICATION_OFFSETS = {
+    'two_days_before': ('start_date_time', timedelta(days=2)),
+    'one_hour_before': ('start_date_time', timedelta(hours=1)),
+    'event_ended': ('end_date_time', timedelta(0)),
+}
+TEST_NOTIFICATION_OFFSETS = {
+    'ten_seconds_before': ('start_date_time', timedelta(seconds=10)),
+}
+NOTIFICATION_DISPATCH_BATCH_SIZE = 100   # beat 한 번에 꺼내는 알림 수
+NOTIFICATION_DISPATCH_MAX_BATCHES = 10   # beat 한 번에 처리하는 최대 배치 수 (나머지는 다음 주기에 처리)
 
 @shared_task
 def send_event_creation_notification(event_id):
@@ -36,8 +47,8 @@ def send_event_creation_notification(event_id):
         club = event.club
         fcm_tokens = get_fcm_tokens_for_club_members(club)
 
-        # 토큰 리스트 확인을 위한 로그 출력
-        logger.info(f"Retrieved FCM tokens for event creation: {fcm_tokens}")
+        # 토큰 개수 확인을 위한 로그 출력 (토큰 값은 남기지 않음)
+        logger.info(f"Retrieved {len(fcm_tokens)} FCM tokens for event creation")
 
         message_title = f"[{club.name}] 모임에서 이벤트가 생성되었습니다."
         message_body = f"이벤트: {event.event_title}\n날짜: {event.start_date_time.strftime('%Y-%m-%d')}\n장소: {event.site}\n참석 여부를 체크해주세요."
@@ -56,19 +67,10 @@ def send_event_creation_notification(event_id):
             send_fcm_notifications(fcm_tokens, message_title, message_body, event_id=event.id)
             logger.info(f"이벤트 생성 알림 전송 성공: {event.event_title}")
 
-            # 알림 전송 성공 후 Redis에 저장
+            # 알림 전송 성공 후 Redis에 저장 (본문은 한 번만 저장하고 멤버별 인덱스만 추가)
             user_ids = club.members.values_list('id', flat=True)  # 모든 멤버 ID 가져오기
-            print(f"user_ids: {user_ids}")
-            for user_id in user_ids:
-                print(f"user_id: {user_id}")
-                # UUID 기반으로 notification_id 생성
-                notification_id = str(uuid.uuid4())
-                base_notification_data['notification_id'] = notification_id
-
-                notification_data = {**base_notification_data, "status": "success"}
-                print(f"notification준비 완료 {notification_id}, {notification_data}")
-
-                async_to_sync(redis_interface.save_notification)(user_id, notification_id, notification_data, event_id=event.id)
+            redis_interface.save_bulk_notification(user_ids, {**base_notification_data, "status": "success"},
+                                                   event_id=event.id)
         else:
             logger.info(f"No FCM tokens found for club members in club: {club}")
 
@@ -89,7 +91,7 @@ def send_event_update_notification(event_id):
         fcm_tokens = get_fcm_tokens_for_club_members(club)
 
 
-        logger.info(f"Retrieved FCM tokens for event creation: {fcm_tokens}")
+        logger.info(f"Retrieved {len(fcm_tokens)} FCM tokens for event creation")
 
 
         message_title = f"[{club.name}] 모임에서 이벤트가 수정되었습니다."
@@ -108,19 +110,10 @@ def send_event_update_notification(event_id):
             send_fcm_notifications(fcm_tokens, message_title, message_body, event_id=event.id)
             logger.info(f"이벤트 수정 알림 전송 성공: {event.event_title}")
 
-            # 알림 전송 성공 후 Redis에 저장
+            # 알림 전송 성공 후 Redis에 저장 (본문은 한 번만 저장하고 멤버별 인덱스만 추가)
             user_ids = club.members.values_list('id', flat=True)  # 모든 멤버 ID 가져오기
-            print(f"user_ids: {user_ids}")
-            for user_id in user_ids:
-                print(f"user_id: {user_id}")
-                # UUID 기반으로 notification_id 생성
-                notification_id = str(uuid.uuid4())
-                base_notification_data['notification_id'] = notification_id
-
-                notification_data = {**base_notification_data, "status": "success"}
-                print(f"notification준비 완료 {notification_id}, {notification_data}")
-
-                async_to_sync(redis_interface.save_notification)(user_id, notification_id, notification_data, event_id=event.id)
+            redis_interface.save_bulk_notification(user_ids, {**base_notification_data, "status": "success"},
+                                                   event_id=event.id)
 
         else:
             logger.info(f"No FCM tokens found for club members in club: {club}")
@@ -130,6 +123,41 @@ def send_event_update_notification(event_id):
     except Exception as e:
         logger.error(f"Error sending FCM notifications for event {event_id}: {e}")
 
+def _get_fire_times(event, offsets):
+    """
+    알림 종류별 발송 시각을 계산 ({kind: datetime})
+    """
+    return {kind: getattr(event, field) - offset for kind, (field, offset) in offsets.items()}
+
+
+def _notify_event_club_members(event, message_title, message_body, log_label):
+    """
+    이벤트 모임 멤버들에게 FCM 알림을 보내고, 전송 성공 시 멤버별 알림을 Redis에 저장
+    """
+    club = event.club
+    fcm_tokens = get_fcm_tokens_for_club_members(club)
+
+    # Redis 저장용 알림 데이터 (status는 기본적으로 fail로 설정)
+    base_notification_data = {
+        "title": message_title,
+        "body": message_body,
+        "status": "fail",
+        "timestamp": datetime.now().isoformat(),
+        "read": False,
+    }
+
+    if fcm_tokens:
+        send_fcm_notifications(fcm_tokens, message_title, message_body, event_id=event.id)
+        logger.info(f"{log_label} 전송 성공: {event.event_title}")
+
+        # 알림 전송 성공 후 Redis에 저장 (본문은 한 번만 저장하고 멤버별 인덱스만 추가)
+        user_ids = club.members.values_list('id', flat=True)  # 모든 멤버 ID 가져오기
+        redis_interface.save_bulk_notification(user_ids, {**base_notification_data, "status": "success"},
+                                               event_id=event.id)
+    else:
+        logger.info(f"No FCM tokens found for club members in club: {club}")
+
+
 @shared_task
 def schedule_event_notifications_test(event_id):
     """
@@ -137,18 +165,7 @@ def schedule_event_notifications_test(event_id):
     """
     try:
         event = Event.objects.get(id=event_id)
-        now = timezone.now()
-
-        # 10초 전 알림 예약
-        ten_seconds_before = event.start_date_time - timedelta(seconds=10)
-        if ten_seconds_before > now:
-            countdown_until_10_seconds = (ten_seconds_before - now).total_seconds()
-            ten_seconds_task = send_event_notification_10_seconds_before.apply_async(
-                (event_id,), countdown=countdown_until_10_seconds
-            )
-
-        # task_id를 캐시에 저장
-        cache.set(f'event_{event_id}_test_task_id', ten_seconds_task.id, timeout=None)
+        notification_scheduler.schedule(event_id, _get_fire_times(event, TEST_NOTIFICATION_OFFSETS), timezone.now())
 
     except Event.DoesNotExist:
         logger.error(f"Event {event_id} does not exist")
@@ -162,32 +179,10 @@ def send_event_notification_10_seconds_before(event_id):
     이벤트 시작 10초 전에 알림을 보내는 작업
     """
     try:
-        event = Event.objects.get(id=event_id)
-        club = event.club
-        fcm_tokens = get_fcm_tokens_for_club_members(club)
-
-        message_title = f"[{club.name}] 이벤트가 곧 시작됩니다!"
+        event = Event.objects.select_related('club').get(id=event_id)
+        message_title = f"[{event.club.name}] 이벤트가 곧 시작됩니다!"
         message_body = f"이벤트: {event.event_title}\n10초 후에 시작됩니다. 참석 여부를 확인해주세요."
-
-        # Redis 저장용 알림 데이터
-        notification_data = {
-            "title": message_title,
-            "body": message_body,
-            "status": "success",
-            "timestamp": datetime.now().isoformat(),
-            "read": False,
-        }
-
-        if fcm_tokens:
-            send_fcm_notifications(fcm_tokens, message_title, message_body, event_id=event.id)
-            logger.info(f"10초 전 알림 전송 성공: {event.event_title}")
-
-            # Redis 저장
-            user_ids = club.members.values_list('id', flat=True)
-            for user_id in user_ids:
-                notification_id = str(uuid.uuid4())
-                notification_data["notification_id"] = notification_id
-                async_to_sync(redis_interface.save_notification)(user_id, notification_id, notification_data, event_id=event.id)
+        _notify_event_club_members(event, message_title, message_body, "10초 전 알림")
 
     except Event.DoesNotExist:
         logger.error(f"Event {event_id} does not exist")
@@ -198,34 +193,11 @@ def send_event_notification_10_seconds_before(event_id):
 def schedule_event_notifications(event_id):
     """
     이벤트 생성/수정 시 이틀 전, 1시간 전, 종료 후 알림 예약하는 작업
+    예약은 Redis sorted set에 저장되며, 수정 시에는 발송 시각만 갱신된다. (revoke 불필요)
     """
     try:
         event = Event.objects.get(id=event_id)
-        now = timezone.now()
-
-        # 이틀 전 알림 예약
-        two_days_before = event.start_date_time - timedelta(days=2)
-        if two_days_before > now:
-            countdown_until_2_days = (two_days_before - now).total_seconds()
-            two_days_task = send_event_notification_2_days_before.apply_async((event_id,), countdown=countdown_until_2_days)
-
-        # 1시간 전 알림 예약
-        one_hour_before = event.start_date_time - timedelta(hours=1)
-        if one_hour_before > now:
-            countdown_until_1_hour = (one_hour_before - now).total_seconds()
-            one_hour_task = send_event_notification_1_hour_before.apply_async((event_id,), countdown=countdown_until_1_hour)
-
-        # 종료 후 알림 예약
-        if event.end_date_time > now:
-            countdown_until_end = (event.end_date_time - now).total_seconds()
-            end_task = send_event_notification_event_ended.apply_async((event_id,), countdown=countdown_until_end)
-
-        # task_ids를 캐시에 저장
-        cache.set(f'event_{event_id}_task_ids', {
-            'two_days_task_id': two_days_task.id,
-            'one_hour_task_id': one_hour_task.id,
-            'end_task_id': end_task.id
-        }, timeout=None)
+        notification_scheduler.schedule(event_id, _get_fire_times(event, EVENT_NOTIFICATION_OFFSETS), timezone.now())
 
     except Event.DoesNotExist:
         logger.error(f"Event {event_id} does not exist")
@@ -233,158 +205,93 @@ def schedule_event_notifications(event_id):
         logger.error(f"Error scheduling event notifications for event {event_id}: {e}")
 
 @shared_task
-def send_event_notification_2_days_before():
+def send_event_notification_2_days_before(event_id):
     """
     이벤트 시작 이틀 전에 알림을 보내는 작업
     """
-    now = timezone.now()
-    # events = Event.objects.filter(start_date_time__date=now + timedelta(days=2))
-    events = Event.objects.filter(start_date_time__date=now + timedelta(seconds=5))
-
-    for event in events:
-        club = event.club
-        fcm_tokens = get_fcm_tokens_for_club_members(club)
-        message_title = f"[{club.name}] 모임에서 진행하는 {event.event_title} 이벤트가 시작되기 이틀 전입니다."
+    try:
+        event = Event.objects.select_related('club').get(id=event_id)
+        message_title = f"[{event.club.name}] 모임에서 진행하는 {event.event_title} 이벤트가 시작되기 이틀 전입니다."
         message_body = f"이벤트 상세 정보와 참석 여부를 확인해주세요."
-        # Redis 저장용 알림 데이터 (status는 기본적으로 fail로 설정)
-        base_notification_data = {
-            "title": message_title,
-            "body": message_body,
-            "status": "fail",
-            "timestamp": datetime.now().isoformat(),
-            "read": False,
-        }
-        if fcm_tokens:
-            send_fcm_notifications(fcm_tokens, message_title, message_body, event_id=event.id)
-            logger.info(f"이틀 전 알림 전송 성공: {event.event_title}")
-
-            # 알림 전송 성공 후 Redis에 저장
-            user_ids = club.members.values_list('id', flat=True)  # 모든 멤버 ID 가져오기
-            print(f"user_ids: {user_ids}")
-            for user_id in user_ids:
-                print(f"user_id: {user_id}")
-                # UUID 기반으로 notification_id 생성
-                notification_id = str(uuid.uuid4())
-                base_notification_data['notification_id'] = notification_id
-
-                notification_data = {**base_notification_data, "status": "success"}
-                print(f"notification준비 완료 {notification_id}, {notification_data}")
+        _notify_event_club_members(event, message_title, message_body, "이틀 전 알림")
 
-                async_to_sync(redis_interface.save_notification)(user_id, notification_id, notification_data, event_id=event.id)
-
-        else:
-            logger.info(f"No FCM tokens found for club members in club: {club}")
+    except Event.DoesNotExist:
+        logger.error(f"Event {event_id} does not exist")
+    except Exception as e:
+        logger.error(f"Error sending 2 days notification for event {event_id}: {e}")
 
 
 @shared_task
-def send_event_notification_1_hour_before():
+def send_event_notification_1_hour_before(event_id):
     """
     이벤트 시작 1시간 전에 알림을 보내는 작업
     """
-    now = timezone.now()
-    # events = Event.objects.filter(start_date_time__lte=now + timedelta(hours=1), start_date_time__gt=now)
-    events = Event.objects.filter(start_date_time__lte=now + timedelta(seconds=2), start_date_time__gt=now)
-
-    for event in events:
-        club = event.club
-        fcm_tokens = get_fcm_tokens_for_club_members(club)
-        message_title = f"[{club.name}] 모임에서 진행하는 {event.event_title} 이벤트가 시작되기 1시간 전입니다."
+    try:
+        event = Event.objects.select_related('club').get(id=event_id)
+        message_title = f"[{event.club.name}] 모임에서 진행하는 {event.event_title} 이벤트가 시작되기 1시간 전입니다."
         message_body = f"이벤트 상세 정보와 참석 여부를 확인해주세요."
+        _notify_event_club_members(event, message_title, message_body, "1시간 전 알림")
 
-        # Redis 저장용 알림 데이터 (status는 기본적으로 fail로 설정)
-        base_notification_data = {
-            "title": message_title,
-            "body": message_body,
-            "status": "fail",
-            "timestamp": datetime.now().isoformat(),
-            "read": False,
-        }
-
-        if fcm_tokens:
-            send_fcm_notifications(fcm_tokens, message_title, message_body, event_id=event.id)
-            logger.info(f"1시간 전 알림 전송 성공: {event.event_title}")
-
-            # 알림 전송 성공 후 Redis에 저장
-            user_ids = club.members.values_list('id', flat=True)  # 모든 멤버 ID 가져오기
-            print(f"user_ids: {user_ids}")
-            for user_id in user_ids:
-                print(f"user_id: {user_id}")
-                # UUID 기반으로 notification_id 생성
-                notification_id = str(uuid.uuid4())
-                base_notification_data['notification_id'] = notification_id
-
-                notification_data = {**base_notification_data, "status": "success"}
-                print(f"notification준비 완료 {notification_id}, {notification_data}")
-
-                async_to_sync(redis_interface.save_notification)(user_id, notification_id, notification_data, event_id=event.id)
-
-        else:
-            logger.info(f"No FCM tokens found for club members in club: {club}")
+    except Event.DoesNotExist:
+        logger.error(f"Event {event_id} does not exist")
+    except Exception as e:
+        logger.error(f"Error sending 1 hour notification for event {event_id}: {e}")
 
 
 @shared_task
-def send_event_notification_event_ended():
+def send_event_notification_event_ended(event_id):
     """
     이벤트 종료 후 알림을 보내는 작업
     """
-    now = timezone.now()
-    events = Event.objects.filter(end_date_time__lte=now, end_date_time__gt=now - timedelta(hours=1))
-
-    for event in events:
-        club = event.club
-        fcm_tokens = get_fcm_tokens_for_club_members(club)
-        message_title = f"[{club.name}] 모임에서 진행하는 {event.event_title} 이벤트가 종료되었습니다."
+    try:
+        event = Event.objects.select_related('club').get(id=event_id)
+        message_title = f"[{event.club.name}] 모임에서 진행하는 {event.event_title} 이벤트가 종료되었습니다."
         message_body = f"이벤트 결과를 확인해주세요. (스코어 점수 수정은 이벤트 종료 2일 후까지만 가능합니다)"
+        _notify_event_club_members(event, message_title, message_body, "이벤트 종료 알림")
 
-        # Redis 저장용 알림 데이터 (status는 기본적으로 fail로 설정)
-        base_notification_data = {
-            "title": message_title,
-            "body": message_body,
-            "status": "fail",
-            "timestamp": datetime.now().isoformat(),
-            "read": False,
-        }
+    except Event.DoesNotExist:
+        logger.error(f"Event {event_id} does not exist")
+    except Exception as e:
+        logger.error(f"Error sending event ended notification for event {event_id}: {e}")
 
-        if fcm_tokens:
-            send_fcm_notifications(fcm_tokens, message_title, message_body, event_id=event.id)
-            logger.info(f"이벤트 종료 알림 전송 성공: {event.event_title}")
 
-            # 알림 전송 성공 후 Redis에 저장
-            user_ids = club.members.values_list('id', flat=True)  # 모든 멤버 ID 가져오기
-            print(f"user_ids: {user_ids}")
-            for user_id in user_ids:
-                print(f"user_id: {user_id}")
-                # UUID 기반으로 notification_id 생성
-                notification_id = str(uuid.uuid4())
-                base_notification_data['notification_id'] = notification_id
+# 예약 알림 종류별 발송 작업
+EVENT_NOTIFICATION_TASKS = {
+    'two_days_before': send_event_notification_2_days_before,
+    'one_hour_before': send_event_notification_1_hour_before,
+    'event_ended': send_event_notification_event_ended,
+    'ten_seconds_before': send_event_notification_10_seconds_before,
+}
 
-                notification_data = {**base_notification_data, "status": "success"}
-                print(f"notification준비 완료 {notification_id}, {notification_data}")
 
-                async_to_sync(redis_interface.save_notification)(user_id, notification_id, notification_data, event_id=event.id)
-        else:
-            logger.info(f"No FCM tokens found for club members in club: {club}")
+@shared_task
+def dispatch_due_event_notifications():
+    """
+    beat 주기 작업: 발송 시각이 지난 예약 알림을 배치 단위로 꺼내 발송 작업으로 넘긴다.
+    발송 작업을 큐에 넣지 못하면(브로커 장애 등) 남은 알림을 다시 예약하고 다음 주기에 재시도한다.
+    """
+    now = timezone.now().timestamp()
+    for _ in range(NOTIFICATION_DISPATCH_MAX_BATCHES):
+        due = notification_scheduler.pop_due(now, NOTIFICATION_DISPATCH_BATCH_SIZE)
+        for index, (event_id, kind) in enumerate(due):
+            task = EVENT_NOTIFICATION_TASKS.get(kind)
+            if task is None:
+                logger.warning(f"Unknown event notification kind: {kind} (event {event_id})")
+                continue
+            try:
+                task.delay(event_id)
+            except Exception as e:
+                logger.error(f"Error enqueueing event notification {kind} for event {event_id}: {e}")
+                notification_scheduler.requeue(due[index:], now)
+                return
+        if len(due) < NOTIFICATION_DISPATCH_BATCH_SIZE:
+            break
 
 def revoke_event_notifications(event_id):
     """
-    기존 예약된 이벤트 알림 작업을 취소하는 함수
+    기존 예약된 이벤트 알림을 취소하는 함수
     """
-    task_ids = cache.get(f'event_{event_id}_task_ids')
-
-    if not task_ids:
-        logger.info(f"No task IDs found for event {event_id}")
-        return
-
     try:
-        if task_ids.get('two_days_task_id'):
-            current_app.control.revoke(task_ids['two_days_task_id'], terminate=True)
-        if task_ids.get('one_hour_task_id'):
-            current_app.control.revoke(task_ids['one_hour_task_id'], terminate=True)
-        if task_ids.get('end_task_id'):
-            current_app.control.revoke(task_ids['end_task_id'], terminate=True)
-
-        # 작업 취소 후 캐시에서 제거
-        cache.delete(f'event_{event_id}_task_ids')
-
+        notification_scheduler.unschedule(event_id, [*EVENT_NOTIFICATION_OFFSETS, *TEST_NOTIFICATION_OFFSETS])
     except Exception as e:
-        logger.error(f"Error revoking event notification tasks for event {event_id}: {e}")
\ No newline at end of file
+        logger.error(f"Error revoking event notifications for event {event_id}: {e}")
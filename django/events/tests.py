@@ -1,3 +1,93 @@
-from django.test import TestCase
+import random
+from unittest.mock import patch
 
-# Create your tests here.
+import fakeredis
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clubs.models import Club, ClubMember
+from events import redis_interface
+from events.matching import balance_groups, split_sizes, sum_variance
+from events.models import Event
+from participants.models import Participant
+
+User = get_user_model()
+
+
+class BalanceGroupsTest(SimpleTestCase):
+    def test_balanced_groups_keep_sizes_and_reduce_variance(self):
+        rng = random.Random(0)
+        handicaps = [rng.randint(0, 54) for _ in range(30)]
+        sizes = split_sizes(len(handicaps), 8)
+
+        groups = balance_groups(handicaps, sizes)
+
+        # 모든 멤버가 한 번씩, 조별 인원대로 배정된다
+        self.assertEqual(sorted(index for group in groups for index in group), list(range(len(handicaps))))
+        self.assertEqual([len(group) for group in groups], sizes)
+
+        # 핸디캡 순 슬라이싱보다 조별 핸디캡 합이 고르다
+        order = sorted(range(len(handicaps)), key=lambda i: handicaps[i])
+        sliced, start = [], 0
+        for size in sizes:
+            sliced.append(order[start:start + size])
+            start += size
+        self.assertLess(sum_variance(handicaps, groups), sum_variance(handicaps, sliced))
+        self.assertLessEqual(max(sum(handicaps[i] for i in group) for group in groups)
+                             - min(sum(handicaps[i] for i in group) for group in groups), 10)
+
+    def test_split_sizes(self):
+        self.assertEqual(split_sizes(10, 3), [4, 3, 3])
+
+
+class EventStatusFilterTest(TestCase):
+
+    def setUp(self):
+        """
+        요청 유저(user)가 참가한 이벤트 3개를 생성합니다.
+        - other_accepted: 본인은 PENDING, 다른 참가자가 ACCEPT
+        - self_accepted: 본인이 PARTY
+        - none_accepted: 모두 PENDING/DENY
+        """
+        patcher = patch.object(redis_interface, 'redis_client', fakeredis.FakeStrictRedis(decode_responses=True))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(email='status1@example.com', user_id='status1', password='test123')
+        other = User.objects.create_user(email='status2@example.com', user_id='status2', password='test123')
+        club = Club.objects.create(name='Status Club')
+        member = ClubMember.objects.create(user=self.user, club=club)
+        other_member = ClubMember.objects.create(user=other, club=club)
+
+        now = timezone.now()
+        self.events = {}
+        for title, my_status, other_status in [('other_accepted', 'PENDING', 'ACCEPT'),
+                                               ('self_accepted', 'PARTY', 'PENDING'),
+                                               ('none_accepted', 'PENDING', 'DENY')]:
+            event = Event.objects.create(club=club, event_title=title, start_date_time=now, end_date_time=now)
+            Participant.objects.create(club_member=member, event=event, status_type=my_status,
+                                       group_type=Participant.GroupType.GROUP1)
+            Participant.objects.create(club_member=other_member, event=event, status_type=other_status,
+                                       group_type=Participant.GroupType.GROUP1)
+            self.events[title] = event.id
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.params = {'date': timezone.localdate().isoformat(), 'status_type': 'ACCEPT'}
+
+    def test_list_summary_and_calendar_agree(self):
+        """
+        status_type=ACCEPT는 참가자 중 한 명이라도 참석한 이벤트를 반환하며,
+        전체 목록/요약 목록(mode=summary)/캘린더가 같은 이벤트를 반환하는지 테스트합니다.
+        """
+        expected = {self.events['other_accepted'], self.events['self_accepted']}
+
+        listed = self.client.get('/api/v1/events/', self.params).json()['data']
+        summary = self.client.get('/api/v1/events/', {**self.params, 'mode': 'summary'}).json()['data']['events']
+        calendar = self.client.get('/api/v1/events/calendar/', self.params).json()['data']
+
+        self.assertEqual({event['event_id'] for event in listed}, expected)
+        self.assertEqual({event['event_id'] for event in summary}, expected)
+        self.assertEqual({event['event_id'] for month in calendar for event in month['events']}, expected)
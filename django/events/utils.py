@@ -6,13 +6,21 @@ events/utils.py
 역할: events view의 공통 유틸 클래스
 기능: queryset이나 validate 처리 등
 '''
+import base64
 from datetime import datetime, date
 
 from dateutil.relativedelta import relativedelta
-from django.db.models import Sum
+from django.utils import timezone
+from django.db.models import Sum, Q, Count, Max, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 
-from participants.models import HoleScore
+from participants.models import HoleScore, Participant
+from utils.conditional_response import make_etag
 from .models import Event
+from .redis_interface import EventCalendarCache
+
+EVENT_LIST_PAGE_SIZE = 20       # 커서 기반 목록 조회 시 기본 페이지 크기
+EVENT_LIST_MAX_PAGE_SIZE = 100
 
 
 class EventUtils:
@@ -50,22 +58,215 @@ class EventUtils:
 
         end_date = start_date + relativedelta(years=years)
 
+        # 참가자 join + distinct 대신 서브쿼리로 필터링 (참가 현황 집계가 필터 join에 섞이지 않도록)
         events = (Event.objects
               .select_related('golf_club', 'golf_course', 'club')
               .prefetch_related('participant_set__club_member__user')
               .filter(
-                    participant__club_member__user=user,
+                    id__in=Participant.objects.filter(club_member__user=user).values('event_id'),
                     start_date_time__gte=start_date,
                     start_date_time__lt=end_date
                 )
               .order_by('start_date_time')
-              .distinct()
               )
 
-        if status_type is None: # 상태 타입이 없을 경우 모든 이벤트 반환
-            return events
+        if status_type is not None: # 특정 상태 타입에 해당하는 이벤트만 반환
+            events = EventUtils.filter_accepted_events(events)
+
+        return EventUtils.annotate_participation(events, user)
+
+    """
+    status_type 필터: 참가자 중 한 명이라도 참석(ACCEPT/PARTY)한 이벤트만 남기는 메서드
+    (요청한 유저 본인의 상태가 아니라 이벤트 기준 - 목록/요약 목록/캘린더가 같은 기준을 사용)
+    """
+    @staticmethod
+    def filter_accepted_events(events):
+        return events.filter(
+            id__in=Participant.objects.filter(status_type__in=['ACCEPT', 'PARTY']).values('event_id'))
+
+    """
+    이벤트 쿼리셋에 참가 현황을 조건부 집계로 annotate하는 메서드
+    - 전체/PARTY/ACCEPT(+PARTY)/DENY/PENDING 인원 수
+    - 요청한 유저의 participant id와 조(group_type)
+    EventDetailSerializer는 annotate된 값이 있으면 추가 쿼리 없이 사용한다.
+    """
+    @staticmethod
+    def annotate_participation(events, user):
+        my_participant = Participant.objects.filter(event=OuterRef('pk'), club_member__user=user).order_by('id')
+
+        return events.annotate(
+            participants_count=Count('participant'),
+            party_count=Count('participant', filter=Q(participant__status_type='PARTY')),
+            accept_count=Count('participant', filter=Q(participant__status_type__in=['ACCEPT', 'PARTY'])),
+            deny_count=Count('participant', filter=Q(participant__status_type='DENY')),
+            pending_count=Count('participant', filter=Q(participant__status_type='PENDING')),
+            my_participant_id=Subquery(my_participant.values('id')[:1]),
+            my_group_type=Subquery(my_participant.values('group_type')[:1]),
+        )
+
+    """
+    목록/캘린더 화면용 가벼운 이벤트 쿼리셋을 반환하는 메서드
+    - 참가자 join + distinct 대신 서브쿼리(id__in)로 필터링하여 중복 행이 생기지 않음
+    - 참가자 목록은 prefetch하지 않고, 요청한 유저의 participant id만 annotate
+    """
+    @staticmethod
+    def get_event_summaries_queryset(user, start_date: date, end_date: date = None, status_type: str = None):
+        my_participants = Participant.objects.filter(club_member__user=user)
+
+        events = (Event.objects
+                  .select_related('golf_club', 'golf_course', 'club')
+                  .filter(id__in=my_participants.values('event_id'), start_date_time__gte=start_date)
+                  .annotate(my_participant_id=Subquery(
+                      my_participants.filter(event=OuterRef('pk')).values('id')[:1]))
+                  .order_by('start_date_time', 'id'))
+
+        if end_date is not None:
+            events = events.filter(start_date_time__lt=end_date)
+        if status_type is not None:  # 전체 목록(get_events_for_period)과 같은 기준
+            events = EventUtils.filter_accepted_events(events)
+        return events
+
+    # (start_date_time, id) 커서를 문자열로 인코딩
+    @staticmethod
+    def encode_cursor(event):
+        raw = f"{event.start_date_time.isoformat()}|{event.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    # 커서 문자열을 (start_date_time, id)로 디코딩. 형식이 잘못되면 ValueError
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            start_date_time, event_id = raw.rsplit('|', 1)
+            return datetime.fromisoformat(start_date_time), int(event_id)
+        except (TypeError, UnicodeDecodeError, ValueError) as e:
+            raise ValueError('invalid cursor') from e
+
+    """
+    (start_date_time, id) 키셋 페이지네이션
+    OFFSET 없이 마지막으로 본 이벤트 이후의 행만 page_size + 1개 조회하여 다음 페이지 여부를 판단
+    """
+    @staticmethod
+    def paginate_by_cursor(events, cursor=None, page_size=EVENT_LIST_PAGE_SIZE):
+        if cursor:
+            start_date_time, event_id = EventUtils.decode_cursor(cursor)
+            events = events.filter(Q(start_date_time__gt=start_date_time) |
+                                   Q(start_date_time=start_date_time, id__gt=event_id))
 
-        return events.filter(participant__status_type__in=['ACCEPT', 'PARTY'])  # 특정 상태 타입에 해당하는 이벤트를 반환
+        page = list(events[:page_size + 1])
+        has_next = len(page) > page_size
+        page = page[:page_size]
+        next_cursor = EventUtils.encode_cursor(page[-1]) if has_next else None
+        return page, next_cursor
+
+    """
+    이벤트 결과(순위) 화면용 참가자 쿼리셋과 {user_id: participant} 맵을 반환하는 메서드
+    유저 정보와 홀 점수를 한 번에 가져오므로 시리얼라이저에서 참가자별 추가 쿼리가 발생하지 않음
+    """
+    @staticmethod
+    def get_result_participants(event):
+        participants = list(Participant.objects
+                            .filter(event=event)
+                            .select_related('club_member__user')
+                            .prefetch_related(Prefetch('holescore_set', queryset=HoleScore.objects.order_by('hole_number'))))
+        participants_by_user = {participant.club_member.user_id: participant for participant in participants}
+        return participants, participants_by_user
+
+    """
+    스코어카드 화면용 참가자 리스트를 반환하는 메서드 (ACCEPT, PARTY 참가자)
+    - 전반/후반/전체 점수를 HoleScore join + GROUP BY 한 번으로 annotate
+    - 스코어카드용 홀 점수는 prefetch하여 참가자 수와 관계없이 고정된 쿼리 수로 처리
+    """
+    @staticmethod
+    def get_scorecard_participants(event):
+        return list(Participant.objects
+                    .filter(event=event, status_type__in=[Participant.StatusType.ACCEPT, Participant.StatusType.PARTY])
+                    .select_related('club_member__user')
+                    .annotate(
+                        front_nine_score=Coalesce(Sum('holescore__score', filter=Q(holescore__hole_number__lte=9)), 0),
+                        back_nine_score=Coalesce(Sum('holescore__score', filter=Q(holescore__hole_number__gte=10)), 0),
+                        total_score=Coalesce(Sum('holescore__score'), 0),
+                    )
+                    .prefetch_related(Prefetch('holescore_set', queryset=HoleScore.objects.order_by('hole_number'))))
+
+    """
+    get_scorecard_participants로 가져온 참가자들의 전반/후반/전체/핸디캡 점수 합계를 계산하는 메서드
+    team_type, group_type으로 대상 참가자를 거를 수 있음 (추가 쿼리 없음)
+    """
+    @staticmethod
+    def sum_scorecard_scores(participants, team_type=None, group_type=None):
+        targets = [p for p in participants
+                   if (team_type is None or p.team_type == team_type)
+                   and (group_type is None or p.group_type == group_type)]
+        return {
+            "front_nine_score": sum(p.front_nine_score for p in targets),
+            "back_nine_score": sum(p.back_nine_score for p in targets),
+            "total_score": sum(p.total_score for p in targets),
+            "handicap_score": sum(p.total_score - p.club_member.user.handicap for p in targets),
+        }
+
+    """
+    이벤트 상세 조회 응답의 조건부 GET 검증값(ETag, Last-Modified)을 계산하는 메서드
+    이벤트/참가자/홀 점수/골프장 정보의 최근 수정 시각과 개수·합계를 집계 쿼리로만 구함 (직렬화 없음)
+    응답에 요청 유저 기준 필드(my_participant_id 등)가 있으므로 유저 id도 ETag에 포함
+    응답에 모임 프로필(club)이 있으므로 모임 이름/이미지도 ETag에 포함
+    참가자·홀 점수 삭제는 수정 시각을 앞당기지 않아 Last-Modified로 알 수 없으므로
+    Last-Modified는 반환하지 않는다 (If-Modified-Since로는 304를 주지 않고 ETag로만 비교)
+    """
+    @staticmethod
+    def get_event_validators(event, user):
+        participants = Participant.objects.filter(event=event).aggregate(
+            updated_at=Max('updated_at'),
+            user_updated_at=Max('club_member__user__updated_at'),
+            count=Count('id'),
+            sum_score=Sum('sum_score'),
+            handicap_score=Sum('handicap_score'),
+        )
+        hole_scores = HoleScore.objects.filter(participant__event=event).aggregate(
+            created_at=Max('created_at'),
+            count=Count('id'),
+            score=Sum('score'),
+        )
+        golf_data = Event.objects.filter(pk=event.pk).aggregate(
+            golf_club_updated_at=Max('golf_club__updated_at'),
+            golf_course_updated_at=Max('golf_course__updated_at'),
+            tee_updated_at=Max('golf_course__tees__updated_at'),
+        )
+
+        club = event.club
+        etag = make_etag('event', event.pk, user.pk, event.updated_at, club.name, club.image.name,
+                         *participants.values(), *hole_scores.values(), *golf_data.values())
+        return etag, None
+
+    # 캘린더 버킷 키(YYYY-MM). 시작 시간을 로컬 시간으로 변환하여 달을 정함
+    @staticmethod
+    def get_calendar_month(start_date_time):
+        if timezone.is_aware(start_date_time):
+            start_date_time = timezone.localtime(start_date_time)
+        return start_date_time.strftime('%Y-%m')
+
+    """
+    이벤트 변경 시 캘린더 캐시 무효화 대상(참가자 유저 id 목록, 달 목록)을 반환하는 메서드
+    수정/삭제 전에 호출하여 변경 전 대상도 함께 무효화할 수 있음
+    """
+    @staticmethod
+    def get_calendar_targets(event):
+        user_ids = set(Participant.objects.filter(event=event).values_list('club_member__user_id', flat=True))
+        return user_ids, {EventUtils.get_calendar_month(event.start_date_time)}
+
+    # 모임 멤버가 삭제될 때(참가 기록이 함께 삭제됨) 캘린더 캐시 무효화 대상. 삭제 전에 호출해야 함
+    # 참석 여부 필터는 이벤트의 모든 참가자 기준이므로 같은 이벤트의 다른 참가자도 포함
+    @staticmethod
+    def get_member_calendar_targets(club_member):
+        event_ids = Participant.objects.filter(club_member=club_member).values('event_id')
+        start_times = Event.objects.filter(id__in=event_ids).values_list('start_date_time', flat=True)
+        user_ids = set(Participant.objects.filter(event_id__in=event_ids).values_list('club_member__user_id', flat=True))
+        return user_ids | {club_member.user_id}, {EventUtils.get_calendar_month(start_time) for start_time in start_times}
+
+    # 캘린더 캐시에서 해당 유저들의 해당 달만 삭제
+    @staticmethod
+    def invalidate_calendar_cache(user_ids, months):
+        EventCalendarCache().invalidate(user_ids, months)
 
     # 중복된 참가자가 있는지 확인하는 함수
     @staticmethod
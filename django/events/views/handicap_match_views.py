@@ -5,6 +5,7 @@ events/views/handicap_match_views.py
 
 역할: Django Rest Framework(DRF)를 사용하여 이벤트 API 엔드포인트의 로직을 처리
 - 모임 관리자 : 멤버 핸디캡 자동 매칭 기능(팀전/개인전)
+- strategy: default(기존 방식, 핸디캡 순 배정) / balanced(조별 핸디캡 합 균형 배정)
 '''
 
 from rest_framework import viewsets
@@ -17,10 +18,14 @@ import random
 
 from clubs.models import ClubMember, Club
 from clubs.views.club_common import IsClubAdmin
+from events.matching import balance_groups, split_sizes
 from participants.serializers import ParticipantAutoMatchSerializer
 from utils.error_handlers import handle_400_bad_request, handle_404_not_found
 
 
+MATCH_STRATEGIES = ('default', 'balanced')
+
+
 @permission_classes([IsAuthenticated])
 class HandicapMatchViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]  # 기본 권한: 인증된 사용자
@@ -33,9 +38,12 @@ class HandicapMatchViewSet(viewsets.ViewSet):
         group_head_count = request.data.get('group_head_count')
         team_head_count = request.data.get('team_head_count')
         members_data = request.data.get('participants')
+        strategy = request.data.get('strategy', 'default')
 
         if not members_data:
             return handle_400_bad_request('participants is required.')
+        if strategy not in MATCH_STRATEGIES:
+            return handle_400_bad_request(f'strategy must be one of {", ".join(MATCH_STRATEGIES)}')
 
         try:
             first_member_id = members_data[0]['member_id']
@@ -57,7 +65,9 @@ class HandicapMatchViewSet(viewsets.ViewSet):
                 group_head_count = int(group_head_count)
             except ValueError:
                 return handle_400_bad_request('group_head_count must be an integer')
-            return self.personal_competition(members_data, group_head_count)
+            if group_head_count < 1:
+                return handle_400_bad_request('group_head_count must be at least 1')
+            return self.personal_competition(members_data, group_head_count, strategy)
 
         elif competition_type == 'team':
             if team_head_count is None:
@@ -66,19 +76,34 @@ class HandicapMatchViewSet(viewsets.ViewSet):
                 team_head_count = int(team_head_count)
             except ValueError:
                 return handle_400_bad_request('team_head_count must be an integer')
-            return self.team_competition(members_data, team_head_count)
+            if team_head_count < 1:
+                return handle_400_bad_request('team_head_count must be at least 1')
+            return self.team_competition(members_data, team_head_count, strategy)
 
         else:
             return handle_400_bad_request('Invalid competition type')
 
-    def personal_competition(self, members_data, group_head_count):
+    @staticmethod
+    def balanced_groups(members, group_count):
+        """
+        조별 핸디캡 합의 분산이 최소가 되도록 members를 group_count개 조로 나눈다.
+        """
+        handicaps = [member.user.handicap for member in members]
+        groups = balance_groups(handicaps, split_sizes(len(members), group_count))
+        return [[members[index] for index in group] for group in groups]
+
+    def personal_competition(self, members_data, group_head_count, strategy='default'):
         member_ids = [member['member_id'] for member in members_data]
-        members = ClubMember.objects.filter(id__in=member_ids).select_related('user').order_by('user__handicap')
+        members = list(ClubMember.objects.filter(id__in=member_ids).select_related('user').order_by('user__handicap'))
+
+        if strategy == 'balanced':
+            member_groups = self.balanced_groups(members, group_head_count)
+        else:
+            group_size = math.ceil(len(members) / group_head_count)
+            member_groups = [members[i * group_size:(i + 1) * group_size] for i in range(group_head_count)]
 
         groups = []
-        group_size = math.ceil(len(members) / group_head_count)
-        for i in range(group_head_count):
-            group_participants = members[i * group_size:(i + 1) * group_size]
+        for i, group_participants in enumerate(member_groups):
             participant_data = [
                 {
                     'member_id': member.id,
@@ -99,22 +124,26 @@ class HandicapMatchViewSet(viewsets.ViewSet):
 
         return Response(response_data, status=status.HTTP_200_OK)
 
-    def team_competition(self, members_data, team_head_count):
+    def team_competition(self, members_data, team_head_count, strategy='default'):
         member_ids = [member['member_id'] for member in members_data]
         members = list(ClubMember.objects.filter(id__in=member_ids).select_related('user').order_by('user__handicap'))
 
         # Step 2: Calculate maximum number of teams (j)
         max_teams = math.ceil(len(members) / team_head_count)
 
-        # Step 3: Divide participants into max_teams groups
-        divided_groups = [members[i::max_teams] for i in range(max_teams)]
-
-        # Step 4: Shuffle each group and distribute participants into teams
-        teams = [[] for _ in range(max_teams)]
-        for divided_group in divided_groups:
-            random.shuffle(divided_group)
-            for i, member in enumerate(divided_group):
-                teams[i % max_teams].append(member)
+        if strategy == 'balanced':
+            # 팀별 핸디캡 합이 고르게 되도록 배정
+            teams = self.balanced_groups(members, max_teams)
+        else:
+            # Step 3: Divide participants into max_teams groups
+            divided_groups = [members[i::max_teams] for i in range(max_teams)]
+
+            # Step 4: Shuffle each group and distribute participants into teams
+            teams = [[] for _ in range(max_teams)]
+            for divided_group in divided_groups:
+                random.shuffle(divided_group)
+                for i, member in enumerate(divided_group):
+                    teams[i % max_teams].append(member)
 
         response_groups = []
         team_types = ['A', 'B']
@@ -8,23 +8,39 @@ events/views/views.py
 '''
 from datetime import date, datetime, timedelta
 
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+
 from rest_framework.decorators import permission_classes, action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import viewsets
 
-from events.tasks import send_event_creation_notification, send_event_update_notification, schedule_event_notifications
+from events.tasks import send_event_creation_notification, send_event_update_notification, schedule_event_notifications, \
+    revoke_event_notifications
+from chat.redis_interface import chat_recipient_cache
 from clubs.models import ClubMember, Club
 from clubs.views.club_common import IsClubAdmin
 from participants.models import Participant
 from events.models import Event
-from events.serializers import EventCreateUpdateSerializer, EventDetailSerializer, EventResultSerializer, ScoreCardSerializer
-from events.utils import EventUtils
-from participants.serializers import ParticipantCreateUpdateSerializer
+from events.serializers import EventCreateUpdateSerializer, EventDetailSerializer, EventListSerializer, \
+    EventResultSerializer, ScoreCardSerializer
+from clubs.serializers import ClubProfileSerializer
+from events.redis_interface import EventCalendarCache
+from events.utils import EventUtils, EVENT_LIST_PAGE_SIZE, EVENT_LIST_MAX_PAGE_SIZE
+from participants.serializers import ParticipantCreateUpdateSerializer, ParticipantDetailSerializer, \
+    ParticipantListSerializer
+from participants.stroke.redis_interface import RedisInterface
+from utils.conditional_response import get_not_modified_response, set_validator_headers
 from utils.error_handlers import handle_404_not_found, handle_400_bad_request
 # from chat.services.event_broadcast_service import event_broadcast_service  # 제거됨
 
+# 캘린더 월별 캐시
+calendar_cache = EventCalendarCache()
+# 참가자 Redis 캐시
+participant_cache = RedisInterface()
+
 
 @permission_classes([IsAuthenticated])
 class EventViewSet(viewsets.ModelViewSet):
@@ -35,10 +51,17 @@ class EventViewSet(viewsets.ModelViewSet):
         # 조회 액션은 로그인한 유저라면 누구나 접근 가능
         self.permission_classes = [IsAuthenticated]
         # 나머지 액션은 관리자만 접근 가능
-        if self.action not in ['retrieve', 'list']:
+        if self.action not in ['retrieve', 'list', 'list_calendar', 'list_participants']:
             self.permission_classes.append(IsClubAdmin)
         return super().get_permissions()
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # 상세 조회 시 참가 현황을 한 번의 쿼리로 집계
+        if self.action == 'retrieve':
+            return EventUtils.annotate_participation(queryset, self.request.user)
+        return queryset
+
     def get_serializer_class(self):
         # TODO: 이벤트 상세 조회와 이벤트 전체 조회 시리얼라이저 분리.
         #  이벤트 상세 조회에서 너무 많은 정보가 담겨 over fetching 되고 있음.
@@ -78,6 +101,9 @@ class EventViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         event = serializer.save()
 
+        # 참가자들의 해당 달 캘린더 캐시 무효화
+        EventUtils.invalidate_calendar_cache(*EventUtils.get_calendar_targets(event))
+
         # 비동기적으로 이벤트 생성 알림 전송
         send_event_creation_notification.delay(event.id)
         print(f"===== event id {event.id}")
@@ -108,10 +134,20 @@ class EventViewSet(viewsets.ModelViewSet):
         if EventUtils.is_duplicated_participants(request.data.get('participants',[])):
             return handle_400_bad_request('Duplicate member_id found in participants.')
 
+        # 수정 전 참가자/달도 캘린더 캐시 무효화 대상에 포함
+        old_user_ids, old_months = EventUtils.get_calendar_targets(event)
+
         serializer = self.get_serializer(event, data=request.data, partial=True)  # 여기서 partial=True
         serializer.is_valid(raise_exception=True)
         event = serializer.save()
 
+        new_user_ids, new_months = EventUtils.get_calendar_targets(event)
+        EventUtils.invalidate_calendar_cache(old_user_ids | new_user_ids, old_months | new_months)
+        chat_recipient_cache.invalidate(event_ids=[event.id])
+        participant_cache.refresh_sync_participants_in_redis(
+            event.id, event.participant_set.all(),
+            [participant.pk for participant in getattr(serializer, 'removed_participants', [])])
+
         # 비동기적으로 이벤트 수정 알림 전송
         send_event_update_notification.delay(event.id)
 
@@ -141,6 +177,7 @@ class EventViewSet(viewsets.ModelViewSet):
         # 이벤트 종료 처리
         event.end_date_time = datetime.now()
         event.save()
+        EventUtils.invalidate_calendar_cache(*EventUtils.get_calendar_targets(event))
 
         response_data = {
             'status': status.HTTP_200_OK,
@@ -176,6 +213,12 @@ class EventViewSet(viewsets.ModelViewSet):
             return Response({"status": status.HTTP_401_UNAUTHORIZED, "message": "user is not invited"},
                             status=status.HTTP_401_UNAUTHORIZED)
 
+        # 변경이 없으면 직렬화 없이 304 반환 (If-None-Match / If-Modified-Since)
+        etag, last_modified = EventUtils.get_event_validators(event, user)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+
         # Set group_type in context if needed
         context = super().get_serializer_context()
         context['group_type'] = participants.first().group_type
@@ -187,13 +230,15 @@ class EventViewSet(viewsets.ModelViewSet):
             'message': 'Successfully retrieved',
             'data': serializer.data
         }
-        return Response(response_data, status=status.HTTP_200_OK)
+        return set_validator_headers(Response(response_data, status=status.HTTP_200_OK), etag, last_modified)
 
     # 이벤트 리스트 조회
     def list(self, request, *args, **kwargs):
         """
         GET 요청 시 요청한 날짜 기준으로 1년 뒤까지의 이벤트 목록 반환
         응답 데이터: Event (retrieve와 동일) 리스트
+        mode=summary 인 경우: 요약 정보만 커서 기반으로 페이지 단위 반환
+          GET /events/?mode=summary&date={date}&cursor={next_cursor}&page_size={page_size}
         """
         user = self.request.user
         date_str = request.query_params.get('date')
@@ -209,6 +254,9 @@ class EventViewSet(viewsets.ModelViewSet):
         if not (status_type is None or status_type in Participant.StatusType.__members__):
             return handle_400_bad_request("status_type(null or ACCEPT) 형식을 지켜주세요.")
 
+        if request.query_params.get('mode') == 'summary':
+            return self._list_summary(request, user, start_date, status_type)
+
         # 성능 최적화: 1년 → 3개월로 제한
         queryset = EventUtils.get_events_for_period(
             start_date=start_date,
@@ -225,6 +273,136 @@ class EventViewSet(viewsets.ModelViewSet):
         }
         return Response(response_data, status=status.HTTP_200_OK)
 
+    def _list_summary(self, request, user, start_date, status_type):
+        """
+        요약 이벤트 목록을 (start_date_time, id) 커서 기준으로 페이지 단위 반환
+        참가자 상세 정보는 포함하지 않으며, 필요 시 participants 엔드포인트로 따로 조회
+        """
+        try:
+            page_size = int(request.query_params.get('page_size', EVENT_LIST_PAGE_SIZE))
+        except ValueError:
+            return handle_400_bad_request("page_size는 숫자여야 합니다.")
+        page_size = max(1, min(page_size, EVENT_LIST_MAX_PAGE_SIZE))
+
+        queryset = EventUtils.get_event_summaries_queryset(user=user, start_date=start_date, status_type=status_type)
+        try:
+            events, next_cursor = EventUtils.paginate_by_cursor(
+                queryset, cursor=request.query_params.get('cursor'), page_size=page_size)
+        except ValueError:
+            return handle_400_bad_request("cursor 형식이 올바르지 않습니다.")
+
+        serializer = EventListSerializer(events, many=True, context=self.get_serializer_context())
+        return Response({
+            'status': status.HTTP_200_OK,
+            'message': 'Successfully event list',
+            'data': {
+                'events': serializer.data,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None,
+            }
+        }, status=status.HTTP_200_OK)
+
+    # 캘린더용 월별 이벤트 조회
+    @action(detail=False, methods=['get'], url_path='calendar')
+    def list_calendar(self, request, *args, **kwargs):
+        """
+        GET 요청 시 요청한 달부터 months개월 동안의 요약 이벤트 목록을 월별로 묶어서 반환
+        GET /events/calendar/?date={YYYY-MM-DD}&months={months}&status_type={status_type}
+        응답 데이터: [{"month": "YYYY-MM", "events": [요약 이벤트, ...]}, ...]
+        """
+        user = request.user
+        date_str = request.query_params.get('date') or str(date.today())
+        try:
+            start_date = datetime.fromisoformat(date_str).date().replace(day=1)
+            months = int(request.query_params.get('months', 1))
+        except ValueError:
+            return handle_400_bad_request("date(YYYY-MM-DD)와 months(숫자) 형식을 지켜주세요.")
+        if not 1 <= months <= 12:
+            return handle_400_bad_request("months는 1~12 사이여야 합니다.")
+
+        status_type = request.query_params.get('status_type')
+        if not (status_type is None or status_type in Participant.StatusType.__members__):
+            return handle_400_bad_request("status_type(null or ACCEPT) 형식을 지켜주세요.")
+
+        # (유저, 월) 단위 캐시를 먼저 조회하고, 캐시에 없는 달만 DB에서 조회
+        scope = EventCalendarCache.get_scope(status_type)
+        month_keys = [(start_date + relativedelta(months=i)).strftime('%Y-%m') for i in range(months)]
+        buckets = calendar_cache.get_months(user.id, month_keys, scope)
+        missing = [index for index, month in enumerate(month_keys) if month not in buckets]
+
+        if missing:
+            queryset = EventUtils.get_event_summaries_queryset(
+                user=user,
+                start_date=start_date + relativedelta(months=missing[0]),
+                end_date=start_date + relativedelta(months=missing[-1] + 1),
+                status_type=status_type
+            )
+            serialized = EventListSerializer(queryset, many=True, context=self.get_serializer_context()).data
+
+            # 조회한 기간의 빈 달도 캐싱되도록 빈 버킷을 먼저 만들어 두고, 이벤트를 시작 시간(로컬 시간) 기준 달에 담는다.
+            # 모임 프로필(이름, 이미지 presigned URL)은 캐싱하지 않고 club_id만 저장한 뒤 응답 시점에 채운다.
+            fresh = {month_keys[index]: [] for index in missing}
+            for event, data in zip(queryset, serialized):
+                month = EventUtils.get_calendar_month(event.start_date_time)
+                if month in fresh:
+                    row = {key: value for key, value in data.items() if key != 'club'}
+                    fresh[month].append({'club_id': event.club_id, **row})
+
+            calendar_cache.set_months(user.id, fresh, scope)
+            buckets.update(fresh)
+
+        return Response({
+            'status': status.HTTP_200_OK,
+            'message': 'Successfully event calendar',
+            'data': self.attach_club_profiles(buckets, month_keys)
+        }, status=status.HTTP_200_OK)
+
+    def attach_club_profiles(self, buckets, month_keys):
+        '''
+        캐싱된 캘린더 이벤트에 모임 프로필을 한 번의 쿼리로 붙인다. (삭제된 모임의 이벤트는 제외)
+        '''
+        club_ids = {event['club_id'] for month in month_keys for event in buckets[month]}
+        clubs = Club.objects.filter(id__in=club_ids).only('id', 'name', 'image')
+        profiles = {profile['id']: profile
+                    for profile in ClubProfileSerializer(clubs, many=True, context=self.get_serializer_context()).data}
+
+        data = []
+        for month in month_keys:
+            events = []
+            for event in buckets[month]:
+                event = dict(event)
+                club = profiles.get(event.pop('club_id'))
+                if club is not None:
+                    events.append({'club': club, **event})
+            data.append({'month': month, 'events': events})
+        return data
+
+    # 이벤트 참가자 상세 조회 (요약 목록에서 필요할 때 지연 조회)
+    @action(detail=True, methods=['get'], url_path='participants')
+    def list_participants(self, request, pk=None):
+        """
+        GET 요청 시 특정 이벤트의 참가자 상세 목록 반환
+        요약 목록(mode=summary, calendar)에는 참가자 정보가 없으므로 상세 화면에서 이 엔드포인트로 조회
+        """
+        try:
+            event = Event.objects.get(pk=pk)
+        except Event.DoesNotExist:
+            return handle_404_not_found('event', pk)
+
+        if not Participant.objects.filter(event=event, club_member__user=request.user).exists():
+            return handle_404_not_found('participant', request.user)
+
+        participants = (Participant.objects
+                        .filter(event=event)
+                        .select_related('club_member__user')
+                        .order_by('group_type', 'id'))
+        serializer = ParticipantDetailSerializer(participants, many=True, context=self.get_serializer_context())
+        return Response({
+            'status': status.HTTP_200_OK,
+            'message': 'Successfully retrieved participants',
+            'data': serializer.data
+        }, status=status.HTTP_200_OK)
+
     # 이벤트 삭제 메서드 (DELETE)
     def destroy(self, request, *args, **kwargs):
         user = request.user
@@ -238,7 +416,11 @@ class EventViewSet(viewsets.ModelViewSet):
 
         member = ClubMember.objects.get(user=user,club=event.club)
 
+        calendar_targets = EventUtils.get_calendar_targets(event)  # 삭제 전에 무효화 대상 확보
         self.perform_destroy(event)
+        EventUtils.invalidate_calendar_cache(*calendar_targets)
+        chat_recipient_cache.invalidate(event_ids=[event_id])
+        revoke_event_notifications(event_id)  # 예약된 알림 취소
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_destroy(self, instance):
@@ -268,6 +450,8 @@ class EventViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
         serializer.save(event=event)
+        EventUtils.invalidate_calendar_cache(*EventUtils.get_calendar_targets(event))
+        chat_recipient_cache.invalidate(event_ids=[event.id])
         return Response({
             'status': status.HTTP_201_CREATED,
             'message': f'Participants added in event {event_id}',
@@ -289,7 +473,14 @@ class EventViewSet(viewsets.ModelViewSet):
             return handle_404_not_found('event', event_id)
 
         ids = request.data.get('participant_ids', [])
+        removed = list(Participant.objects.filter(event=event, id__in=ids).values_list('id', 'club_member__user_id'))
         deleted, _ = Participant.objects.filter(event=event, id__in=ids).delete()
+        participant_cache.refresh_sync_participants_in_redis(
+            event.id, removed_participant_ids=[participant_id for participant_id, _ in removed])
+        # 남은 참가자도 참석 여부 필터 결과가 바뀔 수 있으므로 함께 무효화
+        remaining_user_ids, months = EventUtils.get_calendar_targets(event)
+        EventUtils.invalidate_calendar_cache(remaining_user_ids | {user_id for _, user_id in removed}, months)
+        chat_recipient_cache.invalidate(event_ids=[event.id])
         return Response({
             'status': status.HTTP_200_OK,
             'message': f'{deleted} participants removed in event {event.id}',
@@ -308,22 +499,75 @@ class EventViewSet(viewsets.ModelViewSet):
         except Event.DoesNotExist:
             return handle_404_not_found('event', event_id)
 
-        updated = []
-        for data in request.data.get('participants', []):
-            try:
-                inst = Participant.objects.get(event=event, pk=data['id'])
-            except Participant.DoesNotExist:
+        # 요청한 참가자를 한 번에 조회하고, 전체를 검증한 뒤 bulk_update로 한 번에 저장
+        participants_data = request.data.get('participants', [])
+        # in_bulk()의 키는 정수이므로 문자열 id("3")도 정수로 맞춘다
+        try:
+            participant_ids = [int(data['id']) for data in participants_data]
+        except (KeyError, TypeError, ValueError):
+            return handle_400_bad_request('Each participant must have an integer id.')
+        participants = (Participant.objects.filter(event=event, pk__in=participant_ids)
+                        .prefetch_related('holescore_set').in_bulk())
+        updates = []
+        for participant_id, data in zip(participant_ids, participants_data):
+            inst = participants.get(participant_id)
+            if inst is None:
                 continue
             serializer = ParticipantCreateUpdateSerializer(
                 inst, data=data, partial=True, context={'request': request}
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save()
-            updated.append(serializer.data)
+            updates.append((inst, serializer.validated_data))
+
+        updated = ParticipantListSerializer.apply_updates(updates)
+        if updated:
+            participant_cache.refresh_sync_participants_in_redis(event.id, updated)
+            EventUtils.invalidate_calendar_cache(*EventUtils.get_calendar_targets(event))
         return Response({
             'status': status.HTTP_200_OK,
             'message': f'{len(updated)} participants updated in event {event.id}',
-            'data': updated
+            'data': ParticipantCreateUpdateSerializer(updated, many=True, context={'request': request}).data
+        })
+
+    @action(detail=True, methods=['put'], url_path='roster')
+    def replace_participants(self, request, pk=None):
+        """
+        참가자 명단 전체 교체
+        명단 전체를 검증한 뒤 club_member 기준으로 기존 참가자는 팀/조 수정, 신규 참가자는 생성, 빠진 참가자는 삭제
+        요청데이터: { "participants": [ {member_id, team_type, group_type}, … ] }
+        """
+        event_id = self.kwargs.get('pk')
+        try:
+            event = self.get_object()
+            self.check_object_permissions(request, event.club)
+        except Event.DoesNotExist:
+            return handle_404_not_found('event', event_id)
+
+        participants_data = request.data.get('participants', [])
+        if EventUtils.is_duplicated_participants(participants_data):
+            return handle_400_bad_request('Duplicate member_id found in participants.')
+
+        serializer = ParticipantCreateUpdateSerializer(
+            data=participants_data, many=True, context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        old_user_ids, months = EventUtils.get_calendar_targets(event)
+        with transaction.atomic():
+            participants = serializer.update(
+                event.participant_set.prefetch_related('holescore_set'),
+                [{**data, 'event': event} for data in serializer.validated_data]
+            )
+
+        participant_cache.refresh_sync_participants_in_redis(
+            event.id, participants, [participant.pk for participant in serializer.removed])
+        new_user_ids, _ = EventUtils.get_calendar_targets(event)
+        EventUtils.invalidate_calendar_cache(old_user_ids | new_user_ids, months)
+        chat_recipient_cache.invalidate(event_ids=[event.id])
+        return Response({
+            'status': status.HTTP_200_OK,
+            'message': f'{len(participants)} participants saved, {len(serializer.removed)} removed in event {event.id}',
+            'data': ParticipantCreateUpdateSerializer(participants, many=True, context={'request': request}).data
         })
 
     # 이벤트 개인전 결과 조회 (GET)
@@ -348,14 +592,15 @@ class EventViewSet(viewsets.ModelViewSet):
         # 쿼리 파라미터에서 sort_type을 가져옴 (없으면 기본값으로 sum_score)
         sort_type = request.query_params.get('sort_type', 'sum_score')
 
-        # 이벤트에 참여한 참가자들을 가져옴
-        participants = Participant.objects.filter(event=event)
+        # 이벤트에 참여한 참가자들을 유저 정보, 홀 점수와 함께 한 번에 가져옴
+        participants, participants_by_user = EventUtils.get_result_participants(event)
 
         # 시리얼라이저에 sort_type과 user를 컨텍스트로 넘김
         serializer = EventResultSerializer(
             event,
             context={
                 'participants': participants,
+                'participants_by_user': participants_by_user,
                 'sort_type': sort_type,
                 'request': request
             })
@@ -388,22 +633,18 @@ class EventViewSet(viewsets.ModelViewSet):
         # 쿼리 파라미터에서 sort_type을 가져옴 (없으면 기본값으로 sum_score)
         sort_type = request.query_params.get('sort_type', 'sum_score')
 
-        # 조별 점수 및 승리 팀 계산
-        event.calculate_group_scores()
-        event.calculate_total_scores()
-
-        # 핸디캡 적용 점수 계산
-        event.calculate_group_scores_with_handicap()
-        event.calculate_total_scores_with_handicap()
+        # 조별/전체 점수 및 승리 팀 계산 (핸디캡 적용 포함)
+        event.calculate_team_results()
 
         # 추가적으로 participants 정보를 포함하기 위해 컨텍스트에 전달
-        participants = Participant.objects.filter(event=event)
+        participants, participants_by_user = EventUtils.get_result_participants(event)
 
         # 시리얼라이저에 데이터를 넘겨서 JSON 응답으로 변환
         serializer = EventResultSerializer(
             event,
             context={
                 'participants': participants,
+                'participants_by_user': participants_by_user,
                 'sort_type': sort_type,
                 'request': request
             }
@@ -452,19 +693,26 @@ class EventViewSet(viewsets.ModelViewSet):
         if not Participant.objects.filter(event=event, club_member__user=user).exists():
             return handle_404_not_found('participant', user)
 
-        group_participants = Participant.objects.filter(
-            event=event,
-            status_type__in=[Participant.StatusType.ACCEPT, Participant.StatusType.PARTY]
-        )
+        # 참가자별 전반/후반/전체 점수와 홀 점수를 고정된 쿼리 수로 가져옴
+        group_participants = EventUtils.get_scorecard_participants(event)
 
         # 팀 스코어를 저장할 변수들
         team_a_scores = None
         team_b_scores = None
+        group_scores = None
 
         # 팀 타입이 NONE이 아닌 경우에만 팀 스코어 계산
         if any(p.team_type != Participant.TeamType.NONE for p in group_participants):
             team_a_scores = self.calculate_team_scores(group_participants, Participant.TeamType.TEAM1)
             team_b_scores = self.calculate_team_scores(group_participants, Participant.TeamType.TEAM2)
+            group_scores = [
+                {
+                    'group_type': group_type,
+                    'team_a_scores': self.calculate_team_scores(group_participants, Participant.TeamType.TEAM1, group_type),
+                    'team_b_scores': self.calculate_team_scores(group_participants, Participant.TeamType.TEAM2, group_type),
+                }
+                for group_type in sorted({p.group_type for p in group_participants})
+            ]
 
         # 개인전+팀전 스코어카드를 시리얼라이즈
         serializer = ScoreCardSerializer(group_participants, many=True)
@@ -475,24 +723,16 @@ class EventViewSet(viewsets.ModelViewSet):
             'data': {
                 'participants': serializer.data,    # 개인전 스코어카드
                 'team_a_scores': team_a_scores,     # 팀 A의 점수 (개인전인 경우 None)
-                'team_b_scores': team_b_scores      # 팀 B의 점수 (개인전인 경우 None)
+                'team_b_scores': team_b_scores,     # 팀 B의 점수 (개인전인 경우 None)
+                'group_scores': group_scores        # 조별 팀 점수 (개인전인 경우 None)
             }
         }
         return Response(response_data, status=status.HTTP_200_OK)
 
-    # 특정 팀의 전반, 후반, 전체, 핸디캡 적용 점수를 계산
-    def calculate_team_scores(self, participants, team_type):
-        team_participants = participants.filter(team_type=team_type) # 주어진 팀 타입(TEAM1 또는 TEAM2)에 속한 참가자들만 필터링
-        front_nine_score = sum([p.get_front_nine_score() for p in team_participants])   # 팀에 속한 모든 참가자들의 전반전 점수를 합산
-        back_nine_score = sum([p.get_back_nine_score() for p in team_participants])     # 팀에 속한 모든 참가자들의 후반전 점수를 합산
-        total_score = sum([p.get_total_score() for p in team_participants])             # 전반전과 후반전 점수를 합산한 전체 점수를 계산
-        handicap_score = sum([p.get_handicap_score() for p in team_participants])       # 각 참가자의 핸디캡 점수를 적용한 점수를 합산
-        return {
-            "front_nine_score": front_nine_score,
-            "back_nine_score": back_nine_score,
-            "total_score": total_score,
-            "handicap_score": handicap_score
-        }
+    # 특정 팀의 전반, 후반, 전체, 핸디캡 적용 점수를 계산 (group_type이 있으면 해당 조만)
+    def calculate_team_scores(self, participants, team_type, group_type=None):
+        # participants는 EventUtils.get_scorecard_participants로 점수가 annotate된 리스트이므로 추가 쿼리 없음
+        return EventUtils.sum_scorecard_scores(participants, team_type=team_type, group_type=group_type)
     
     # 🎵 라디오 방송 관련 API들
     
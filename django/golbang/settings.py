@@ -166,6 +166,9 @@ CHANNEL_LAYERS = {
     },
 }
 
+# 채팅 메시지 write-behind 저장 (True: Redis stream에 기록 후 바로 브로드캐스트, chat.tasks.persist_chat_messages가 일괄 저장)
+CHAT_WRITE_BEHIND = env.bool('CHAT_WRITE_BEHIND', default=False)
+
 # Celery
 CELERY_BROKER_URL = f'redis://:{REDIS_PASSWORD}@redis:6379/0'
 CELERY_RESULT_BACKEND = f'redis://:{REDIS_PASSWORD}@redis:6379/0'
@@ -178,6 +181,27 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'clubs.tasks.calculate_club_ranks_and_points',
         'schedule': crontab(minute=0, hour=0),  # 매일 자정에 실행
     },
+    'dispatch-due-event-notifications': {
+        'task': 'events.tasks.dispatch_due_event_notifications',
+        'schedule': 10.0,  # 10초마다 발송 시각이 지난 예약 알림 발송
+    },
+    'dispatch-due-chat-pushes': {
+        'task': 'chat.tasks.dispatch_due_chat_pushes',
+        'schedule': 2.0,  # 2초마다 합치기 창이 끝난 채팅방의 푸시 전송
+    },
+    'persist-chat-messages': {
+        'task': 'chat.tasks.persist_chat_messages',
+        # write-behind 사용 시 1초마다 일괄 저장, 미사용 시 1분마다 전환 전에 남은 메시지만 확인
+        'schedule': 1.0 if CHAT_WRITE_BEHIND else 60.0,
+    },
+    'flush-reaction-counts': {
+        'task': 'chat.tasks.flush_reaction_counts',
+        'schedule': 5.0,  # 5초마다 Redis 반응 수를 DB 컬럼에 반영
+    },
+    'prune-notifications-every-hour': {
+        'task': 'notifications.tasks.prune_notifications',
+        'schedule': crontab(minute=30),  # 매시 30분에 알림 보관 정책 적용
+    },
 }
 # settings.py (테스트 환경에서만 사용)
 CELERY_TASK_ALWAYS_EAGER = False
@@ -6,12 +6,15 @@ golf_data/views.py
 기능:
 - 전체 골프장 목록 조회 (list)
 - 특정 골프장 조회 (retrieve)
+- 조건부 GET(ETag/Last-Modified): 골프장 정보가 바뀌지 않았으면 304 반환
 """
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
 
+from utils.conditional_response import get_not_modified_response, make_etag, set_validator_headers
 from .models import GolfClub
 from .serializers import GolfClubDetailSerializer, GolfClubListSerializer
 
@@ -33,22 +36,60 @@ class GolfCourseViewSet(viewsets.ReadOnlyModelViewSet):
         golfclub_id = request.query_params.get("golfclub_id")  # Query Parameter에서 `golfclub_id` 가져오기
 
         if golfclub_id:
-            golf_club = get_object_or_404(GolfClub, id=golfclub_id)  # 404 처리 포함
-            serializer = GolfClubDetailSerializer(golf_club)
-            response_data = {
-                'status': status.HTTP_200_OK,
-                'message': f'Successfully retrieved golf club with id {golfclub_id}',
-                'data': serializer.data
-            }
-            return Response(response_data, status=status.HTTP_200_OK)
+            return self._retrieve_golf_club(request, golfclub_id)
 
         # `golfclub_id`가 없을 경우 전체 목록 반환
+        # 골프장/코스 정보가 바뀌지 않았으면 직렬화 없이 304 반환
+        etag, last_modified = self._get_validators(GolfClub.objects.all(), 'golf_club_list')
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+
         # TODO: 예외처리 필요함
-        queryset = self.get_queryset()
+        queryset = self.get_queryset().prefetch_related('courses')
         serializer = GolfClubListSerializer(queryset, many=True)
         response_data = {
             'status': status.HTTP_200_OK,
             'message': 'Successfully retrieved golf club list',
             'data': serializer.data
         }
-        return Response(response_data, status=status.HTTP_200_OK)
+        return set_validator_headers(Response(response_data, status=status.HTTP_200_OK), etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        특정 골프장 정보 조회 (GET /golfcourses/{id}/)
+        """
+        return self._retrieve_golf_club(request, kwargs.get('pk'))
+
+    def _retrieve_golf_club(self, request, golfclub_id):
+        golf_club = get_object_or_404(GolfClub, id=golfclub_id)  # 404 처리 포함
+
+        etag, last_modified = self._get_validators(GolfClub.objects.filter(id=golf_club.id), f'golf_club:{golf_club.id}')
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+
+        serializer = GolfClubDetailSerializer(golf_club)
+        response_data = {
+            'status': status.HTTP_200_OK,
+            'message': f'Successfully retrieved golf club with id {golfclub_id}',
+            'data': serializer.data
+        }
+        return set_validator_headers(Response(response_data, status=status.HTTP_200_OK), etag, last_modified)
+
+    @staticmethod
+    def _get_validators(golf_clubs, scope):
+        """
+        골프장/코스/티의 최근 수정 시각과 개수로 ETag를 계산 (집계 쿼리 1회)
+        골프장/코스/티 삭제는 수정 시각을 앞당기지 않아 Last-Modified로 알 수 없으므로
+        Last-Modified는 반환하지 않는다 (삭제는 ETag의 개수로 반영)
+        """
+        summary = golf_clubs.aggregate(
+            club_updated_at=Max('updated_at'),
+            course_updated_at=Max('courses__updated_at'),
+            tee_updated_at=Max('courses__tees__updated_at'),
+            club_count=Count('id', distinct=True),
+            course_count=Count('courses', distinct=True),
+            tee_count=Count('courses__tees', distinct=True),
+        )
+        return make_etag(scope, *summary.values()), None
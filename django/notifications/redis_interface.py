@@ -1,93 +1,311 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+notifications/redis_interface.py
+
+역할: Redis에 사용자별 알림을 저장/조회하는 인터페이스 (fan-out-on-write)
+- 본문: notification_payload:{notification_id} (JSON 문자열, 7일 TTL) → 같은 알림을 받는 사용자들이 공유
+- 인덱스: notifications:{user_id}:index (sorted set, score=알림 시각) → KEYS 없이 최신순 조회/커서 페이지네이션
+- 안 읽은 알림: notifications:{user_id}:unread (sorted set) → ZCARD로 O(1) 개수 조회
+읽음/삭제 상태는 사용자별 sorted set에서만 관리하고 공유 본문은 수정하지 않는다.
+보관 정책: 사용자별 최대 개수(NOTIFICATION_MAX_PER_USER)와 최대 보관 기간(NOTIFICATION_TTL)
+- 저장 시 해당 사용자의 인덱스를 잘라내고, 주기 작업(notifications.tasks.prune_notifications)이 전체 인덱스를 정리
+이전 형식(notification:{user_id}:{notification_id}, 사용자별 본문 + read 필드)으로 저장된 알림은
+주기 작업이 SCAN으로 찾아 위 형식으로 옮긴다 (migrate_legacy_notifications, 남은 키가 없으면 완료 표시 후 생략)
+'''
 from golbang import settings
 import redis
 import json
+import time
+import uuid
 from asgiref.sync import sync_to_async
 from datetime import datetime
 
 # Redis 클라이언트 초기화
-redis_client = redis_client = redis.StrictRedis(
-    host='redis', 
-    port=6379, 
-    db=0, 
+redis_client = redis.StrictRedis(
+    host='redis',
+    port=6379,
+    db=0,
     password=settings.REDIS_PASSWORD
 )
 
+NOTIFICATION_TTL = 604800        # 7일 후 만료 (최대 보관 기간)
+NOTIFICATION_MAX_PER_USER = 200  # 사용자별 최대 보관 개수
+NOTIFICATION_PAGE_SIZE = 20
+NOTIFICATION_MAX_PAGE_SIZE = 100
+NOTIFICATION_PIPELINE_BATCH = 500   # 파이프라인 한 번에 처리할 수신자 수
+NOTIFICATION_INDEX_PATTERN = "notifications:*:index"
+NOTIFICATION_LEGACY_PATTERN = "notification:*"
+NOTIFICATION_LEGACY_DONE_KEY = "notifications:legacy_migrated"
+
 
 class NotificationRedisInterface:
     """
     Redis와 상호작용하여 알림 데이터를 관리하는 인터페이스
     """
 
+    @staticmethod
+    def _payload_key(notification_id):
+        return f"notification_payload:{notification_id}"
+
+    @staticmethod
+    def _index_key(user_id):
+        return f"notifications:{user_id}:index"
+
+    @staticmethod
+    def _unread_key(user_id):
+        return f"notifications:{user_id}:unread"
+
+    @staticmethod
+    def encode_cursor(score, notification_id):
+        return f"{score!r}:{notification_id}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        커서 문자열을 (score, notification_id)로 변환. 형식이 잘못되면 ValueError
+        """
+        score, _, notification_id = cursor.partition(':')
+        if not notification_id:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return float(score), notification_id
+
     async def save_notification(self, user_id, notification_id, notification_data, event_id=None, club_id=None):
         """
-        Redis에 알림 데이터를 저장합니다.
+        Redis에 한 사용자의 알림 데이터를 저장합니다.
         """
-        print(f"이곳은 save_notification 함수!!!!! user_id={user_id} notification_id={notification_id}, notification_data={notification_data}")
+        await sync_to_async(self.save_bulk_notification)(
+            [user_id], notification_data, event_id=event_id, club_id=club_id, notification_id=notification_id)
 
+    def save_bulk_notification(self, user_ids, notification_data, event_id=None, club_id=None, notification_id=None):
+        """
+        여러 사용자에게 같은 알림을 저장합니다.
+        알림 본문은 한 번만 저장하고, 사용자별로는 인덱스/안 읽음 엔트리만 파이프라인으로 추가합니다.
+        반환값: notification_id
+        """
+        notification_id = notification_id or str(uuid.uuid4())
+        now = datetime.now()
+        payload = {key: value for key, value in notification_data.items() if key != "read"}  # 읽음 여부는 사용자별로 관리
         # 타임스탬프 및 event_id 또는 club_id 데이터 추가
-        notification_data.update({
-            "timestamp": datetime.now().isoformat(),
+        payload.update({
+            "notification_id": notification_id,
+            "timestamp": now.isoformat(),
             "event_id": event_id,
             "club_id": club_id
         })
-        print(f"notification_data에 타임스탬프 추가 => {notification_data}")
-        key = f"notification:{user_id}:{notification_id}"
-        print(f"Saving notification with key={key} and data={notification_data}")
+        score = now.timestamp()
+        expired_before = time.time() - NOTIFICATION_TTL
+
+        user_ids = list(user_ids)
+        redis_client.set(self._payload_key(notification_id), json.dumps(payload), ex=NOTIFICATION_TTL)
+        for start in range(0, len(user_ids), NOTIFICATION_PIPELINE_BATCH):
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id in user_ids[start:start + NOTIFICATION_PIPELINE_BATCH]:
+                pipe.zadd(self._index_key(user_id), {notification_id: score})
+                pipe.zadd(self._unread_key(user_id), {notification_id: score})
+                self._enforce_retention(pipe, user_id, expired_before)
+            pipe.execute()
+        return notification_id
+
+    def _enforce_retention(self, pipe, user_id, expired_before):
+        """
+        사용자 인덱스에 보관 정책을 적용하는 명령을 파이프라인에 추가
+        - 최대 보관 기간이 지난 알림 제거 (본문도 같은 기준으로 만료됨)
+        - 최대 개수를 넘는 오래된 알림 제거
+        - 안 읽은 알림은 인덱스에 남은 알림으로만 제한 (ZINTERSTORE, 점수는 안 읽은 알림 쪽 유지)
+        """
+        index_key, unread_key = self._index_key(user_id), self._unread_key(user_id)
+        pipe.zremrangebyscore(index_key, '-inf', expired_before)
+        pipe.zremrangebyrank(index_key, 0, -(NOTIFICATION_MAX_PER_USER + 1))
+        pipe.zinterstore(unread_key, {unread_key: 1, index_key: 0})
+        pipe.expire(index_key, NOTIFICATION_TTL)
+        pipe.expire(unread_key, NOTIFICATION_TTL)
+
+    def prune_notifications(self, scan_count=NOTIFICATION_PIPELINE_BATCH):
+        """
+        모든 사용자 인덱스에 보관 정책을 적용 (주기 작업용)
+        KEYS 대신 SCAN으로 인덱스 키를 나눠서 순회하고, 나눈 단위마다 파이프라인 한 번으로 정리한다.
+        반환값: 정리한 사용자 인덱스 수
+        """
+        expired_before = time.time() - NOTIFICATION_TTL
+        pruned = 0
+        for keys in self._scan_index_keys(scan_count):
+            pipe = redis_client.pipeline(transaction=False)
+            for key in keys:
+                self._enforce_retention(pipe, key.decode().split(':')[1], expired_before)
+            pipe.execute()
+            pruned += len(keys)
+        return pruned
+
+    @staticmethod
+    def _scan_index_keys(scan_count):
+        yield from NotificationRedisInterface._scan_keys(NOTIFICATION_INDEX_PATTERN, scan_count)
+
+    @staticmethod
+    def _scan_keys(pattern, scan_count):
+        cursor = 0
+        while True:
+            cursor, keys = redis_client.scan(cursor=cursor, match=pattern, count=scan_count)
+            if keys:
+                yield keys
+            if cursor == 0:
+                break
 
-        await sync_to_async(redis_client.set)(key, json.dumps(notification_data))
-        await sync_to_async(redis_client.expire)(key, 604800)  # 7일 후 만료
+    def migrate_legacy_notifications(self, scan_count=NOTIFICATION_PIPELINE_BATCH):
+        """
+        이전 형식(notification:{user_id}:{notification_id}) 알림을 공유 본문 + 사용자별 인덱스로 옮긴다.
+        SCAN으로 이전 키를 나눠서 읽고, 남은 TTL과 read 필드를 유지한 채 인덱스/안 읽음 sorted set을 다시 만든 뒤 이전 키를 지운다.
+        옮길 키가 하나도 없으면 완료 표시를 남겨 이후 호출은 SCAN 없이 반환한다.
+        반환값: 옮긴 알림 수
+        """
+        if redis_client.exists(NOTIFICATION_LEGACY_DONE_KEY):
+            return 0
+        migrated = 0
+        for keys in self._scan_keys(NOTIFICATION_LEGACY_PATTERN, scan_count):
+            migrated += self._migrate_legacy_keys(keys)
+        if migrated == 0:
+            redis_client.set(NOTIFICATION_LEGACY_DONE_KEY, 1)
+        return migrated
+
+    def _migrate_legacy_keys(self, keys):
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+            pipe.ttl(key)
+        results = pipe.execute()
+
+        now = time.time()
+        migrated, user_ids = 0, set()
+        pipe = redis_client.pipeline(transaction=False)
+        for key, payload, ttl in zip(keys, results[::2], results[1::2]):
+            try:
+                _, user_id, notification_id = key.decode().split(':', 2)
+                data = json.loads(payload)
+            except (TypeError, ValueError):  # 이미 만료되었거나 형식이 다른 키는 TTL로 정리
+                continue
+            ttl = ttl if ttl > 0 else NOTIFICATION_TTL
+            try:
+                score = datetime.fromisoformat(data["timestamp"]).timestamp()
+            except (KeyError, TypeError, ValueError):
+                score = now - (NOTIFICATION_TTL - ttl)  # 저장 시각을 남은 TTL로 추정
+            read = data.pop("read", False)
+            data.update({
+                "notification_id": notification_id,
+                "timestamp": data.get("timestamp") or datetime.fromtimestamp(score).isoformat(),
+            })
+            # 같은 알림을 받은 사용자들이 본문을 공유하므로 먼저 옮긴 본문을 유지
+            pipe.set(self._payload_key(notification_id), json.dumps(data), ex=ttl, nx=True)
+            pipe.zadd(self._index_key(user_id), {notification_id: score})
+            if not read:
+                pipe.zadd(self._unread_key(user_id), {notification_id: score})
+            pipe.delete(key)
+            user_ids.add(user_id)
+            migrated += 1
+
+        expired_before = now - NOTIFICATION_TTL
+        for user_id in user_ids:
+            self._enforce_retention(pipe, user_id, expired_before)
+        pipe.execute()
+        return migrated
 
     async def get_notification(self, user_id, notification_id):
         """
-        Redis에서 특정 알림 데이터를 가져옵니다.
+        Redis에서 특정 사용자의 알림 데이터를 가져옵니다. (인덱스에 없으면 None)
         """
-        key = f"notification:{user_id}:{notification_id}"
-        notification = await sync_to_async(redis_client.get)(key)
-        if notification:
-            return json.loads(notification)
-        return None
+        return await sync_to_async(self._get_notification)(user_id, notification_id)
+
+    def _get_notification(self, user_id, notification_id):
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zscore(self._index_key(user_id), notification_id)
+        pipe.zscore(self._unread_key(user_id), notification_id)
+        pipe.get(self._payload_key(notification_id))
+        indexed, unread, payload = pipe.execute()
+        if indexed is None or payload is None:
+            return None
+        return {**json.loads(payload), "read": unread is None}
 
     async def delete_notification(self, user_id, notification_id):
         """
-        Redis에서 특정 알림 데이터를 삭제합니다.
+        특정 사용자의 알림을 삭제합니다. (공유 본문은 TTL로 만료)
         """
-        key = f"notification:{user_id}:{notification_id}"
-        await sync_to_async(redis_client.delete)(key)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zrem(self._index_key(user_id), notification_id)
+        pipe.zrem(self._unread_key(user_id), notification_id)
+        await sync_to_async(pipe.execute)()
 
     async def get_all_notifications(self, user_id):
         """
-        Redis에서 특정 사용자의 모든 알림 데이터를 가져옵니다.
+        Redis에서 특정 사용자의 모든 알림 데이터를 최신순으로 가져옵니다.
+        """
+        notifications, _ = await sync_to_async(self._get_page)(user_id, None, None)
+        return notifications
+
+    async def get_notifications_page(self, user_id, cursor=None, page_size=NOTIFICATION_PAGE_SIZE):
+        """
+        최신순 알림 한 페이지와 다음 페이지 커서를 반환합니다. (다음 페이지가 없으면 커서는 None)
+        cursor는 이전 페이지 마지막 알림의 (score, notification_id)를 인코딩한 값
         """
-        print(f"get_all_notifications: {user_id} 함수 들어옴")
-        pattern = f"notification:{user_id}:*"
-        print(f"pattern: {pattern}")
+        return await sync_to_async(self._get_page)(user_id, cursor, page_size)
 
-        # 현재 저장된 모든 키 확인 (디버깅용)
-        all_keys = await sync_to_async(redis_client.keys)("*")
-        print(f"All keys in Redis: {all_keys}")
+    def _get_page(self, user_id, cursor, page_size):
+        index_key = self._index_key(user_id)
+        limit = None if page_size is None else page_size + 1  # 다음 페이지 존재 여부 확인용으로 1개 더 조회
 
-        # 사용자 관련 키 검색
-        keys = await sync_to_async(redis_client.keys)(pattern)
-        print(f"Filtered keys: {keys}")
+        if cursor is None:
+            entries = redis_client.zrevrange(index_key, 0, -1 if limit is None else limit - 1, withscores=True)
+        else:
+            score, notification_id = self.decode_cursor(cursor)
+            rank = redis_client.zrevrank(index_key, notification_id)
+            if rank is not None:
+                entries = redis_client.zrevrange(index_key, rank + 1, -1 if limit is None else rank + limit,
+                                                 withscores=True)
+            else:
+                # 커서 알림이 삭제/만료된 경우 시각 기준으로 이어서 조회
+                page_options = {} if limit is None else {'start': 0, 'num': limit}
+                entries = redis_client.zrevrangebyscore(index_key, f"({score!r}", '-inf',
+                                                        withscores=True, **page_options)
 
-        notifications = []
-        for key in keys:
-            notification = await sync_to_async(redis_client.get)(key)
-            print(f"Fetched notification from key={key}: {notification}")
+        has_next = limit is not None and len(entries) > page_size
+        entries = entries[:page_size] if has_next else entries
+        if not entries:
+            return [], None
 
-            if notification:
-                print(f"notification 안에 들어옴")
-                notifications.append(json.loads(notification))
-        return notifications
+        notification_ids = [member.decode() for member, _ in entries]
+        unread_key = self._unread_key(user_id)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.mget([self._payload_key(notification_id) for notification_id in notification_ids])
+        for notification_id in notification_ids:
+            pipe.zscore(unread_key, notification_id)
+        payloads, *unread_scores = pipe.execute()
+
+        notifications, missing = [], []
+        for notification_id, payload, unread in zip(notification_ids, payloads, unread_scores):
+            if payload is None:
+                missing.append(notification_id)
+            else:
+                notifications.append({**json.loads(payload), "read": unread is None})
+        if missing:  # 본문이 만료된 알림은 인덱스에서 정리
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.zrem(index_key, *missing)
+            pipe.zrem(unread_key, *missing)
+            pipe.execute()
+
+        next_cursor = self.encode_cursor(entries[-1][1], notification_ids[-1]) if has_next else None
+        return notifications, next_cursor
+
+    async def get_unread_count(self, user_id):
+        """
+        안 읽은 알림 개수 (ZCARD, O(1))
+        """
+        return await sync_to_async(redis_client.zcard)(self._unread_key(user_id))
 
     async def mark_notification_as_read(self, user_id, notification_id):
         """
-        Redis에서 특정 알림을 읽음 상태로 업데이트합니다.
+        특정 사용자의 알림을 읽음 상태로 업데이트합니다.
         """
-        key = f"notification:{user_id}:{notification_id}"
-        notification = await self.get_notification(user_id, notification_id)
-        if notification:
-            notification["read"] = True
-            await self.save_notification(user_id, notification_id, notification)
-        else:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zscore(self._index_key(user_id), notification_id)
+        pipe.zrem(self._unread_key(user_id), notification_id)
+        indexed, _ = await sync_to_async(pipe.execute)()
+        if indexed is None:
             raise ValueError(f"Notification {notification_id} not found for user {user_id}")
@@ -0,0 +1,36 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+notifications/tasks.py
+
+Celery 작업 큐
+- 알림 보관 정책(최대 개수/최대 보관 기간) 주기 적용
+- 이전 형식 알림 키를 인덱스 형식으로 옮기기
+'''
+from celery import shared_task
+
+from notifications.redis_interface import NotificationRedisInterface
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Redis 인터페이스 생성
+redis_interface = NotificationRedisInterface()
+
+
+@shared_task
+def prune_notifications():
+    """
+    모든 사용자의 알림 인덱스를 보관 정책에 맞게 정리하는 Celery 작업
+    (알림 저장 시에는 수신자 인덱스만 정리되므로, 새 알림이 없는 사용자는 이 작업으로 정리)
+    이전 형식으로 남아 있는 알림도 먼저 인덱스 형식으로 옮긴다.
+    """
+    try:
+        migrated = redis_interface.migrate_legacy_notifications()
+        if migrated:
+            logger.info(f"이전 형식 알림 이전 완료: {migrated}개")
+        pruned = redis_interface.prune_notifications()
+        logger.info(f"알림 인덱스 정리 완료: {pruned}명")
+    except Exception as e:
+        logger.error(f"Error pruning notifications: {e}")
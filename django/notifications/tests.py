@@ -1,3 +1,33 @@
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import DeviceToken, User
+from utils.fcm_delivery import FCMDeliveryEngine, LocalTransport
+
+
+class FCMDeliveryEngineTest(TestCase):
+    def test_sends_in_batches_and_prunes_invalid_tokens(self):
+        expired = User.objects.create_user(email='expired@x.com', user_id='expired', password='p',
+                                           fcm_token='token-expired')
+        active = User.objects.create_user(email='active@x.com', user_id='active', password='p',
+                                          fcm_token='token-0')
+        DeviceToken.objects.create(user=expired, token='token-expired')
+        DeviceToken.objects.create(user=active, token='token-0')
+        DeviceToken.objects.create(user=active, token='token-1')
+        tokens = [f'token-{i}' for i in range(1200)] + ['token-expired', 'token-0', '']
+        transport = LocalTransport(invalid_tokens={'token-expired'}, failing_tokens={'token-1'})
+
+        report = FCMDeliveryEngine(transport=transport).send(tokens, '제목', '내용', {'event_id': 1})
+
+        # 중복/빈 토큰 제외 후 500개 단위 배치로 전송
+        self.assertEqual(sorted(len(batch) for batch, *_ in transport.sent), [201, 500, 500])
+        self.assertEqual(transport.sent[0][3], {'event_id': '1'})
+        self.assertEqual((report.success_count, report.failure_count), (1199, 2))
+        self.assertEqual(report.invalid_tokens, ['token-expired'])
+        self.assertEqual(report.failed_tokens, ['token-1'])
+
+        expired.refresh_from_db()
+        active.refresh_from_db()
+        self.assertIsNone(expired.fcm_token)
+        self.assertEqual(active.fcm_token, 'token-0')
+        # 만료 토큰은 삭제, 일시적 실패는 실패 횟수만 증가
+        self.assertEqual(dict(DeviceToken.objects.values_list('token', 'failure_count')), {'token-0': 0, 'token-1': 1})
@@ -7,17 +7,20 @@ notifications/views/notification_views.py
 - 사용자 알림 관리 API 엔드포인트를 처리합니다.
 
 기능:
-1. 알림 히스토리 조회 (GET /notifications/)
+1. 알림 히스토리 조회 (GET /notifications/, 커서 페이지네이션: ?page_size=&cursor=)
 2. 알림 읽음 상태 변경 (PATCH /notifications/{notification_id}/)
 3. 알림 삭제 (DELETE /notifications/{notification_id}/)
+4. 안 읽은 알림 개수 조회 (GET /notifications/unread-count/)
 '''
 
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from utils.error_handlers import handle_404_not_found, handle_400_bad_request, handle_401_unauthorized
-from notifications.redis_interface import NotificationRedisInterface
+from notifications.redis_interface import NotificationRedisInterface, NOTIFICATION_PAGE_SIZE, \
+    NOTIFICATION_MAX_PAGE_SIZE
 from asgiref.sync import async_to_sync  # 추가
 
 # Redis 인터페이스 인스턴스 생성
@@ -32,27 +35,63 @@ class NotificationViewSet(viewsets.ViewSet):
     def list(self, request):
         """
         GET /notifications/
-        - 사용자별 알림 히스토리 조회
+        - 사용자별 알림 히스토리 조회 (최신순)
+        - page_size 또는 cursor를 전달하면 커서 기반 페이지 단위로 조회
         """
         user_id = request.user.id
+        if 'page_size' in request.query_params or 'cursor' in request.query_params:
+            return self._list_page(request, user_id)
+
         notifications = async_to_sync(redis_interface.get_all_notifications)(user_id)  # async 메서드를 동기 호출
-        print(f"===notifications={notifications}")
         if not notifications:
             return handle_404_not_found('Notifications of userId', user_id)
 
-        # 알림 데이터를 timestamp 기준으로 최신순 정렬
-        notifications = sorted(
-            notifications,
-            key=lambda x: x.get("timestamp", ""),
-            reverse=True  # 최신순 정렬
-        )
-
         return Response({
             "status": 200,
             "message": "Successfully retrieved notification list",
             "data": notifications
         }, status=status.HTTP_200_OK)
 
+    def _list_page(self, request, user_id):
+        """
+        GET /notifications/?page_size={page_size}&cursor={next_cursor}
+        응답 데이터: {"notifications": [...], "next_cursor": str | null, "has_next": bool, "unread_count": int}
+        """
+        try:
+            page_size = int(request.query_params.get('page_size', NOTIFICATION_PAGE_SIZE))
+        except ValueError:
+            return handle_400_bad_request('page_size must be an integer')
+        page_size = max(1, min(page_size, NOTIFICATION_MAX_PAGE_SIZE))
+
+        try:
+            notifications, next_cursor = async_to_sync(redis_interface.get_notifications_page)(
+                user_id, request.query_params.get('cursor'), page_size)
+        except ValueError:
+            return handle_400_bad_request('Invalid cursor')
+
+        return Response({
+            "status": 200,
+            "message": "Successfully retrieved notification list",
+            "data": {
+                "notifications": notifications,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+                "unread_count": async_to_sync(redis_interface.get_unread_count)(user_id),
+            }
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        """
+        GET /notifications/unread-count/
+        - 안 읽은 알림 개수 조회
+        """
+        return Response({
+            "status": 200,
+            "message": "Successfully retrieved unread notification count",
+            "data": {"unread_count": async_to_sync(redis_interface.get_unread_count)(request.user.id)}
+        }, status=status.HTTP_200_OK)
+
     def partial_update(self, request, pk=None):
         """
         PATCH /notifications/{notification_id}/
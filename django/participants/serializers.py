@@ -11,6 +11,7 @@ Django REST Framework에서 데이터의 직렬화(Serialization)와 역직렬
 - Participant 생성 / 수정 / 상세 / 자동 매칭 Serializer 구현
 '''
 from django.db.models import Sum
+from django.utils import timezone
 from rest_framework import serializers
 
 from clubs.models import ClubMember
@@ -19,6 +20,79 @@ from events.models import Event
 from participants.models import Participant, HoleScore
 
 
+class ParticipantListSerializer(serializers.ListSerializer):
+    '''
+    참가자 일괄 생성/수정 시리얼라이저 (ParticipantCreateUpdateSerializer(many=True)에서 사용)
+    명단 전체를 검증한 뒤 bulk_create / bulk_update / 한 번의 delete로 반영한다.
+    '''
+    def create(self, validated_data):
+        created = Participant.objects.bulk_create([Participant(**data) for data in validated_data])
+        return self.reload(created)
+
+    def update(self, instance, validated_data):
+        """
+        instance: 이벤트의 기존 참가자 목록, validated_data: 새 명단 (club_member 기준으로 비교)
+        - 기존 참가자: 팀/조 변경 (status_type 유지)
+        - 신규 참가자: 생성 (status_type은 기본값 PENDING)
+        - 명단에 없는 기존 참가자: 삭제
+        삭제된 참가자는 self.removed에 담긴다. (Redis 캐시 정리용)
+        """
+        existing = {participant.club_member_id: participant for participant in instance}
+        updates, to_create = [], []
+        for data in validated_data:
+            participant = existing.pop(data['club_member'].pk, None)
+            if participant is None:
+                to_create.append(Participant(**data))
+            else:
+                updates.append((participant, data))
+
+        updated = self.apply_updates(updates)
+        self.removed = list(existing.values())
+        if self.removed:
+            Participant.objects.filter(pk__in=[participant.pk for participant in self.removed]).delete()
+        created = self.reload(Participant.objects.bulk_create(to_create)) if to_create else []
+        return updated + created
+
+    @staticmethod
+    def apply_updates(updates):
+        """
+        [(participant, validated_data), ...] 를 인스턴스에 반영하고, 값이 바뀐 참가자만 bulk_update로 한 번에 저장
+        반환값: 전달된 참가자 목록 (순서 유지)
+        """
+        changed, fields = [], set()
+        for participant, data in updates:
+            changed_fields = {attr for attr, value in data.items()
+                              if attr not in ('event', 'club_member') and getattr(participant, attr) != value}
+            for attr in changed_fields:
+                setattr(participant, attr, data[attr])
+            if changed_fields:
+                participant.updated_at = timezone.now()  # bulk_update는 auto_now를 갱신하지 않음
+                changed.append(participant)
+                fields |= changed_fields
+
+        if changed:
+            Participant.objects.bulk_update(changed, [*sorted(fields), 'updated_at'])
+        return [participant for participant, _ in updates]
+
+    @staticmethod
+    def reload(participants):
+        """
+        bulk_create 결과를 (event, club_member) 기준으로 다시 조회 (MySQL은 bulk_create 후 pk를 채워주지 않음)
+        홀 점수를 prefetch하여 응답 직렬화 시 참가자별 쿼리가 발생하지 않도록 한다.
+        """
+        if not participants:
+            return []
+        saved = {
+            (participant.event_id, participant.club_member_id): participant
+            for participant in Participant.objects
+            .filter(event_id__in={p.event_id for p in participants},
+                    club_member_id__in={p.club_member_id for p in participants})
+            .prefetch_related('holescore_set')
+            .order_by('id')
+        }
+        return [saved[(participant.event_id, participant.club_member_id)] for participant in participants]
+
+
 class ParticipantCreateUpdateSerializer(serializers.ModelSerializer):
     '''
     참가자 생성 및 업데이트 시리얼라이저
@@ -41,9 +115,13 @@ class ParticipantCreateUpdateSerializer(serializers.ModelSerializer):
         model = Participant
         fields = ['participant_id', 'member_id', 'event_id',
                   'team_type', 'group_type', 'sum_score', 'rank', 'handicap_rank', 'status_type']
+        list_serializer_class = ParticipantListSerializer
 
 
     def get_sum_score(self, obj):
+        hole_scores = getattr(obj, '_prefetched_objects_cache', {}).get('holescore_set')
+        if hole_scores is not None:  # 일괄 처리 응답에서는 prefetch된 홀 점수 사용
+            return sum(hole.score for hole in hole_scores) if hole_scores else None
         total_score = HoleScore.objects.filter(participant=obj).aggregate(total=Sum('score'))['total']
 
         return total_score
@@ -62,12 +140,23 @@ class ParticipantDetailSerializer(serializers.ModelSerializer):
         model = Participant
         fields = ['participant_id', 'member', 'status_type', 'team_type', 'hole_number',
                   'group_type', 'sum_score', 'rank', 'handicap_rank', 'handicap_score']
+    @staticmethod
+    def _prefetched_hole_scores(obj):
+        # holescore_set이 prefetch된 경우 해당 리스트를, 아니면 None을 반환
+        return getattr(obj, '_prefetched_objects_cache', {}).get('holescore_set')
+
     def get_hole_number(self, obj):
         # 마지막 홀 넘버 반환
+        hole_scores = self._prefetched_hole_scores(obj)
+        if hole_scores is not None:
+            return max((hole.hole_number for hole in hole_scores), default=None)
         hole_score = HoleScore.objects.filter(participant=obj).order_by('-hole_number').first()
         return hole_score.hole_number if hole_score else None
 
     def get_sum_score(self, obj):
+        hole_scores = self._prefetched_hole_scores(obj)
+        if hole_scores is not None:
+            return sum(hole.score for hole in hole_scores) if hole_scores else None
         return HoleScore.objects.filter(participant=obj).aggregate(total=Sum('score'))['total']
 
     def get_handicap_score(self, obj):
@@ -127,6 +127,38 @@ class RedisInterface:
 
         return ParticipantRedisData(**data)
 
+    def refresh_sync_participants_in_redis(self, event_id, participants=(), removed_participant_ids=()):
+        """
+        참가자 명단 변경(일괄 추가/수정/삭제) 후 Redis에 캐싱된 참가자 정보를 파이프라인으로 갱신
+        - 캐싱된 참가자: 팀/조 정보만 갱신 (진행 중인 점수/순위는 Redis 값 유지)
+        - 삭제된 참가자: 캐시 삭제
+        캐싱되지 않은 참가자는 스코어 입력 시 MySQL에서 다시 캐싱되므로 새로 만들지 않는다.
+        """
+        participants = list(participants)
+        keys = [f'event:{event_id}:participant:{participant.pk}' for participant in participants]
+        removed_keys = [f'event:{event_id}:participant:{participant_id}' for participant_id in removed_participant_ids]
+        if not keys and not removed_keys:
+            return
+
+        try:
+            cached = []
+            if keys:
+                pipe = redis_client.pipeline(transaction=False)
+                for key in keys:
+                    pipe.exists(key)
+                cached = pipe.execute()
+
+            pipe = redis_client.pipeline(transaction=False)
+            for key, participant, is_cached in zip(keys, participants, cached):
+                if is_cached:
+                    pipe.hset(key, mapping={'group_type': str(participant.group_type),
+                                            'team_type': participant.team_type})
+            if removed_keys:
+                pipe.delete(*removed_keys)
+            pipe.execute()
+        except redis.RedisError as e:
+            logging.warning(f"[{event_id}] Redis 참가자 캐시 갱신 실패: {e}")
+
     async def get_participant_from_redis(self, event_id, participant_id):
         if event_id is None:
             # Redis에서 해당 participant_id에 해당하는 모든 키 탐색
@@ -7,7 +7,7 @@ from celery import shared_task
 # from participants.stroke.mysql_interface import MySQLInterfaceSync
 from events.models import Event
 from participants.models import HoleScore, Participant
-from participants.stroke.data_class import EventData, ParticipantUpdateData
+from participants.stroke.data_class import ParticipantUpdateData
 
 
 
@@ -129,26 +129,14 @@ class MigrationMySQLInterface:
             print(f"event:{event_id} 키가 존재하지 않습니다. 팀 게임이 아닙니다.")
             return
         
-        event_data_dict = self.redis_client.hgetall(event_key)
-
-        # EventData 객체 생성
-        event_data = EventData(
-            group_win_team=event_data_dict.get("group_win_team"),
-            group_win_team_handicap=event_data_dict.get("group_win_team_handicap"),
-            total_win_team=event_data_dict.get("total_win_team"),
-            total_win_team_handicap=event_data_dict.get("total_win_team_handicap")
-        )
-
-        self.update_event_data_in_db(event_id, event_data)
+        # 승리 팀은 redis 값을 복사하지 않고, 동기화된 참가자 점수로 팀전 점수 합계/조별 승리 수와 함께
+        # 한 번에 계산하여 저장한다. (결과를 정하는 곳을 calculate_team_results 하나로 유지)
+        Event.objects.get(id=event_id).calculate_team_results()
         print('transfer_event_data_to_db 실행종료')
 
     def update_participant_in_db(self, participant_id, participant_data):
         Participant.objects.filter(id=participant_id).update(**asdict(participant_data))
     
-    def update_event_data_in_db(self, event_id, event_data):
-    # 이벤트 데이터 업데이트
-        Event.objects.filter(id=event_id).update(**asdict(event_data))
-
     def update_or_create_hole_score_in_db(self, participant_id, hole_number, score):
         HoleScore.objects.update_or_create(
             participant_id=participant_id,
@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from clubs.models import Club, ClubMember
 from events.models import Event
@@ -65,3 +68,115 @@ class ParticipantPointCalculationTest(TestCase):
 
             self.assertEqual(participant.points, expected_point,
                              f"Participant: {participant.club_member.user.email}, Expected: {expected_point}, Got: {participant.points}")
+
+
+class ScoreAnalyticsTest(TestCase):
+
+    def setUp(self):
+        """
+        18홀 기록이 있는 라운드 3개를 생성합니다. (모든 홀 파 4, 라운드마다 1타씩 개선)
+        """
+        from golf_data.models import GolfClub, GolfCourse, Tee
+        from participants.models import HoleScore
+
+        self.user = User.objects.create_user(email='analytics@example.com', user_id='analytics', password='test123')
+        self.club = Club.objects.create(name='Analytics Club')
+        self.member = ClubMember.objects.create(user=self.user, club=self.club)
+
+        golf_club = GolfClub.objects.create(club_name='Analytics CC', address='Seoul')
+        course = GolfCourse.objects.create(club=golf_club, course_name='East')
+        Tee.objects.create(course=course, tee_name='White', **{f'hole_{i}_par': '4' for i in range(1, 19)})
+
+        for round_number in range(3):
+            event = Event.objects.create(club=self.club, event_title=f'Round {round_number}', golf_course=course,
+                                         start_date_time=timezone.now() - timedelta(days=3 - round_number))
+            participant = Participant.objects.create(club_member=self.member, event=event,
+                                                     group_type=Participant.GroupType.GROUP1)
+            HoleScore.objects.bulk_create([
+                HoleScore(participant=participant, hole_number=hole, score=5 if hole <= 3 - round_number else 4)
+                for hole in range(1, 19)
+            ])
+
+    def test_calculate_score_analytics(self):
+        """
+        파별 평균, 이동 평균, 핸디캡 추세가 올바르게 계산되는지 테스트합니다.
+        """
+        from participants.utils.statistics import calculate_score_analytics
+
+        data, error = calculate_score_analytics(self.user, window=2)
+
+        self.assertIsNone(error)
+        self.assertEqual(data['complete_rounds'], 3)
+        self.assertEqual(sorted(data['handicap_trend']['differentials']), [1.0, 2.0, 3.0])
+        self.assertEqual(data['par_averages']['par_4']['holes_played'], 54)
+        self.assertEqual(len(data['rolling_averages']), 2)
+
+
+class HandicapIndexCalculationTest(TestCase):
+
+    def setUp(self):
+        """
+        파 4 x 18홀 코스에서 두 멤버의 라운드 기록을 생성합니다.
+        - member1 (핸디캡 0): 디퍼렌셜 3(1번 홀 10타는 더블보기 6타로 조정), 5, 7, 9, 11, 4
+        - member2 (핸디캡 18, 기존 인덱스 54): 1번 홀 10타, 2번 홀 5타 라운드 3개
+        """
+        from golf_data.models import GolfClub, GolfCourse, Tee
+
+        golf_club = GolfClub.objects.create(club_name='Handicap CC', address='Seoul')
+        self.course = GolfCourse.objects.create(club=golf_club, course_name='West')
+        Tee.objects.create(course=self.course, tee_name='White',
+                           **{f'hole_{i}_par': '4' for i in range(1, 19)},
+                           **{f'hole_{i}_handicap': str(i) for i in range(1, 19)})
+
+        self.club = Club.objects.create(name='Handicap Club')
+        user1 = User.objects.create_user(email='hc1@example.com', user_id='hc1', password='test123', handicap=0)
+        user2 = User.objects.create_user(email='hc2@example.com', user_id='hc2', password='test123', handicap=18)
+        self.member1 = ClubMember.objects.create(user=user1, club=self.club)
+        self.member2 = ClubMember.objects.create(user=user2, club=self.club, handicap_index=54)
+
+        blow_up = {1: 10, 2: 5}
+        for days_ago, extra in enumerate([None, 5, 7, 9, 11, 4]):
+            scores = blow_up if extra is None else {hole: 5 for hole in range(1, extra + 1)}
+            self.create_round(self.member1, days_ago, scores)
+        for days_ago in range(3):
+            self.create_round(self.member2, days_ago, blow_up)
+
+    def create_round(self, member, days_ago, scores):
+        from participants.models import HoleScore
+
+        event = Event.objects.create(club=self.club, event_title=f'Round {days_ago}', golf_course=self.course,
+                                     start_date_time=timezone.now() - timedelta(days=days_ago))
+        participant = Participant.objects.create(club_member=member, event=event, status_type='ACCEPT',
+                                                 group_type=Participant.GroupType.GROUP1)
+        HoleScore.objects.bulk_create([
+            HoleScore(participant=participant, hole_number=hole, score=scores.get(hole, 4))
+            for hole in range(1, 19)
+        ])
+
+    def test_calculate_handicap_indexes(self):
+        """
+        네트 더블보기 상한, 베스트 N 평균과 보정값이 올바르게 적용되는지 테스트합니다.
+        """
+        from participants.utils.handicap import calculate_handicap_indexes
+
+        results = calculate_handicap_indexes(self.club)
+
+        # 6라운드: 베스트 2개(3, 4) 평균 3.5 - 1
+        self.assertEqual(results[self.member1.id],
+                         {'handicap_index': 2.5, 'rounds_used': 6, 'differentials_used': 2})
+        # 3라운드: 사용자 핸디캡 18 기준 상한(파 + 3) → 디퍼렌셜 4, 베스트 1개 - 2 (기존 인덱스 54는 상한에 쓰지 않음)
+        self.assertEqual(results[self.member2.id],
+                         {'handicap_index': 2.0, 'rounds_used': 3, 'differentials_used': 1})
+
+    def test_history_only_on_change(self):
+        """
+        인덱스가 바뀐 멤버만 이력을 남기는지 테스트합니다.
+        """
+        from clubs.models import HandicapIndexHistory
+
+        ClubMember.calculate_handicap_indexes(self.club)
+        ClubMember.calculate_handicap_indexes(self.club)
+
+        self.member1.refresh_from_db()
+        self.assertEqual(self.member1.handicap_index, 2.5)
+        self.assertEqual(HandicapIndexHistory.objects.filter(club_member__club=self.club).count(), 2)
@@ -0,0 +1,153 @@
+'''
+MVP demo ver 0.0.9
+2026.10.19
+participants/utils/handicap.py
+
+역할: 라운드 기록(HoleScore)과 코스 티 정보(Tee)를 기반으로 핸디캡 인덱스를 일괄 계산
+- 홀별 파/핸디캡(난이도) 정보로 네트 더블보기 상한을 적용한 조정 스코어 계산
+  (상한의 받는 타수는 사용자가 입력한 핸디캡 기준 - 계산 결과인 인덱스를 다시 쓰면 결과가 자기 자신에게 영향을 줌)
+- 라운드별 스코어 디퍼렌셜(조정 스코어 - 코스 파) 계산
+- 최근 M 라운드 중 베스트 N 평균으로 핸디캡 인덱스 계산 (모임 단위, NumPy 벡터 연산)
+'''
+import numpy as np
+
+HOLE_COUNT = 18
+HANDICAP_ROUND_WINDOW = 20   # 최근 M 라운드
+MIN_ROUNDS = 3               # 인덱스를 계산하기 위한 최소 라운드 수
+MAX_HANDICAP_INDEX = 54.0
+
+# 라운드 수(0~20)별 사용할 베스트 디퍼렌셜 개수와 보정값 (World Handicap System 기준)
+BEST_DIFFERENTIAL_COUNT = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 6, 6, 7, 8])
+DIFFERENTIAL_ADJUSTMENT = np.array([0, 0, 0, -2, -1, 0, -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], dtype=float)
+
+
+def _to_number(value):
+    """
+    Tee의 CharField 값을 숫자로 변환. 값이 없거나 0이면 NaN
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return number if number > 0 else np.nan
+
+
+def load_course_tee_data(course_ids):
+    """
+    코스별 18홀 파/홀 핸디캡 배열을 반환한다. ({course_id: (pars, hole_handicaps)})
+    같은 코스의 티는 파와 홀 핸디캡이 동일하므로 코스당 첫 번째 티만 사용한다.
+    """
+    from golf_data.models import Tee  # 지연 import
+
+    par_fields = [f'hole_{i}_par' for i in range(1, HOLE_COUNT + 1)]
+    handicap_fields = [f'hole_{i}_handicap' for i in range(1, HOLE_COUNT + 1)]
+
+    tee_data = {}
+    tees = (Tee.objects.filter(course_id__in=course_ids)
+            .order_by('course_id', 'id')
+            .values('course_id', *par_fields, *handicap_fields))
+    for row in tees:
+        if row['course_id'] in tee_data:
+            continue
+        pars = np.array([_to_number(row[field]) for field in par_fields])
+        hole_handicaps = np.array([_to_number(row[field]) for field in handicap_fields])
+        if np.isnan(hole_handicaps).any():  # 홀 핸디캡 정보가 없으면 홀 순서대로 난이도를 부여
+            hole_handicaps = np.arange(1, HOLE_COUNT + 1, dtype=float)
+        tee_data[row['course_id']] = (pars, hole_handicaps)
+    return tee_data
+
+
+def calculate_handicap_indexes(club):
+    """
+    모임 멤버 전체의 핸디캡 인덱스를 한 번에 계산한다.
+    반환값: {club_member_id: {'handicap_index': float, 'rounds_used': int, 'differentials_used': int}}
+    최소 라운드 수(MIN_ROUNDS)를 채우지 못한 멤버는 결과에 포함되지 않는다.
+    """
+    from clubs.models import ClubMember  # 지연 import
+    from participants.models import HoleScore
+
+    # 1. 멤버별 네트 더블보기 상한에 사용할 핸디캡 (사용자가 입력한 핸디캡)
+    user_handicaps = dict(ClubMember.objects.filter(club=club).values_list('id', 'user__handicap'))
+    if not user_handicaps:
+        return {}
+
+    # 2. 모임 전체의 홀별 기록을 한 번의 쿼리로 가져온다. (멤버별 최신 라운드 순)
+    rows = list(
+        HoleScore.objects
+        .filter(participant__club_member__club=club,
+                participant__status_type__in=['ACCEPT', 'PARTY'],
+                participant__event__golf_course__isnull=False,
+                hole_number__gte=1, hole_number__lte=HOLE_COUNT)
+        .order_by('participant__club_member_id', '-participant__event__start_date_time', 'participant_id')
+        .values_list('participant_id', 'participant__club_member_id', 'participant__event__golf_course_id',
+                     'hole_number', 'score')
+    )
+    if not rows:
+        return {}
+
+    columns = np.array(rows, dtype=object)
+    participant_ids = columns[:, 0].astype(np.int64)
+    hole_index = columns[:, 3].astype(np.int64) - 1
+    scores = columns[:, 4].astype(float)
+
+    # 3. 라운드 x 18홀 행렬 구성 (쿼리 순서 유지)
+    round_ids, first_index = np.unique(participant_ids, return_index=True)
+    order = np.argsort(first_index)
+    round_ids, first_index = round_ids[order], first_index[order]
+    row_of = {participant_id: row for row, participant_id in enumerate(round_ids)}
+    row_position = np.fromiter((row_of[participant_id] for participant_id in participant_ids),
+                               dtype=np.int64, count=participant_ids.size)
+
+    score_matrix = np.full((round_ids.size, HOLE_COUNT), np.nan)
+    score_matrix[row_position, hole_index] = scores
+
+    round_members = columns[first_index, 1].astype(np.int64)
+    round_courses = columns[first_index, 2].astype(np.int64)
+
+    tee_data = load_course_tee_data(set(round_courses.tolist()))
+    empty = (np.full(HOLE_COUNT, np.nan), np.arange(1, HOLE_COUNT + 1, dtype=float))
+    par_matrix = np.vstack([tee_data.get(course_id, empty)[0] for course_id in round_courses])
+    hole_handicap_matrix = np.vstack([tee_data.get(course_id, empty)[1] for course_id in round_courses])
+
+    # 18홀 점수와 파 정보가 모두 있는 라운드만 사용
+    valid = ~np.isnan(score_matrix).any(axis=1) & ~np.isnan(par_matrix).any(axis=1)
+    score_matrix, par_matrix = score_matrix[valid], par_matrix[valid]
+    hole_handicap_matrix, round_members = hole_handicap_matrix[valid], round_members[valid]
+    if not round_members.size:
+        return {}
+
+    # 4. 네트 더블보기(파 + 2 + 받는 타수) 상한을 적용한 조정 스코어와 디퍼렌셜
+    course_handicaps = np.clip(
+        np.rint([user_handicaps.get(member_id, 0) or 0 for member_id in round_members]), 0, MAX_HANDICAP_INDEX
+    ).astype(np.int64)
+    strokes_received = (course_handicaps // HOLE_COUNT)[:, None] + \
+                       (hole_handicap_matrix <= (course_handicaps % HOLE_COUNT)[:, None])
+    adjusted_scores = np.minimum(score_matrix, par_matrix + 2 + strokes_received)
+    differentials = adjusted_scores.sum(axis=1) - par_matrix.sum(axis=1)
+
+    # 5. 멤버 x 최근 M 라운드 디퍼렌셜 행렬 (라운드는 이미 멤버별 최신순으로 정렬되어 있음)
+    member_ids, member_start, member_position = np.unique(round_members, return_index=True, return_inverse=True)
+    recency = np.arange(round_members.size) - member_start[member_position]
+    recent = recency < HANDICAP_ROUND_WINDOW
+
+    differential_matrix = np.full((member_ids.size, HANDICAP_ROUND_WINDOW), np.nan)
+    differential_matrix[member_position[recent], recency[recent]] = differentials[recent]
+
+    # 6. 베스트 N 평균 (NaN은 정렬 시 뒤로 밀림)
+    rounds_used = (~np.isnan(differential_matrix)).sum(axis=1)
+    best_counts = BEST_DIFFERENTIAL_COUNT[rounds_used]
+    sorted_differentials = np.sort(differential_matrix, axis=1)
+    best_mask = np.arange(HANDICAP_ROUND_WINDOW)[None, :] < best_counts[:, None]
+    best_sums = np.where(best_mask, sorted_differentials, 0).sum(axis=1)
+    averages = np.divide(best_sums, best_counts, out=np.zeros(member_ids.size), where=best_counts > 0)
+    indexes = np.clip(np.round(averages + DIFFERENTIAL_ADJUSTMENT[rounds_used], 1), None, MAX_HANDICAP_INDEX)
+
+    return {
+        int(member_id): {
+            'handicap_index': float(index),
+            'rounds_used': int(used),
+            'differentials_used': int(best),
+        }
+        for member_id, index, used, best in zip(member_ids, indexes, rounds_used, best_counts)
+        if used >= MIN_ROUNDS
+    }
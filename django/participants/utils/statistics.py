@@ -5,10 +5,18 @@ participants/utils/statistics.py
 
 역할: 참가자의 개인 통계를 구할 때의 공통 기능 함수
 - 평균 스코어 계산, 베스트 스코어, 핸디캡 적용 베스트 스코어, 총 라운드 수 계산
+- 홀별 전체 기록 기반 스코어 분포/추세 분석 (NumPy 벡터 연산)
 '''
 
 from datetime import timedelta
-from django.db.models import Avg, Min
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Avg, Count, Max, Min, Sum
+
+HOLE_COUNT = 18
+ANALYTICS_CACHE_TIMEOUT = 60 * 60 * 24  # 하루 (키에 마지막 이벤트 시각이 포함되므로 길게 잡아도 됨)
+ANALYTICS_PERCENTILES = (10, 25, 50, 75, 90)
 
 def calculate_statistics(participants, start_date=None, end_date=None, year=None):
     """
@@ -51,4 +59,177 @@ def calculate_statistics(participants, start_date=None, end_date=None, year=None
         "games_played": games_played
     } )
 
-    return data, None
\ No newline at end of file
+    return data, None
+
+
+def _to_par(value):
+    """
+    Tee의 홀 파 값(CharField)을 숫자로 변환. 값이 없거나 0이면 NaN
+    """
+    try:
+        par = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return par if par > 0 else np.nan
+
+
+def _load_course_pars(course_ids):
+    """
+    코스별 18홀 파 배열을 반환한다. ({course_id: np.ndarray(18)})
+    같은 코스의 티는 파가 동일하므로 코스당 첫 번째 티만 사용한다.
+    """
+    from golf_data.models import Tee  # 지연 import
+
+    par_fields = [f'hole_{i}_par' for i in range(1, HOLE_COUNT + 1)]
+    course_pars = {}
+    for row in Tee.objects.filter(course_id__in=course_ids).order_by('course_id', 'id').values('course_id', *par_fields):
+        if row['course_id'] not in course_pars:
+            course_pars[row['course_id']] = np.array([_to_par(row[field]) for field in par_fields])
+    return course_pars
+
+
+def _rolling_mean(values, window):
+    """
+    라운드 점수의 이동 평균. 라운드 수가 window보다 적으면 빈 리스트를 반환
+    """
+    if window <= 0 or len(values) < window:
+        return []
+    return np.convolve(values, np.ones(window) / window, mode='valid')
+
+
+def _round_list(values, ndigits=1):
+    return [None if np.isnan(v) else round(float(v), ndigits) for v in values]
+
+
+def _nan_to_none(value, ndigits=1):
+    return None if value is None or np.isnan(value) else round(float(value), ndigits)
+
+
+def get_analytics_cache_key(user):
+    """
+    사용자의 마지막 이벤트 시각, 홀 점수 개수/합계로 캐시 키를 만든다.
+    새 라운드가 추가되거나 점수가 입력/수정되면 키가 바뀌므로 별도 무효화가 필요 없다.
+    """
+    from participants.models import Participant  # 지연 import
+
+    summary = Participant.objects.filter(club_member__user=user).aggregate(
+        last_event=Max('event__start_date_time'),
+        hole_count=Count('holescore'),
+        score_sum=Sum('holescore__score'),
+    )
+    last_event = summary['last_event'].isoformat() if summary['last_event'] else 'none'
+    return f"statistics:analytics:{user.id}:{last_event}:{summary['hole_count']}:{summary['score_sum'] or 0}"
+
+
+def calculate_score_analytics(user, window=5):
+    """
+    사용자의 전체 홀별 기록을 한 번에 불러와 NumPy 배열로 스코어 분포와 추세를 계산한다.
+    - 파(3/4/5)별 평균 타수, 전반/후반 평균, 이동 평균, 백분위, 핸디캡(파 대비 타수) 추세
+    결과는 사용자의 마지막 이벤트 시각 기준으로 캐싱한다.
+    에러 발생 시 None과 에러 메시지를 반환
+    """
+    cache_key = f"{get_analytics_cache_key(user)}:{window}"
+    data = cache.get(cache_key)
+    if data is not None:
+        return data, None
+
+    data = _build_score_analytics(user, window)
+    if data is None:
+        return None, ('participant data', 'for the user')
+
+    cache.set(cache_key, data, timeout=ANALYTICS_CACHE_TIMEOUT)
+    return data, None
+
+
+def _build_score_analytics(user, window):
+    """
+    홀별 기록으로 라운드 x 18홀 행렬을 만들어 분석 데이터를 계산. 기록이 없으면 None
+    """
+    from participants.models import HoleScore  # 지연 import
+
+    # 1. 홀별 기록을 한 번의 쿼리로 가져온다. (이벤트 시작 시간 순)
+    rows = list(
+        HoleScore.objects
+        .filter(participant__club_member__user=user, hole_number__gte=1, hole_number__lte=HOLE_COUNT)
+        .order_by('participant__event__start_date_time', 'participant_id')
+        .values_list('participant_id', 'participant__event__golf_course_id', 'hole_number', 'score')
+    )
+    if not rows:
+        return None
+
+    participant_ids = np.array([row[0] for row in rows])
+    hole_index = np.array([row[2] for row in rows]) - 1
+    scores = np.array([row[3] for row in rows], dtype=float)
+
+    # 2. 라운드 x 18홀 점수 행렬 (입력되지 않은 홀은 NaN)
+    round_ids, round_index = np.unique(participant_ids, return_index=True)
+    round_ids = round_ids[np.argsort(round_index)]          # 처음 등장한 순서 = 이벤트 시작 시간 순
+    id_to_row = {participant_id: row for row, participant_id in enumerate(round_ids)}
+    row_position = np.array([id_to_row[participant_id] for participant_id in participant_ids])
+
+    score_matrix = np.full((round_ids.size, HOLE_COUNT), np.nan)
+    score_matrix[row_position, hole_index] = scores
+
+    # 3. 라운드 x 18홀 파 행렬 (코스 정보가 없으면 NaN)
+    course_of_round = {}
+    for participant_id, course_id, _, _ in rows:
+        course_of_round.setdefault(participant_id, course_id)
+    course_pars = _load_course_pars({course_id for course_id in course_of_round.values() if course_id})
+    empty_pars = np.full(HOLE_COUNT, np.nan)
+    par_matrix = np.vstack([course_pars.get(course_of_round[participant_id], empty_pars) for participant_id in round_ids])
+
+    played = ~np.isnan(score_matrix)
+    complete = played.all(axis=1)                           # 18홀을 모두 입력한 라운드
+    front_complete = played[:, :9].all(axis=1)
+    back_complete = played[:, 9:].all(axis=1)
+
+    # 4. 파별 평균 타수
+    par_averages = {}
+    for par in (3, 4, 5):
+        mask = played & (par_matrix == par)
+        if mask.any():
+            par_average = score_matrix[mask].mean()
+            par_averages[f'par_{par}'] = {
+                'average_score': round(float(par_average), 2),
+                'average_over_par': round(float(par_average - par), 2),
+                'holes_played': int(mask.sum()),
+            }
+
+    # 5. 전반/후반 평균
+    front_totals = np.nansum(score_matrix[:, :9], axis=1)
+    back_totals = np.nansum(score_matrix[:, 9:], axis=1)
+    front_average = front_totals[front_complete].mean() if front_complete.any() else np.nan
+    back_average = back_totals[back_complete].mean() if back_complete.any() else np.nan
+
+    # 6. 18홀 완료 라운드 기준 이동 평균/백분위
+    totals = score_matrix[complete].sum(axis=1)
+    percentiles = np.percentile(totals, ANALYTICS_PERCENTILES) if totals.size else []
+
+    # 7. 핸디캡 추세: 라운드별 (타수 - 코스 파) 차이의 선형 추세 (라운드당 변화량)
+    course_par_totals = par_matrix[complete].sum(axis=1)
+    differentials = totals - course_par_totals
+    differentials = differentials[~np.isnan(differentials)]
+    trend_slope = np.polyfit(np.arange(differentials.size), differentials, 1)[0] if differentials.size >= 2 else np.nan
+
+    # 8. 홀별 평균 타수
+    hole_counts = played.sum(axis=0)
+    hole_sums = np.nansum(score_matrix, axis=0)
+    hole_averages = np.divide(hole_sums, hole_counts, out=np.full(HOLE_COUNT, np.nan), where=hole_counts > 0)
+
+    return {
+        'rounds_played': int(round_ids.size),
+        'complete_rounds': int(complete.sum()),
+        'average_score': _nan_to_none(totals.mean() if totals.size else np.nan),
+        'hole_averages': _round_list(hole_averages, 2),
+        'par_averages': par_averages,
+        'front_nine_average': _nan_to_none(front_average),
+        'back_nine_average': _nan_to_none(back_average),
+        'rolling_window': window,
+        'rolling_averages': _round_list(_rolling_mean(totals, window)),
+        'percentiles': {f'p{p}': round(float(v), 1) for p, v in zip(ANALYTICS_PERCENTILES, percentiles)},
+        'handicap_trend': {
+            'differentials': _round_list(differentials),
+            'latest_differential': _nan_to_none(differentials[-1] if differentials.size else np.nan),
+            'slope_per_round': _nan_to_none(trend_slope, 3),
+        },
+    }
@@ -18,6 +18,7 @@ from rest_framework.response import Response
 from rest_framework import viewsets
 from rest_framework.decorators import action
 
+from events.utils import EventUtils
 from participants.models import HoleScore, Participant
 from participants.serializers import ParticipantCreateUpdateSerializer
 from utils.error_handlers import handle_400_bad_request, handle_404_not_found, handle_401_unauthorized
@@ -47,6 +48,9 @@ class ParticipantViewSet(viewsets.ModelViewSet, RedisInterface, MySQLInterface):
             participant.status_type = status_type   # 상태 타입 업데이트
             participant.save()
 
+            # 이벤트 달 캘린더 캐시 무효화 (참석 여부 필터는 이벤트 기준이므로 모든 참가자 대상)
+            EventUtils.invalidate_calendar_cache(*EventUtils.get_calendar_targets(participant.event))
+
             serializer = ParticipantCreateUpdateSerializer(participant)
 
             response_data = {
@@ -5,6 +5,7 @@ participants/views/statistics_view.py
 
 역할: Django Rest Framework(DRF)를 사용하여 참가자의 개인 통계 API 엔드포인트의 로직을 처리
 - 전체 통계, 연도별 통계, 기간별 통계
+- 스코어 분석(파별 평균, 전반/후반, 이동 평균, 백분위, 핸디캡 추세)
 - 전체 참가자 포인트 일괄 계산(points, total_points 업데이트)
 '''
 from datetime import datetime, timedelta
@@ -17,7 +18,7 @@ from rest_framework import viewsets
 
 from participants.models import Participant
 from participants.serializers import ParticipantEventStatisticsSerializer
-from participants.utils.statistics import calculate_statistics
+from participants.utils.statistics import calculate_statistics, calculate_score_analytics
 from events.models import Event
 from clubs.models import ClubMember
 
@@ -44,6 +45,7 @@ class StatisticsViewSet(viewsets.ViewSet):
                     "overall": "GET /participants/statistics/overall/",
                     "yearly": "GET /participants/statistics/yearly/{year}/",
                     "period": "GET /participants/statistics/period/?start_date={start_date}&end_date={end_date}",
+                    "analytics": "GET /participants/statistics/analytics/?window={window}",
                     "ranks": "GET /clubs/statistics/ranks/?club_id={club_id}",
                 }
             }
@@ -135,6 +137,32 @@ class StatisticsViewSet(viewsets.ViewSet):
             "data": data
         }, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['get'], url_path='analytics')
+    def score_analytics(self, request):
+        '''
+        스코어 분석 조회
+        GET /participants/statistics/analytics/?window={window}
+        window: 이동 평균에 사용할 라운드 수 (기본값 5)
+        '''
+        window = request.query_params.get('window', 5)
+        try:
+            window = int(window)
+        except (TypeError, ValueError):
+            return handle_400_bad_request("window must be a positive integer.")
+        if window <= 0:
+            return handle_400_bad_request("window must be a positive integer.")
+
+        data, error = calculate_score_analytics(request.user, window=window)
+        if error:
+            model_name, pk = error
+            return handle_404_not_found(model_name, pk)
+
+        return Response({
+            "status": status.HTTP_200_OK,
+            "message": "Successfully retrieved score analytics",
+            "data": data
+        }, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['post'], url_path='calculate-points')
     def calculate_points(self, request, pk=None):
         """
@@ -0,0 +1,59 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+utils/conditional_response.py
+
+기능: 조회 API의 조건부 GET(ETag / Last-Modified) 공통 처리
+- 가벼운 집계 쿼리(max(updated_at), count 등)로 만든 검증값으로 ETag와 Last-Modified를 생성
+- If-None-Match / If-Modified-Since 요청 헤더와 비교하여 직렬화 전에 304 응답을 반환
+'''
+import hashlib
+
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """
+    검증값 목록으로 weak ETag를 생성
+    응답 본문이 아니라 데이터 상태(수정 시각, 개수, 합계 등)로 만들기 때문에 weak ETag를 사용
+    """
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def get_not_modified_response(request, etag, last_modified=None):
+    """
+    요청의 조건부 헤더가 현재 검증값과 일치하면 304 응답을, 아니면 None을 반환
+    If-None-Match가 있으면 If-Modified-Since보다 우선한다. (RFC 9110)
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        matched = '*' in etags or _strip_weak(etag) in {_strip_weak(tag) for tag in etags}
+    else:
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if_modified_since = parse_http_date_safe(if_modified_since) if if_modified_since else None
+        matched = (if_modified_since is not None and last_modified is not None
+                   and int(last_modified.timestamp()) <= if_modified_since)
+
+    if not matched:
+        return None
+    return set_validator_headers(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+
+def set_validator_headers(response, etag, last_modified=None):
+    """
+    응답에 ETag, Last-Modified 헤더를 설정하여 반환
+    클라이언트가 다음 요청에서 조건부 헤더로 보낼 수 있도록 캐시 재검증(no-cache)을 지정
+    """
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    response['Cache-Control'] = 'private, no-cache'
+    return response
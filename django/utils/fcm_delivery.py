@@ -0,0 +1,158 @@
+'''
+MVP demo ver 0.1.0
+2026.10.19
+utils/fcm_delivery.py
+
+역할: FCM 푸시 알림 일괄 전송 엔진
+- 토큰을 멀티캐스트 배치(최대 500개) 단위로 나누고, 배치를 제한된 개수의 스레드로 동시에 전송
+- 토큰별 응답을 확인하여 더 이상 유효하지 않은 토큰은 삭제하고, 일시적인 실패는 기기 토큰(DeviceToken)의 실패 횟수에 기록
+- 전송 방식(transport)은 교체 가능: 기본은 Firebase, 테스트/로컬 환경에서는 LocalTransport 사용
+  (settings.FCM_TRANSPORT에 클래스 경로를 지정하면 기본 transport를 바꿀 수 있음)
+'''
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+FCM_MULTICAST_BATCH_SIZE = 500   # FCM 멀티캐스트 한 번에 보낼 수 있는 최대 토큰 수
+FCM_MAX_PARALLEL_BATCHES = 4     # 동시에 전송할 최대 배치 수
+DEFAULT_FCM_TRANSPORT = 'utils.fcm_delivery.FirebaseTransport'
+
+
+@dataclass
+class DeliveryResult:
+    token: str
+    success: bool
+    error: Optional[str] = None
+    invalid_token: bool = False   # 앱 삭제/토큰 만료 등으로 더 이상 사용할 수 없는 토큰
+    batch_error: bool = False     # 배치 전체가 실패한 경우 (토큰 자체의 문제가 아니므로 실패 횟수에 반영하지 않음)
+
+
+@dataclass
+class DeliveryReport:
+    success_count: int = 0
+    failure_count: int = 0
+    invalid_tokens: list = field(default_factory=list)
+    failed_tokens: list = field(default_factory=list)   # 토큰별 일시적 실패
+
+
+class FirebaseTransport:
+    """
+    firebase_admin의 send_each_for_multicast로 배치를 전송하는 transport
+    """
+
+    def send_batch(self, tokens, title, body, data):
+        from firebase_admin import messaging  # 지연 import (firebase 앱 초기화는 utils.push_fcm_notification에서 수행)
+
+        message = messaging.MulticastMessage(
+            tokens=tokens,
+            data=data,
+            notification=messaging.Notification(title=title, body=body),
+        )
+        response = messaging.send_each_for_multicast(message)
+
+        invalid_errors = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+        return [
+            DeliveryResult(
+                token=token,
+                success=result.success,
+                error=None if result.success else str(result.exception),
+                invalid_token=isinstance(result.exception, invalid_errors),
+            )
+            for token, result in zip(tokens, response.responses)
+        ]
+
+
+class LocalTransport:
+    """
+    실제로 전송하지 않고 전송 내역을 기록하는 transport (테스트/로컬 환경용)
+    invalid_tokens에 포함된 토큰은 만료된 토큰으로, failing_tokens에 포함된 토큰은 일시적 실패로 응답한다.
+    """
+
+    def __init__(self, invalid_tokens=(), failing_tokens=()):
+        self.invalid_tokens = set(invalid_tokens)
+        self.failing_tokens = set(failing_tokens)
+        self.sent = []   # [(tokens, title, body, data), ...]
+
+    def send_batch(self, tokens, title, body, data):
+        self.sent.append((list(tokens), title, body, data))
+        return [self._result(token) for token in tokens]
+
+    def _result(self, token):
+        if token in self.invalid_tokens:
+            return DeliveryResult(token=token, success=False, error='unregistered', invalid_token=True)
+        if token in self.failing_tokens:
+            return DeliveryResult(token=token, success=False, error='unavailable')
+        return DeliveryResult(token=token, success=True)
+
+
+def get_default_transport():
+    return import_string(getattr(settings, 'FCM_TRANSPORT', DEFAULT_FCM_TRANSPORT))()
+
+
+class FCMDeliveryEngine:
+    """
+    FCM 일괄 전송 엔진
+    """
+
+    def __init__(self, transport=None, batch_size=FCM_MULTICAST_BATCH_SIZE, max_parallel=FCM_MAX_PARALLEL_BATCHES,
+                 prune_invalid_tokens=True):
+        self.transport = transport or get_default_transport()
+        self.batch_size = batch_size
+        self.max_parallel = max_parallel
+        self.prune_invalid_tokens = prune_invalid_tokens
+
+    def send(self, tokens, title, body, data=None):
+        """
+        토큰 목록에 같은 알림을 전송하고 결과 요약(DeliveryReport)을 반환
+        중복/빈 토큰은 제외하고, 전송 후 만료 토큰 삭제/실패 횟수 기록을 토큰 목록 단위 쿼리로 처리한다.
+        """
+        tokens = list(dict.fromkeys(token for token in tokens if token))
+        report = DeliveryReport()
+        if not tokens:
+            return report
+
+        data = {key: str(value) for key, value in (data or {}).items()}  # FCM data는 문자열만 허용
+        batches = [tokens[i:i + self.batch_size] for i in range(0, len(tokens), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel, len(batches))) as executor:
+            batch_results = list(executor.map(lambda batch: self._send_batch(batch, title, body, data), batches))
+
+        for results in batch_results:
+            for result in results:
+                if result.success:
+                    report.success_count += 1
+                else:
+                    report.failure_count += 1
+                    if result.invalid_token:
+                        report.invalid_tokens.append(result.token)
+                    elif not result.batch_error:
+                        report.failed_tokens.append(result.token)
+
+        if self.prune_invalid_tokens:
+            self._update_token_health(report)
+
+        logger.info(f"FCM 전송 완료: 성공 {report.success_count}, 실패 {report.failure_count}, "
+                    f"만료 토큰 {len(report.invalid_tokens)} (배치 {len(batches)}개)")
+        return report
+
+    def _send_batch(self, tokens, title, body, data):
+        try:
+            return self.transport.send_batch(tokens, title, body, data)
+        except Exception as e:  # 배치 전체 실패 (네트워크 오류 등)
+            logger.error(f"FCM 배치 전송 실패 (토큰 {len(tokens)}개): {e}")
+            return [DeliveryResult(token=token, success=False, error=str(e), batch_error=True) for token in tokens]
+
+    @staticmethod
+    def _update_token_health(report):
+        from accounts.models import DeviceToken  # 지연 import
+
+        if report.invalid_tokens:
+            pruned = DeviceToken.objects.retire(report.invalid_tokens)
+            logger.info(f"만료된 FCM 토큰 {pruned}개 제거")
+        if report.failed_tokens:
+            DeviceToken.objects.record_failures(report.failed_tokens)
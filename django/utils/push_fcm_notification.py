@@ -1,13 +1,20 @@
 # utils/push_fcm_notification.py
+import json
 import os
+import time
 
 import firebase_admin
-from firebase_admin import credentials, messaging
+from firebase_admin import credentials
 import logging
 
+from django.db.models import FilteredRelation, Q
+
+from accounts.models import DeviceToken
+from accounts.redis_interface import club_token_cache
+from chat.redis_interface import chat_push_queue, chat_recipient_cache
 from clubs.models import ClubMember
 from golbang.settings import BASE_DIR
-from participants.models import Participant
+from utils.fcm_delivery import FCMDeliveryEngine
 
 logger = logging.getLogger(__name__)
 
@@ -21,41 +28,68 @@ if not firebase_admin._apps:
     except Exception as e:
         logger.error(f'Firebase 초기화 중 오류 발생: {e}')
 
+# FCM 일괄 전송 엔진 (배치 단위 동시 전송, 만료 토큰 정리)
+fcm_engine = FCMDeliveryEngine()
+
+def get_club_device_tokens(club_id):
+    '''
+    모임 멤버들의 기기 토큰을 [(user_id, token), ...]으로 반환 (Redis 캐시 → 없으면 인덱스 조회 1회 후 캐시)
+    캐시는 멤버 변경(clubs.signals)과 토큰 등록/만료(DeviceTokenManager) 시 무효화된다.
+
+    :param club_id: 클럽(모임) ID
+    '''
+    pairs = club_token_cache.get(club_id)
+    if pairs is None:
+        pairs = list(DeviceToken.objects.active()
+                     .filter(user__clubmember__club_id=club_id)
+                     .values_list('user_id', 'token'))
+        club_token_cache.set(club_id, pairs)
+    return pairs
+
+
 def get_fcm_tokens_for_club_members(club, exclude_user_ids=None):
     '''
-    주어진 클럽의 모든 멤버의 FCM 토큰을 가져오는 함수
+    주어진 클럽의 모든 멤버의 FCM 토큰을 가져오는 함수 (멤버별 모든 기기 포함)
 
     :param club: 클럽(모임) 객체
     :param exclude_user_ids: 제외할 사용자 ID 리스트 (선택사항)
     :return: 클럽(모임) 멤버들의 FCM 토큰 리스트
     '''
-    queryset = ClubMember.objects.filter(club=club)
-    
-    # 제외할 사용자 ID가 있으면 제외
-    if exclude_user_ids:
-        queryset = queryset.exclude(user_id__in=exclude_user_ids)
-    
-    tokens = queryset.values_list('user__fcm_token', flat=True)
-    return [token for token in tokens if token]
+    excluded = set(exclude_user_ids or ())
+    return [token for user_id, token in get_club_device_tokens(club.id) if user_id not in excluded]
 
 
 def get_fcm_tokens_for_event_participants(event):
     '''
-    주어진 이벤트의 모든 참가자의 FCM 토큰을 가져오는 함수
+    주어진 이벤트의 모든 참가자의 FCM 토큰을 가져오는 함수 (참가자별 모든 기기 포함)
 
     :param event: 이벤트 객체
     :return: 이벤트 참가자들의 FCM 토큰 리스트
     '''
-    return list(Participant.objects.filter(event=event).values_list('club_member__user__fcm_token', flat=True))
+    return list(DeviceToken.objects.active()
+                .filter(user__clubmember__participant__event=event)
+                .values_list('token', flat=True))
+
+
+def get_fcm_tokens_for_users(user_ids):
+    '''
+    주어진 사용자들의 모든 기기 FCM 토큰을 가져오는 함수
+
+    :param user_ids: 사용자 ID 리스트
+    :return: FCM 토큰 리스트
+    '''
+    return list(DeviceToken.objects.active().filter(user_id__in=user_ids).values_list('token', flat=True))
 
 
 def send_fcm_notifications(tokens, title, body, event_id=None, club_id=None):
     '''
     주어진 FCM 토큰 리스트에 일괄적으로 푸시 알림을 전송하는 함수
+    토큰을 멀티캐스트 배치로 나눠 동시에 전송하고, 만료된 토큰은 사용자 정보에서 제거한다.
 
     :param tokens: FCM 토큰 리스트
     :param title: 알림의 제목
     :param body: 알림의 내용
+    :return: 전송 결과 요약 (DeliveryReport)
     '''
     if not tokens:
         logger.warning("FCM 토큰이 없습니다. 알림을 전송하지 않습니다.")
@@ -68,27 +102,7 @@ def send_fcm_notifications(tokens, title, body, event_id=None, club_id=None):
     elif club_id:
         additional_data["club_id"] = str(club_id)  # 모임 ID만 포함
 
-    logger.info(f"send_fcm_notifications 전송할 FCM 토큰: {tokens}")  # 토큰 리스트 출력
-    logger.info(f"이벤트/모임 데이터: {additional_data}")
-
-    for token in tokens:
-        print(f"token: {token}, type: {type(tokens)}")
-
-    for token in tokens:
-        # 개별 메시지 객체 생성
-        message = messaging.Message(
-            data=additional_data,# 이벤트/모임 id 필ㅂ1
-            notification=messaging.Notification(title=title, body=body),
-            token=token,
-        )
-
-        try:
-            # 메시지 전송
-            response = messaging.send(message)
-            logger.info(f'{token}에 메시지가 성공적으로 전송되었습니다.')
-        except Exception as e:
-            logger.error(f'FCM 메시지 전송 실패: 토큰={token}, 오류={e}')
-            print(f'FCM 메시지 전송 중 오류 발생: {e}')
+    return fcm_engine.send(tokens, title, body, additional_data)
 
 
 def send_club_invitation_notification(club, invited_user, inviter_name):
@@ -104,20 +118,15 @@ def send_club_invitation_notification(club, invited_user, inviter_name):
         message_body = f"{inviter_name}님이 {club.name} 모임에 초대했습니다"
         
         # FCM 알림 전송
-        if invited_user.fcm_token:
+        invited_tokens = get_fcm_tokens_for_users([invited_user.id])
+        if invited_tokens:
             additional_data = {
                 "club_id": str(club.id),
                 "notification_type": "club_invitation"
             }
             
-            message = messaging.Message(
-                data=additional_data,
-                notification=messaging.Notification(title=message_title, body=message_body),
-                token=invited_user.fcm_token,
-            )
-            
-            response = messaging.send(message)
-            logger.info(f'🔔 클럽 초대 알림이 {invited_user.name}에게 성공적으로 전송되었습니다. Response: {response}')
+            fcm_engine.send(invited_tokens, message_title, message_body, additional_data)
+            logger.info(f'🔔 클럽 초대 알림이 {invited_user.name}에게 전송되었습니다.')
         else:
             logger.warning(f"사용자 {invited_user.name}의 FCM 토큰이 없습니다.")
         
@@ -164,12 +173,10 @@ def send_club_application_notification(club, applicant_user):
     """
     try:
         # 클럽 관리자들의 FCM 토큰 가져오기
-        admin_tokens = ClubMember.objects.filter(
-            club=club, 
-            role='admin'
-        ).values_list('user__fcm_token', flat=True)
-        
-        admin_tokens = [token for token in admin_tokens if token]
+        admin_tokens = list(DeviceToken.objects.active().filter(
+            user__clubmember__club=club,
+            user__clubmember__role='admin'
+        ).values_list('token', flat=True))
         
         message_title = f"{club.name} 모임에 가입 신청이 있습니다"
         message_body = f"{applicant_user.name}님이 {club.name} 모임 가입을 신청했습니다"
@@ -181,53 +188,35 @@ def send_club_application_notification(club, applicant_user):
                 "notification_type": "club_application"
             }
             
-            for token in admin_tokens:
-                message = messaging.Message(
-                    data=additional_data,
-                    notification=messaging.Notification(title=message_title, body=message_body),
-                    token=token,
-                )
-                
-                response = messaging.send(message)
-                logger.info(f'🔔 클럽 가입 신청 알림이 관리자에게 성공적으로 전송되었습니다. Response: {response}')
+            fcm_engine.send(admin_tokens, message_title, message_body, additional_data)
+            logger.info(f'🔔 클럽 가입 신청 알림이 관리자에게 전송되었습니다.')
         else:
             logger.warning(f"클럽 {club.name}의 관리자 FCM 토큰이 없습니다.")
         
         # 🔧 추가: Redis에 알림 저장 (모든 관리자에게)
         try:
             from notifications.redis_interface import NotificationRedisInterface
-            from asgiref.sync import async_to_sync
-            import uuid
-            from datetime import datetime
             
             redis_interface = NotificationRedisInterface()
             
             # 관리자들 조회
-            admin_users = ClubMember.objects.filter(
+            admin_user_ids = list(ClubMember.objects.filter(
                 club=club, 
                 role='admin'
-            ).select_related('user')
+            ).values_list('user_id', flat=True))
+            
+            notification_data = {
+                "title": message_title,
+                "body": message_body,
+                "status": "success",
+                "read": False,
+                "club_id": club.id,
+                "notification_type": "club_application"
+            }
             
-            for admin_member in admin_users:
-                notification_id = str(uuid.uuid4())
-                
-                notification_data = {
-                    "title": message_title,
-                    "body": message_body,
-                    "status": "success",
-                    "timestamp": datetime.now().isoformat(),
-                    "read": False,
-                    "club_id": club.id,
-                    "notification_type": "club_application"
-                }
-                
-                async_to_sync(redis_interface.save_notification)(
-                    admin_member.user.id, 
-                    notification_id, 
-                    notification_data, 
-                    club_id=club.id
-                )
-                logger.info(f'📝 클럽 신청 알림이 Redis에 저장되었습니다: {admin_member.user.name}')
+            # 관리자 전체에게 같은 알림을 한 번에 저장
+            redis_interface.save_bulk_notification(admin_user_ids, notification_data, club_id=club.id)
+            logger.info(f'📝 클럽 신청 알림이 Redis에 저장되었습니다: 관리자 {len(admin_user_ids)}명')
             
         except Exception as redis_error:
             logger.error(f'Redis 저장 실패: {redis_error}')
@@ -252,21 +241,16 @@ def send_club_application_result_notification(club, applicant_user, is_approved)
             message_body = f"죄송합니다. {club.name} 모임 가입이 거절되었습니다"
         
         # FCM 알림 전송
-        if applicant_user.fcm_token:
+        applicant_tokens = get_fcm_tokens_for_users([applicant_user.id])
+        if applicant_tokens:
             additional_data = {
                 "club_id": str(club.id),
                 "notification_type": "club_application_result",
                 "is_approved": str(is_approved)
             }
             
-            message = messaging.Message(
-                data=additional_data,
-                notification=messaging.Notification(title=message_title, body=message_body),
-                token=applicant_user.fcm_token,
-            )
-            
-            response = messaging.send(message)
-            logger.info(f'클럽 가입 신청 결과 알림이 {applicant_user.name}에게 성공적으로 전송되었습니다.')
+            fcm_engine.send(applicant_tokens, message_title, message_body, additional_data)
+            logger.info(f'클럽 가입 신청 결과 알림이 {applicant_user.name}에게 전송되었습니다.')
         else:
             logger.warning(f"사용자 {applicant_user.name}의 FCM 토큰이 없습니다.")
         
@@ -305,276 +289,184 @@ def send_club_application_result_notification(club, applicant_user, is_approved)
     except Exception as e:
         logger.error(f'클럽 가입 신청 결과 알림 전송 중 오류 발생: {e}')
 
-def send_chat_message_notification(chat_room, sender_name, message_content, sender_id):
+def _load_chat_room_recipient_policy(chat_room):
     '''
-    채팅 메시지 FCM 알림 전송 (사용자 알림 설정 확인)
-    
+    채팅방 멤버별 알림 꺼짐 여부와 멤버가 차단한 사용자를 한 번의 쿼리로 계산
+    (멤버 × 활성 차단 수만큼 행이 나오므로 파이썬에서 멤버/차단 목록으로 정리)
+    '''
+    from accounts.models import User
+
+    if chat_room.chat_room_type == 'CLUB':
+        members = User.objects.filter(clubmember__club_id=chat_room.club_id)
+    else:
+        members = User.objects.filter(clubmember__participant__event_id=chat_room.event_id)
+
+    rows = members.annotate(
+        room_setting=FilteredRelation(
+            'chat_notification_settings', condition=Q(chat_notification_settings__chat_room=chat_room)),
+        active_block=FilteredRelation('blocked_users', condition=Q(blocked_users__is_active=True)),
+    ).values_list('id', 'room_setting__is_enabled', 'active_block__blocked_user_id')
+
+    muted, blocks = {}, set()
+    for user_id, is_enabled, blocked_user_id in rows:
+        muted[user_id] = is_enabled is False  # 설정이 없으면 기본값(알림 켜짐)
+        if blocked_user_id is not None:
+            blocks.add((user_id, blocked_user_id))
+    return {
+        "members": [[user_id, is_muted] for user_id, is_muted in muted.items()],
+        "blocks": [list(block) for block in blocks],
+    }
+
+
+def get_chat_room_recipient_policy(chat_room):
+    '''
+    채팅방 수신 정책 (Redis 캐시 → 없으면 1회 조회 후 캐시)
+    '''
+    policy = chat_recipient_cache.get(chat_room)
+    if policy is None:
+        policy = _load_chat_room_recipient_policy(chat_room)
+        chat_recipient_cache.set(chat_room, policy)
+    return policy
+
+
+def get_chat_recipient_user_ids(policy, sender_id, exclude_user_ids=()):
+    '''
+    메시지 한 건의 푸시 수신자
+    발신자, 채팅방 알림을 끈 멤버, 발신자를 차단한 멤버, exclude_user_ids는 제외한다.
+    '''
+    excluded = {sender_id, *exclude_user_ids}
+    excluded.update(blocker for blocker, blocked_user in policy["blocks"] if blocked_user == sender_id)
+    return {user_id for user_id, is_muted in policy["members"] if not is_muted} - excluded
+
+
+def get_chat_device_tokens(chat_room, user_ids):
+    '''
+    수신자별 기기 토큰 {user_id: [token, ...]}
+    모임 채팅방은 모임 토큰 캐시, 이벤트 채팅방은 인덱스 조회 1회로 가져온다.
+    '''
+    if not user_ids:
+        return {}
+    if chat_room.chat_room_type == 'CLUB':
+        pairs = get_club_device_tokens(chat_room.club_id)
+    else:
+        pairs = DeviceToken.objects.active().filter(user_id__in=user_ids).values_list('user_id', 'token')
+
+    tokens = {}
+    for user_id, token in pairs:
+        if user_id in user_ids:
+            tokens.setdefault(user_id, []).append(token)
+    return tokens
+
+
+def build_chat_message_preview(sender_name, message_content):
+    '''
+    푸시에 표시할 메시지 미리보기와 메시지 타입 (이미지 메시지는 "사진을 보냈습니다")
+    '''
+    try:
+        message_data = json.loads(message_content)
+        # 이중 JSON 구조 처리: 최상위 → content 필드 안의 JSON 순서로 이미지 정보 확인
+        candidates = [message_data]
+        if isinstance(message_data, dict) and isinstance(message_data.get('content'), str):
+            try:
+                candidates.append(json.loads(message_data['content']))
+            except (json.JSONDecodeError, TypeError):
+                pass
+        for data in candidates:
+            if isinstance(data, dict) and (data.get('type') == 'image' or 'image_url' in data or 'filename' in data):
+                return f"{sender_name}: 사진을 보냈습니다", "IMAGE"
+    except (json.JSONDecodeError, TypeError):
+        pass  # JSON이 아닌 경우 일반 텍스트로 처리
+    return f"{sender_name}: {message_content[:50]}{'...' if len(message_content) > 50 else ''}", "TEXT"
+
+
+def enqueue_chat_message_notification(chat_room, sender_name, message_content, sender_id):
+    '''
+    채팅 메시지 푸시를 합치기 큐에 넣는다. (메시지 전송 경로에서는 Redis 기록만 하고 즉시 반환)
+    실제 전송은 chat.tasks.dispatch_due_chat_pushes가 창(window) 단위로 묶어서 수행한다.
+
     :param chat_room: 채팅방 객체
     :param sender_name: 발신자 이름
     :param message_content: 메시지 내용
     :param sender_id: 발신자 ID (자신에게는 알림 안 보내기 위해)
     '''
+    if chat_room.chat_room_type not in ('CLUB', 'EVENT'):
+        logger.warning(f"지원하지 않는 채팅방 타입: {chat_room.chat_room_type}")
+        return
+
+    body, msg_type = build_chat_message_preview(sender_name, message_content)
+    entry = {"sender_id": sender_id, "sender_name": sender_name, "body": body, "msg_type": msg_type}
     try:
-        # 🔧 추가: 알림 설정 확인을 위한 import
-        from chat.models import ChatNotificationSettings
-        # 채팅방 타입에 따라 FCM 토큰 가져오기
-        if chat_room.chat_room_type == 'CLUB':
-            # 모임 채팅방 - 모든 클럽 멤버에게 알림 전송
-            from clubs.models import Club
-            from chat.models import ChatRoomParticipant
-            club = Club.objects.get(id=chat_room.club_id)
-            
-            # 채팅방에 참여한 사용자들 조회 (참고용)
-            participants = ChatRoomParticipant.objects.filter(
-                chat_room=chat_room,
-                is_active=True
-            ).values_list('user_id', flat=True)
-            
-            logger.info(f"🔍 채팅방 참여자 ID 목록: {list(participants)}")
-            
-            # 🔧 수정: 모든 클럽 멤버의 FCM 토큰 가져오기
-            all_tokens = get_fcm_tokens_for_club_members(club)
-            
-            # 🔧 디버그: 전체 클럽 멤버 정보 출력
-            logger.info(f"🔍 === 클럽 '{club.name}' 전체 멤버 정보 ===")
-            from clubs.models import ClubMember
-            club_members = ClubMember.objects.filter(club=club).select_related('user')
-            for i, member in enumerate(club_members):
-                logger.info(f"🔍 멤버 {i+1}: ID={member.user.id}, 이름={member.user.name}, FCM토큰={member.user.fcm_token[:20] if member.user.fcm_token else 'None'}...")
-            
-            logger.info(f"🔍 전체 FCM 토큰 수: {len(all_tokens)}")
-            for i, token in enumerate(all_tokens):
-                logger.info(f"🔍 토큰 {i+1}: {token[:20]}...")
-            
-            tokens = []
-            processed_tokens = set()  # 중복 토큰 방지
-            
-            for token_data in all_tokens:
-                if token_data in processed_tokens:
-                    continue  # 이미 처리된 토큰은 스킵
-                    
-                # 🔧 수정: 클럽 멤버 중에서만 FCM 토큰과 사용자 매칭
-                from accounts.models import User
-                try:
-                    # 클럽 멤버 중에서 해당 FCM 토큰을 가진 사용자만 조회
-                    club_members = ClubMember.objects.filter(
-                        club=club,
-                        user__fcm_token=token_data
-                    ).select_related('user')
-                    
-                    if club_members.exists():
-                        club_member = club_members.first()
-                        user = club_member.user
-                        # 🔧 수정: 클럽 채팅방에서는 모든 클럽 멤버에게 알림 전송
-                        # 🔧 활성화: 알림 설정 확인
-                        logger.info(f"🔍 알림 설정 조회 시도: 사용자={user.name}(ID:{user.id}), 채팅방={chat_room.chat_room_name}(ID:{chat_room.id})")
-                        try:
-                            notification_setting = ChatNotificationSettings.objects.get(
-                                user=user,
-                                chat_room=chat_room
-                            )
-                            logger.info(f"🔍 사용자 {user.name}의 알림 설정 조회: 활성화={notification_setting.is_enabled}")
-                            if not notification_setting.is_enabled:
-                                logger.info(f"🔕 사용자 {user.name}의 알림이 비활성화됨 - 알림 전송 안 함")
-                                continue
-                            else:
-                                logger.info(f"🔔 사용자 {user.name}의 알림이 활성화됨 - 알림 전송 진행")
-                        except ChatNotificationSettings.DoesNotExist:
-                            # 설정이 없으면 기본값(True)으로 처리
-                            logger.info(f"🔔 사용자 {user.name}의 알림 설정 없음, 기본값(활성화) 적용")
-                            # 🔧 추가: 모든 알림 설정 확인
-                            all_settings = ChatNotificationSettings.objects.filter(user=user)
-                            logger.info(f"🔍 사용자 {user.name}의 모든 알림 설정: {[(s.chat_room.chat_room_name, s.is_enabled) for s in all_settings]}")
-                        
-                        tokens.append(token_data)
-                        processed_tokens.add(token_data)
-                except Exception as e:
-                    logger.warning(f"사용자 조회 실패 (토큰: {token_data[:10]}...): {e}")
-                    continue
-            
-            logger.info(f"클럽 '{club.name}' 참여자 수: {len(participants)}명, FCM 전송 대상: {len(tokens)}명")
-            
-        elif chat_room.chat_room_type == 'EVENT':
-            # 이벤트 채팅방 - 채팅방에 참여하지 않은 참가자들에게만 알림 전송
-            from events.models import Event
-            from chat.models import ChatRoomParticipant
-            event = Event.objects.get(id=chat_room.event_id)
-            
-            # 채팅방에 참여한 사용자들 조회
-            participants = ChatRoomParticipant.objects.filter(
-                chat_room=chat_room,
-                is_active=True
-            ).values_list('user_id', flat=True)
-            
-            # 참여하지 않은 참가자들의 FCM 토큰만 가져오기
-            all_tokens = get_fcm_tokens_for_event_participants(event)
-            tokens = []
-            processed_tokens = set()  # 중복 토큰 방지
-            
-            for token_data in all_tokens:
-                if token_data in processed_tokens:
-                    continue  # 이미 처리된 토큰은 스킵
-                    
-                # 🔧 수정: 이벤트 참가자 중에서만 FCM 토큰과 사용자 매칭
-                from accounts.models import User
-                from participants.models import Participant
-                try:
-                    # 이벤트 참가자 중에서 해당 FCM 토큰을 가진 사용자만 조회
-                    event_participants = Participant.objects.filter(
-                        event=event,
-                        club_member__user__fcm_token=token_data
-                    ).select_related('club_member__user')
-                    
-                    if event_participants.exists():
-                        participant = event_participants.first()
-                        user = participant.club_member.user
-                        if user.id not in participants:  # 참여하지 않은 사용자만
-                            # 🔧 활성화: 알림 설정 확인
-                            logger.info(f"🔍 알림 설정 조회 시도: 사용자={user.name}(ID:{user.id}), 채팅방={chat_room.chat_room_name}(ID:{chat_room.id})")
-                            try:
-                                notification_setting = ChatNotificationSettings.objects.get(
-                                    user=user,
-                                    chat_room=chat_room
-                                )
-                                logger.info(f"🔍 사용자 {user.name}의 알림 설정 조회: 활성화={notification_setting.is_enabled}")
-                                if not notification_setting.is_enabled:
-                                    logger.info(f"🔕 사용자 {user.name}의 알림이 비활성화됨 - 알림 전송 안 함")
-                                    continue
-                                else:
-                                    logger.info(f"🔔 사용자 {user.name}의 알림이 활성화됨 - 알림 전송 진행")
-                            except ChatNotificationSettings.DoesNotExist:
-                                # 설정이 없으면 기본값(True)으로 처리
-                                logger.info(f"🔔 사용자 {user.name}의 알림 설정 없음, 기본값(활성화) 적용")
-                                # 🔧 추가: 모든 알림 설정 확인
-                                all_settings = ChatNotificationSettings.objects.filter(user=user)
-                                logger.info(f"🔍 사용자 {user.name}의 모든 알림 설정: {[(s.chat_room.chat_room_name, s.is_enabled) for s in all_settings]}")
-                            
-                            tokens.append(token_data)
-                            processed_tokens.add(token_data)
-                except Exception as e:
-                    logger.warning(f"사용자 조회 실패 (토큰: {token_data[:10]}...): {e}")
-                    continue
-            
-            logger.info(f"이벤트 '{event.title}' 참여자 수: {len(participants)}명, FCM 전송 대상: {len(tokens)}명")
-        else:
-            logger.warning(f"지원하지 않는 채팅방 타입: {chat_room.chat_room_type}")
-            return
-        
-        # 발신자 제외하고 알림 전송
-        # 발신자의 FCM 토큰을 제외하여 자신에게는 알림이 가지 않도록 처리
-        sender_fcm_token = None
-        try:
-            from accounts.models import User
-            sender = User.objects.get(id=sender_id)
-            sender_fcm_token = sender.fcm_token
-        except User.DoesNotExist:
-            logger.warning(f"발신자 사용자를 찾을 수 없습니다: {sender_id}")
-        
-        # 🔧 디버그: 토큰 수 확인
-        logger.info(f"🔍 발신자 제외 전 토큰 수: {len(tokens)}")
-        logger.info(f"🔍 발신자 FCM 토큰: {sender_fcm_token[:10] if sender_fcm_token else 'None'}...")
-        
-        # 🔧 디버그: 모든 사용자 FCM 토큰 출력
-        logger.info("🔍 === 모든 사용자 FCM 토큰 ===")
-        for i, token in enumerate(tokens):
-            logger.info(f"🔍 사용자 {i+1}: {token[:20]}...")
-        
-        # 🔧 디버그: 발신자 정보 상세 출력
-        try:
-            from accounts.models import User
-            sender = User.objects.get(id=sender_id)
-            logger.info(f"🔍 발신자 정보: ID={sender.id}, 이름={sender.name}, FCM토큰={sender.fcm_token[:20] if sender.fcm_token else 'None'}...")
-        except Exception as e:
-            logger.error(f"🔍 발신자 정보 조회 실패: {e}")
-        
-        # 발신자 토큰 제외
-        if sender_fcm_token and sender_fcm_token in tokens:
-            tokens = [token for token in tokens if token != sender_fcm_token]
-            logger.info(f"발신자 토큰 제외: {sender_fcm_token[:10]}...")
-            logger.info(f"🔍 발신자 제외 후 토큰 수: {len(tokens)}")
-        else:
-            logger.info(f"🔍 발신자 토큰이 토큰 리스트에 없음 또는 None")
-        
-        if not tokens:
-            logger.warning("채팅방 멤버의 FCM 토큰이 없습니다.")
-            logger.warning(f"🔍 원본 토큰 수: {len(tokens)}")
-            return
-        
-        # 알림 제목과 내용 설정
-        title = f"{chat_room.chat_room_name}"
-        
-        # 이미지 메시지인지 확인
-        import json
-        is_image_message = False
-        try:
-            message_data = json.loads(message_content)
-            
-            # 이중 JSON 구조 처리
-            # 1단계: 최상위에서 이미지 정보 확인
-            if (message_data.get('type') == 'image' or 
-                'image_url' in message_data or 
-                'filename' in message_data):
-                is_image_message = True
-                body = f"{sender_name}: 사진을 보냈습니다"
-            # 2단계: content 필드 안의 JSON 확인
-            elif 'content' in message_data and isinstance(message_data['content'], str):
-                try:
-                    content_data = json.loads(message_data['content'])
-                    if (content_data.get('type') == 'image' or 
-                        'image_url' in content_data or 
-                        'filename' in content_data):
-                        is_image_message = True
-                        body = f"{sender_name}: 사진을 보냈습니다"
-                    else:
-                        body = f"{sender_name}: {message_content[:50]}{'...' if len(message_content) > 50 else ''}"
-                except (json.JSONDecodeError, TypeError):
-                    body = f"{sender_name}: {message_content[:50]}{'...' if len(message_content) > 50 else ''}"
-            else:
-                body = f"{sender_name}: {message_content[:50]}{'...' if len(message_content) > 50 else ''}"
-        except (json.JSONDecodeError, TypeError):
-            # JSON이 아닌 경우 일반 텍스트로 처리
-            body = f"{sender_name}: {message_content[:50]}{'...' if len(message_content) > 50 else ''}"
-        
-        # data 필드에 채팅방 정보 포함
-        additional_data = {
-            "type": "chat_message",
-            "chat_room_id": str(chat_room.id),
-            "sender_id": str(sender_id),
-            "sender_name": sender_name,
-        }
-        
-        # 메시지 타입 정보 추가
-        if is_image_message:
-            additional_data["msgType"] = "IMAGE"
-        else:
-            additional_data["msgType"] = "TEXT"
-        
-        # 채팅방 타입에 따라 추가 데이터 설정
-        if chat_room.chat_room_type == 'CLUB':
-            additional_data["club_id"] = str(chat_room.club_id)
-            additional_data["chat_room_id"] = str(chat_room.club_id)  # 🔧 추가: 채팅방 ID
-            additional_data["chat_room_type"] = "CLUB"  # 🔧 추가: 채팅방 타입
-        elif chat_room.chat_room_type == 'EVENT':
-            additional_data["event_id"] = str(chat_room.event_id)
-            additional_data["chat_room_id"] = str(chat_room.event_id)  # 🔧 추가: 채팅방 ID
-            additional_data["chat_room_type"] = "EVENT"  # 🔧 추가: 채팅방 타입
-        
-        logger.info(f"채팅 메시지 알림 전송: {title} - {body}")
-        logger.info(f"전송할 FCM 토큰 수: {len(tokens)}")
-        
-        # FCM 메시지 전송
-        for token in tokens:
-            message = messaging.Message(
-                data=additional_data,
-                notification=messaging.Notification(title=title, body=body),
-                token=token,
-            )
-            
-            try:
-                response = messaging.send(message)
-                logger.info(f'채팅 알림 전송 성공: {token[:10]}...')
-            except Exception as e:
-                logger.error(f'채팅 알림 전송 실패: 토큰={token[:10]}..., 오류={e}')
-                
+        chat_push_queue.push(chat_room.id, entry, time.time())
     except Exception as e:
-        logger.error(f'채팅 메시지 알림 전송 중 오류: {e}')
\ No newline at end of file
+        logger.error(f'채팅 푸시 큐 등록 실패: {e}')
+
+
+def send_coalesced_chat_notifications(chat_room, entries):
+    '''
+    한 채팅방에서 창(window) 동안 쌓인 메시지를 수신자별로 묶어 전송
+    - 받을 메시지가 1건이면 기존과 같은 미리보기, 여러 건이면 "N개의 새 메시지" 요약 + 마지막 메시지
+    - 사용자별 발송 한도를 넘은 수신자는 이번 창에서 제외
+    - 같은 내용(메시지 수, 마지막 메시지)을 받는 수신자끼리 묶어 멀티캐스트
+
+    :param chat_room: 채팅방 객체
+    :param entries: 큐에서 꺼낸 메시지 요약 리스트 (오래된 순)
+    :return: 전송한 수신자 수
+    '''
+    exclude_user_ids = ()
+    if chat_room.chat_room_type == 'EVENT':
+        # 이벤트 채팅방 - 채팅방에 참여하지 않은 참가자들에게만 알림 전송
+        from chat.models import ChatRoomParticipant
+        exclude_user_ids = set(ChatRoomParticipant.objects.filter(
+            chat_room=chat_room,
+            is_active=True
+        ).values_list('user_id', flat=True))
+
+    policy = get_chat_room_recipient_policy(chat_room)
+    pending = {}  # user_id -> (받을 메시지 수, 마지막 메시지 인덱스)
+    for index, entry in enumerate(entries):
+        for user_id in get_chat_recipient_user_ids(policy, entry["sender_id"], exclude_user_ids):
+            count, _ = pending.get(user_id, (0, None))
+            pending[user_id] = (count + 1, index)
+
+    allowed = set(chat_push_queue.acquire_rate(pending, time.time()))
+    if len(allowed) < len(pending):
+        logger.info(f"채팅 푸시 발송 한도 초과로 제외: {len(pending) - len(allowed)}명 (채팅방 {chat_room.id})")
+    tokens = get_chat_device_tokens(chat_room, allowed)
+
+    groups = {}
+    for user_id in allowed:
+        groups.setdefault(pending[user_id], []).extend(tokens.get(user_id, []))
+
+    title = f"{chat_room.chat_room_name}"
+    for (count, index), group_tokens in groups.items():
+        if not group_tokens:
+            continue
+        last = entries[index]
+        body = last["body"] if count == 1 else f"{count}개의 새 메시지 - {last['body']}"
+        fcm_engine.send(group_tokens, title, body, _chat_push_data(chat_room, last, count))
+
+    logger.info(f"채팅 푸시 전송: 채팅방 {chat_room.id}, 메시지 {len(entries)}건, 수신자 {len(allowed)}명")
+    return len(allowed)
+
+
+def _chat_push_data(chat_room, last_entry, count):
+    # data 필드에 채팅방 정보 포함
+    additional_data = {
+        "type": "chat_message",
+        "chat_room_id": str(chat_room.id),
+        "sender_id": str(last_entry["sender_id"]),
+        "sender_name": last_entry["sender_name"],
+        "msgType": last_entry["msg_type"],
+        "message_count": str(count),
+    }
+
+    # 채팅방 타입에 따라 추가 데이터 설정
+    if chat_room.chat_room_type == 'CLUB':
+        additional_data["club_id"] = str(chat_room.club_id)
+        additional_data["chat_room_id"] = str(chat_room.club_id)  # 🔧 추가: 채팅방 ID
+        additional_data["chat_room_type"] = "CLUB"  # 🔧 추가: 채팅방 타입
+    elif chat_room.chat_room_type == 'EVENT':
+        additional_data["event_id"] = str(chat_room.event_id)
+        additional_data["chat_room_id"] = str(chat_room.event_id)  # 🔧 추가: 채팅방 ID
+        additional_data["chat_room_type"] = "EVENT"  # 🔧 추가: 채팅방 타입
+    return additional_data